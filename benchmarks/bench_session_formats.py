@@ -0,0 +1,125 @@
+# benchmarks/bench_session_formats.py
+"""Compare size and save/load time of the session formats.
+
+Run from the repository root:
+
+    python benchmarks/bench_session_formats.py [--urls 200000]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_utils import json_serial, dumps_fast  # noqa: E402
+from utils import compact_session  # noqa: E402
+from utils.session_utils import open_session_writer, load_session, read_plugin_result  # noqa: E402
+
+
+def build_session(url_count: int) -> dict:
+    """Synthetic session shaped like a real run with large sitemap and crt.sh results."""
+    sitemap = [f"https://www.example.com/catalog/item-{i}/details?ref=sitemap" for i in range(url_count)]
+    subdomains = [f"host-{i}.dev.example.com" for i in range(url_count // 4)]
+    return {
+        "Search Engine Indexing and Robots.txt": {
+            "Sitemap URLs": ["https://www.example.com/sitemap.xml"],
+            "Sitemap Contents": {"https://www.example.com/sitemap.xml": sitemap},
+        },
+        "Subdomain Enumeration": {
+            "CertificateTransparencyLogs": subdomains,
+            "AllSubdomains": subdomains,
+        },
+        "HTTP Headers": {
+            "Server": "nginx",
+            "Security Headers": {"Strict-Transport-Security": "max-age=63072000", "X-Frame-Options": "DENY"},
+        },
+        "WHOIS Information": {"Registrar": "Example Registrar", "Creation Date": datetime(1995, 8, 14)},
+    }
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def bench_legacy(session: dict, directory: str) -> dict:
+    path = os.path.join(directory, "session_legacy.json")
+
+    def save():
+        with open(path, 'w') as f:
+            json.dump(session, f, default=json_serial, indent=4)
+
+    def load():
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    save_time, _ = timed(save)
+    load_time, _ = timed(load)
+    single_time, _ = timed(lambda: load()["HTTP Headers"])
+    return {"size": os.path.getsize(path), "save": save_time, "load": load_time, "single": single_time}
+
+
+def bench_streamed(session: dict, directory: str, compact: bool) -> dict:
+    paths = []
+
+    def save():
+        session_id = f"session_{'compact' if compact else 'stream'}_{len(paths)}"
+        writer = open_session_writer(directory, session_id, "example.com", "2024-01-01 00:00:00", compact=compact)
+        for plugin_name, result in session.items():
+            writer.write_result(plugin_name, result)
+        paths.append(writer.finalize({}))
+
+    save_time, _ = timed(save)
+    path = paths[-1]
+    load_time, _ = timed(lambda: load_session(path))
+    single_time, _ = timed(lambda: read_plugin_result(path, "HTTP Headers"))
+    return {"size": os.path.getsize(path), "save": save_time, "load": load_time, "single": single_time}
+
+
+def bench_export(session: dict) -> dict:
+    results = {}
+    results["json indent=4"], _ = timed(lambda: json.dumps(session, default=json_serial, indent=4))
+    results["dumps_fast indent"], _ = timed(lambda: dumps_fast(session, indent=True))
+    results["dumps_fast compact"], _ = timed(lambda: dumps_fast(session))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=200000, help="Number of sitemap URLs in the synthetic session")
+    args = parser.parse_args()
+
+    session = build_session(args.urls)
+    directory = tempfile.mkdtemp(prefix="dwa_bench_")
+    try:
+        encoding, compression = compact_session.available_codecs()
+        codec = f"{'msgpack' if encoding else 'json'}+{'zstd' if compression == 2 else 'zlib'}"
+        rows = [
+            ("legacy json (indent=4)", bench_legacy(session, directory)),
+            ("streamed jsonl", bench_streamed(session, directory, compact=False)),
+            (f"compact ({codec})", bench_streamed(session, directory, compact=True)),
+        ]
+        print(f"{'format':<28}{'size (KB)':>12}{'save (ms)':>12}{'load (ms)':>12}{'1 result (ms)':>15}")
+        for label, row in rows:
+            print(f"{label:<28}{row['size'] / 1024:>12.0f}{row['save'] * 1000:>12.1f}"
+                  f"{row['load'] * 1000:>12.1f}{row['single'] * 1000:>15.2f}")
+        print()
+        print(f"{'export path':<28}{'time (ms)':>12}")
+        for label, seconds in bench_export(session).items():
+            print(f"{label:<28}{seconds * 1000:>12.1f}")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_signatures.py
+"""Compare the single-pass signature engine with per-signature regex scanning.
+
+The legacy column re-creates what the WAF, load balancing/infrastructure and CDN
+plugins did before: one case-insensitive re.search per signature per header value
+and per body. (The old WAF plugin also re-parsed the body with BeautifulSoup for
+every signature, which is not included here, so the legacy numbers are a lower bound.)
+
+Run from the repository root:
+
+    python benchmarks/bench_signatures.py [--sizes 100000 1000000 5000000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.signature_engine import SignatureEngine, SIGNATURES_DIR  # noqa: E402
+
+HEADERS = {
+    "Server": "nginx/1.25.3",
+    "Content-Type": "text/html; charset=utf-8",
+    "Cache-Control": "max-age=600",
+    "Via": "1.1 varnish",
+    "X-Cache": "HIT",
+    "X-Forwarded-For": "203.0.113.7",
+    "X-Forwarded-Proto": "https",
+}
+
+FILLER = [
+    '<div class="product-card"><a href="/catalog/item-{n}">Item {n}</a><span class="price">$19.99</span></div>\n',
+    '<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt.</p>\n',
+    '<script src="/static/js/chunk-{n}.js" defer></script>\n',
+    '<link rel="stylesheet" href="https://cdn.example.net/css/theme-{n}.css">\n',
+    '<img src="/media/photo-{n}.jpg" alt="Photo {n}" loading="lazy">\n',
+]
+
+
+def build_body(size: int) -> str:
+    random.seed(size)
+    parts = ['<!DOCTYPE html><html lang="en"><head><title>Benchmark</title>',
+             '<script src="https://ajax.googleapis.com/ajax/libs/jquery/3.7.1/jquery.min.js"></script></head><body>\n']
+    length = sum(map(len, parts))
+    n = 0
+    while length < size:
+        chunk = random.choice(FILLER).format(n=n)
+        parts.append(chunk)
+        length += len(chunk)
+        n += 1
+    parts.append("<!-- served by docker-swarm node 7 --></body></html>")
+    return "".join(parts)
+
+
+def legacy_scan(signatures: list, headers: dict, body: str, status: int) -> set:
+    found = set()
+    for signature in signatures:
+        pattern = signature["pattern"] if signature.get("regex") else re.escape(signature["pattern"])
+        selectors = [s.lower() for s in signature.get("headers", [])]
+        for name, value in headers.items():
+            if any(s == "*" or s == name.lower() or (s.endswith("*") and name.lower().startswith(s[:-1]))
+                   for s in selectors):
+                if re.search(pattern, value, re.IGNORECASE):
+                    found.add((signature["group"], signature["name"]))
+        if signature.get("body") and (not signature.get("status") or status in signature["status"]):
+            if re.search(pattern, body, re.IGNORECASE):
+                found.add((signature["group"], signature["name"]))
+    return found
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000, 5000000],
+                        help="Body sizes in characters")
+    args = parser.parse_args()
+
+    engine = SignatureEngine.from_directory(SIGNATURES_DIR)
+    print(f"{len(engine.signatures)} signatures")
+    print(f"{'body (KB)':>10}{'legacy (ms)':>14}{'engine (ms)':>14}{'speed-up':>10}{'same result':>13}")
+    for size in args.sizes:
+        body = build_body(size)
+        legacy_time, legacy = timed(lambda: legacy_scan(engine.signatures, HEADERS, body, 403))
+        engine_time, matches = timed(lambda: engine.scan(HEADERS, body, 403))
+        found = {(engine.signatures[i]["group"], engine.signatures[i]["name"]) for i in matches.matched}
+        print(f"{len(body) / 1024:>10.0f}{legacy_time * 1000:>14.1f}{engine_time * 1000:>14.1f}"
+              f"{legacy_time / engine_time:>9.1f}x{str(found == legacy):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_startup.py
+"""Measure plugin loading time at startup: eager imports versus the lazy manifest.
+
+Every measurement runs in a fresh interpreter so module caches do not carry over.
+Run from the repository root:
+
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from utils.plugin_loader import load_plugins
+plugins = load_plugins("plugins", lazy={lazy}, manifest_path={manifest!r})
+elapsed = time.perf_counter() - start
+print(f"{{elapsed}} {{len(plugins)}} {{len(sys.modules)}}")
+"""
+
+
+def measure(lazy: bool, manifest: str, cold: bool, runs: int) -> tuple:
+    timings = []
+    plugin_count = module_count = 0
+    for _ in range(runs):
+        if cold and os.path.exists(manifest):
+            os.remove(manifest)
+        output = subprocess.run(
+            [sys.executable, "-c", SNIPPET.format(lazy=lazy, manifest=manifest)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[0]))
+        plugin_count, module_count = int(output[1]), int(output[2])
+    return statistics.median(timings), plugin_count, module_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Interpreter launches per scenario")
+    args = parser.parse_args()
+
+    manifest = os.path.join(tempfile.mkdtemp(prefix="dwa_bench_"), "plugin_manifest.json")
+    scenarios = [
+        ("eager import", False, False),
+        ("lazy, cold manifest", True, True),
+        ("lazy, warm manifest", True, False),
+    ]
+    print(f"{'scenario':<24}{'median (ms)':>14}{'plugins':>10}{'modules':>10}")
+    for label, lazy, cold in scenarios:
+        seconds, plugin_count, module_count = measure(lazy, manifest, cold, args.runs)
+        print(f"{label:<24}{seconds * 1000:>14.1f}{plugin_count:>10}{module_count:>10}")
+
+
+if __name__ == "__main__":
+    main()
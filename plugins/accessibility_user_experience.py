@@ -1,8 +1,8 @@
 # plugins/accessibility_user_experience.py
 import requests
-from bs4 import BeautifulSoup
 import re
 from plugins.base_plugin import BasePlugin
+from utils.crawler import analyze_site
 
 
 class AccessibilityUserExperiencePlugin(BasePlugin):
@@ -25,55 +25,50 @@ class AccessibilityUserExperiencePlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def analyzes_pages(self) -> bool:
+        return True
+
     def run(self, target: str) -> dict:
-        results = {}
         try:
-            url = self.normalize_url(target)
-            response = self.fetch_response(url)
-            if not response:
-                results["Error"] = "Failed to retrieve website response."
-                return results
-
-            # 1. Accessibility Features
-            accessibility = self.analyze_accessibility(response.text)
-            results["AccessibilityFeatures"] = accessibility
-
-            # 2. Mobile Responsiveness
-            responsiveness = self.check_mobile_responsiveness(response.text)
-            results["MobileResponsiveness"] = responsiveness
-
-            # 3. Service Worker and PWA Features
-            pwa_features = self.detect_pwa_features(url, response.text)
-            results["PWAFeatures"] = pwa_features
-
-            # 4. Browser Compatibility
-            browser_compatibility = self.analyze_browser_compatibility(response.text)
-            results["BrowserCompatibility"] = browser_compatibility
-
+            return analyze_site(self, target)
         except Exception as e:
-            results["Error"] = str(e)
+            return {"Error": str(e)}
 
+    def analyze_page(self, page) -> dict:
+        results = {}
+        # 1. Accessibility Features
+        results["AccessibilityFeatures"] = self.analyze_accessibility(page.soup)
+        # 2. Mobile Responsiveness
+        results["MobileResponsiveness"] = self.check_mobile_responsiveness(page.soup, page.text)
+        # 3. Service Worker and PWA Features (site-wide, so only from the root page)
+        if page.depth == 0:
+            results["PWAFeatures"] = self.detect_pwa_features(page.final_url, page.soup, page.text)
+        # 4. Browser Compatibility
+        results["BrowserCompatibility"] = self.analyze_browser_compatibility(page.text)
         return results
 
-    def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
-
-    def fetch_response(self, url: str) -> requests.Response:
-        try:
-            headers = {
-                "User-Agent": "DeepWebsiteAnalyzer/1.0"
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            return response
-        except requests.RequestException:
-            return None
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        root = next((r for r in page_results.values() if "PWAFeatures" in r), None)
+        if root is None:
+            return {"Error": "Failed to retrieve website response."}
+        results = dict(root)
+        # Site-wide view of the per-page checks
+        results["PagesAnalyzed"] = len(page_results)
+        results["PagesWithImagesMissingAlt"] = {
+            url: len(r["AccessibilityFeatures"].get("ImagesWithoutAlt", []))
+            for url, r in page_results.items()
+            if r.get("AccessibilityFeatures", {}).get("ImagesWithoutAlt")
+        }
+        results["PagesWithoutViewport"] = [
+            url for url, r in page_results.items()
+            if "MobileResponsiveness" in r and not r["MobileResponsiveness"].get("ViewportMetaTag")
+        ]
+        return results
 
-    def analyze_accessibility(self, html: str) -> dict:
+    def analyze_accessibility(self, soup) -> dict:
         accessibility = {}
         try:
-            soup = BeautifulSoup(html, 'html.parser')
             # Check for alt attributes in images
             images = soup.find_all('img')
             images_without_alt = [img.get('src', '') for img in images if not img.get('alt')]
@@ -94,10 +89,9 @@ class AccessibilityUserExperiencePlugin(BasePlugin):
             accessibility["Error"] = str(e)
         return accessibility
 
-    def check_mobile_responsiveness(self, html: str) -> dict:
+    def check_mobile_responsiveness(self, soup, html: str) -> dict:
         responsiveness = {}
         try:
-            soup = BeautifulSoup(html, 'html.parser')
             # Check for viewport meta tag
             viewport = soup.find('meta', attrs={'name': 'viewport'})
             responsiveness["ViewportMetaTag"] = bool(viewport)
@@ -110,7 +104,7 @@ class AccessibilityUserExperiencePlugin(BasePlugin):
             responsiveness["Error"] = str(e)
         return responsiveness
 
-    def detect_pwa_features(self, base_url: str, html: str) -> dict:
+    def detect_pwa_features(self, base_url: str, soup, html: str) -> dict:
         pwa = {}
         try:
             # Check for manifest.json
@@ -126,7 +120,6 @@ class AccessibilityUserExperiencePlugin(BasePlugin):
             theme_color = False
             app_name = False
             icons = False
-            soup = BeautifulSoup(html, 'html.parser')
             if soup.find('meta', attrs={'name': 'theme-color'}):
                 theme_color = True
             if soup.find('meta', attrs={'name': 'application-name'}):
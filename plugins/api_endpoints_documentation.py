@@ -2,8 +2,9 @@
 import requests
 from bs4 import BeautifulSoup
 import re
-import time
 from plugins.base_plugin import BasePlugin
+from utils.rate_limits import RateLimitProbe, MAX_ENDPOINTS
+from utils.target import resolve_target
 
 
 class APIEndpointsDocumentationPlugin(BasePlugin):
@@ -44,8 +45,11 @@ class APIEndpointsDocumentationPlugin(BasePlugin):
             results["APIEndpoints"] = api_endpoints
 
             # 3. Test API Rate Limits
-            rate_limits = self.test_api_rate_limits(api_endpoints)
+            rate_limits, latency = self.test_api_rate_limits(api_endpoints)
             results["APIRateLimits"] = rate_limits
+            if latency:
+                # Response times across every probed endpoint
+                results["APILatency_ms"] = latency
 
         except Exception as e:
             results["Error"] = str(e)
@@ -53,9 +57,7 @@ class APIEndpointsDocumentationPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def fetch_response(self, url: str) -> requests.Response:
         try:
@@ -104,35 +106,16 @@ class APIEndpointsDocumentationPlugin(BasePlugin):
                 api_endpoints.add(clean_url)
         return sorted(list(api_endpoints))
 
-    def test_api_rate_limits(self, api_endpoints: list) -> dict:
-        rate_limits = {}
-        headers = {
-            "User-Agent": "DeepWebsiteAnalyzer/1.0"
-        }
-        for endpoint in api_endpoints[:5]:  # Limit to first 5 endpoints to be respectful
-            try:
-                # Send 5 rapid requests to infer rate limiting
-                responses = []
-                for i in range(5):
-                    response = requests.get(endpoint, headers=headers, timeout=10)
-                    responses.append(response.status_code)
-                    time.sleep(1)  # Delay between requests
-                # Analyze response codes
-                rate_limit_info = self.analyze_rate_limits(responses)
-                rate_limits[endpoint] = rate_limit_info
-            except requests.RequestException as e:
-                rate_limits[endpoint] = {"Error": str(e)}
-        return rate_limits
-
-    def analyze_rate_limits(self, status_codes: list) -> dict:
-        rate_limit_info = {}
-        if 429 in status_codes:
-            rate_limit_info["StatusCodes"] = status_codes
-            rate_limit_info["RateLimitDetected"] = True
-        else:
-            rate_limit_info["StatusCodes"] = status_codes
-            rate_limit_info["RateLimitDetected"] = False
-        return rate_limit_info
+    def test_api_rate_limits(self, api_endpoints: list) -> tuple:
+        # Endpoints are probed concurrently with a ramp of request stages (utils/rate_limits.py);
+        # each stops as soon as throttling starts or its limit is advertised.
+        # Returns ({endpoint: result}, latency summary or None)
+        probe = RateLimitProbe()
+        try:
+            rate_limits = probe.run(api_endpoints[:MAX_ENDPOINTS])  # Limit to first 5 endpoints to be respectful
+            return rate_limits, probe.latency.summary() if rate_limits else None
+        finally:
+            probe.close()
 
     def check_url_exists(self, url: str) -> bool:
         try:
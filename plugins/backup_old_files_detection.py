@@ -2,7 +2,16 @@
 import requests
 from bs4 import BeautifulSoup
 import re
+from urllib.parse import urlparse
 from plugins.base_plugin import BasePlugin
+from utils import http_cache
+from utils.content_discovery import (
+    ContentDiscovery, EXTENSIONS_WORDLIST, PATHS_WORDLIST, backup_variants, expand, load_wordlist
+)
+from utils.target import resolve_target
+from utils.robots import get_robots_service
+
+MAX_BACKUP_SOURCES = 20  # Page files whose backup copies are probed
 
 
 class BackupOldFilesDetectionPlugin(BasePlugin):
@@ -25,17 +34,23 @@ class BackupOldFilesDetectionPlugin(BasePlugin):
     def run(self, target: str) -> dict:
         results = {}
         try:
-            base_url = self.normalize_url(target)
-            # 1. Detect Backup Files
-            backup_files = self.detect_backup_files(base_url)
-            results["BackupFiles"] = backup_files
-
-            # 2. Detect Old Files via Directory Traversal
-            old_files = self.detect_old_files(base_url)
-            results["OldFiles"] = old_files
+            resolved = resolve_target(target)
+            discovery = ContentDiscovery(resolved.base_url)
+            try:
+                extensions = list(load_wordlist(EXTENSIONS_WORDLIST))
+                # 1. Detect Backup Files
+                backup_files = self.detect_backup_files(resolved.url, discovery, extensions)
+                results["BackupFiles"] = backup_files
+
+                # 2. Detect Old Files via Directory Traversal
+                old_files = self.detect_old_files(discovery, extensions)
+                results["OldFiles"] = old_files
+                results["DiscoveryStatistics"] = discovery.statistics()
+            finally:
+                discovery.close()
 
             # 3. Analyze robots.txt for Disallowed Paths
-            robots_info = self.analyze_robots_txt(base_url)
+            robots_info = self.analyze_robots_txt(resolved.base_url)
             results["RobotsTxtDisallowedPaths"] = robots_info
 
         except Exception as e:
@@ -44,65 +59,41 @@ class BackupOldFilesDetectionPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith(("http://", "https://")):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
-    def detect_backup_files(self, base_url: str) -> list:
-        backup_files_found = []
+    def detect_backup_files(self, base_url: str, discovery: ContentDiscovery, extensions: list) -> list:
+        """Backup-looking links on the page and backup copies of the page's own files."""
+        paths = []
         try:
-            response = requests.get(base_url, timeout=15)
+            response = http_cache.fetch(base_url, timeout=15)
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
                 links = soup.find_all('a', href=True)
                 backup_patterns = re.compile(r'.*\.(bak|old|backup|sql|tar\.gz|zip)$', re.IGNORECASE)
+                host = urlparse(response.url).netloc
+                files = [urlparse(response.url).path]
                 for link in links:
-                    href = link['href']
-                    if backup_patterns.match(href):
-                        full_url = self.combine_urls(base_url, href)
-                        if self.check_url_exists(full_url):
-                            backup_files_found.append(full_url)
+                    parsed = urlparse(self.combine_urls(response.url, link['href']))
+                    if parsed.netloc != host:
+                        continue
+                    if backup_patterns.match(parsed.path):
+                        paths.append(parsed.path)
+                    elif "." in parsed.path.rsplit("/", 1)[-1]:
+                        files.append(parsed.path)
+                for path in list(dict.fromkeys(files))[:MAX_BACKUP_SOURCES]:
+                    paths.extend(backup_variants(path, extensions))
         except Exception:
             pass
-        return backup_files_found
+        return list(discovery.discover(paths))
 
-    def detect_old_files(self, base_url: str) -> list:
-        old_files_found = []
-        try:
-            common_old_dirs = ['/backup/', '/old/', '/temp/', '/archive/', '/backups/']
-            for dir_path in common_old_dirs:
-                full_url = self.combine_urls(base_url, dir_path)
-                if self.check_url_exists(full_url):
-                    old_files_found.append(full_url)
-        except Exception:
-            pass
-        return old_files_found
+    def detect_old_files(self, discovery: ContentDiscovery, extensions: list) -> list:
+        # Wordlist of backup, archive and leftover paths (resources/wordlists)
+        return list(discovery.discover(expand(load_wordlist(PATHS_WORDLIST), extensions)))
 
     def analyze_robots_txt(self, base_url: str) -> list:
-        disallowed_paths = []
-        try:
-            robots_url = self.combine_urls(base_url, '/robots.txt')
-            response = requests.get(robots_url, timeout=10)
-            if response.status_code == 200:
-                lines = response.text.splitlines()
-                user_agent = None
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('User-agent:'):
-                        user_agent = line.split(':', 1)[1].strip()
-                    elif line.startswith('Disallow:') and user_agent in ['*', None]:
-                        path = line.split(':', 1)[1].strip()
-                        disallowed_paths.append(path)
-        except Exception:
-            pass
-        return disallowed_paths
-
-    def check_url_exists(self, url: str) -> bool:
-        try:
-            response = requests.head(url, timeout=10)
-            return response.status_code == 200
-        except requests.RequestException:
-            return False
+        # Paths disallowed for all crawlers, from the shared robots.txt service
+        robots = get_robots_service().get(base_url)
+        return robots.disallowed("*") if robots.found else []
 
     def combine_urls(self, base: str, path: str) -> str:
         return requests.compat.urljoin(base, path)
@@ -2,6 +2,7 @@
 import socket
 import threading
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 from urllib.parse import urlparse
 import requests
 from bs4 import BeautifulSoup, Comment
@@ -51,9 +52,7 @@ class BannerGrabbingPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith(("http://", "https://")):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def check_common_ports(self, hostname: str) -> dict:
         port_info = {}
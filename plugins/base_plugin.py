@@ -24,6 +24,46 @@ class BasePlugin(ABC):
         """List of required API key names for the plugin."""
         return []
 
+    @property
+    def cache_ttl(self) -> int:
+        """Seconds a previous result stays valid in incremental mode."""
+        return 86400  # One day
+
+    @property
+    def content_dependent(self) -> bool:
+        """Whether the result must be refreshed when the root page content changes."""
+        return True
+
+    @property
+    def cpu_bound(self) -> bool:
+        """Whether the plugin is dominated by CPU work and should run in a worker process."""
+        return False
+
+    @property
+    def analyzes_pages(self) -> bool:
+        """Whether the plugin analyzes every page of the shared site crawl (analyze_page)."""
+        return False
+
+    def warm_up(self):
+        """One-time expensive initialization, run in the background before the first run."""
+        pass
+
+    def analyze_page(self, page) -> dict:
+        """
+        Analyze one crawled page (utils.crawler.Page).
+
+        :return: Findings for the page, or an empty dict if there are none.
+        """
+        return {}
+
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        """
+        Combine the analyze_page results of a crawl into the plugin's result.
+
+        :param page_results: {page url: analyze_page result}
+        """
+        return {"Pages": page_results}
+
     @abstractmethod
     def run(self, target: str) -> dict:
         """
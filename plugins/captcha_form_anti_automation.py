@@ -1,8 +1,7 @@
 # plugins/captcha_form_anti_automation.py
-import requests
-from bs4 import BeautifulSoup
 import re
 from plugins.base_plugin import BasePlugin
+from utils.crawler import analyze_site
 
 
 class CAPTCHAFormAntiAutomationPlugin(BasePlugin):
@@ -24,48 +23,52 @@ class CAPTCHAFormAntiAutomationPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def analyzes_pages(self) -> bool:
+        return True
+
     def run(self, target: str) -> dict:
-        results = {}
         try:
-            url = self.normalize_url(target)
-            response = self.fetch_response(url)
-            if not response:
-                results["Error"] = "Failed to retrieve website response."
-                return results
+            return analyze_site(self, target)
+        except Exception as e:
+            return {"Error": str(e)}
 
+    def analyze_page(self, page) -> dict:
+        forms_info = self.analyze_forms(page.soup)
+        for form_info in forms_info["Forms"]:
+            form_info["Page"] = page.url
+        return {
             # 1. Detect CAPTCHA Mechanisms
-            captcha_info = self.detect_captcha(response.text)
-            results["CAPTCHAMechanisms"] = captcha_info
-
+            "CAPTCHAMechanisms": self.detect_captcha(page.soup),
             # 2. Detect Anti-Automation Techniques in Forms
-            forms_info = self.analyze_forms(response.text)
-            results["AntiAutomationTechniques"] = forms_info
-
-        except Exception as e:
-            results["Error"] = str(e)
-
-        return results
-
-    def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
+            "AntiAutomationTechniques": forms_info,
+        }
 
-    def fetch_response(self, url: str) -> requests.Response:
-        try:
-            headers = {
-                "User-Agent": "DeepWebsiteAnalyzer/1.0"
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            return response
-        except requests.RequestException:
-            return None
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        if not page_results:
+            return {"Error": "Failed to retrieve website response."}
+        captcha_pages = [
+            url for url, r in page_results.items() if r.get("CAPTCHAMechanisms", {}).get("CaptchaDetected")
+        ]
+        methods = set()
+        forms = []
+        for r in page_results.values():
+            methods.update(r.get("CAPTCHAMechanisms", {}).get("CaptchaMethods", []))
+            forms.extend(r.get("AntiAutomationTechniques", {}).get("Forms", []))
+        return {
+            "CAPTCHAMechanisms": {
+                "CaptchaDetected": bool(captcha_pages),
+                "CaptchaMethods": sorted(methods),
+                "PagesWithCaptcha": captcha_pages,
+            },
+            "AntiAutomationTechniques": {"Forms": forms},
+            "PagesScanned": len(page_results),
+        }
 
-    def detect_captcha(self, html: str) -> dict:
+    def detect_captcha(self, soup) -> dict:
         captcha_detected = False
         captcha_methods = []
         try:
-            soup = BeautifulSoup(html, 'html.parser')
             # Check for reCAPTCHA
             if soup.find('div', class_=re.compile(r'recaptcha', re.IGNORECASE)):
                 captcha_detected = True
@@ -93,12 +96,11 @@ class CAPTCHAFormAntiAutomationPlugin(BasePlugin):
             "CaptchaMethods": list(set(captcha_methods))  # Remove duplicates
         }
 
-    def analyze_forms(self, html: str) -> dict:
+    def analyze_forms(self, soup) -> dict:
         anti_automation = {
             "Forms": []
         }
         try:
-            soup = BeautifulSoup(html, 'html.parser')
             forms = soup.find_all('form')
             for form in forms:
                 form_info = {}
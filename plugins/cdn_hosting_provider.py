@@ -1,9 +1,11 @@
 # plugins/cdn_hosting_provider.py
 from plugins.base_plugin import BasePlugin
-import requests
-from bs4 import BeautifulSoup
-import re
+from utils.target import resolve_target
 import dns.resolver
+from utils import http_cache
+from utils.signature_engine import get_signature_engine
+from utils.ip_ranges import get_ip_database
+from utils.whois_service import get_whois_service
 
 class CDNHostingProviderPlugin(BasePlugin):
     @property
@@ -21,13 +23,11 @@ class CDNHostingProviderPlugin(BasePlugin):
     def run(self, target: str) -> dict:
         results = {}
         try:
-            if not target.startswith(("http://", "https://")):
-                target = "http://" + target  # Default to HTTP if scheme not provided
-            parsed_url = requests.utils.urlparse(target)
-            hostname = parsed_url.hostname
+            resolved = resolve_target(target)
+            hostname = resolved.host
 
             # 1. Determine CDN Usage
-            cdn_info = self.detect_cdn(hostname)
+            cdn_info = self.detect_cdn(resolved.url)
             results["CDN Usage"] = cdn_info
 
             # 2. Hosting Provider Details
@@ -39,47 +39,14 @@ class CDNHostingProviderPlugin(BasePlugin):
 
         return results
 
-    def detect_cdn(self, hostname):
+    def detect_cdn(self, url):
         cdn_info = {}
         try:
-            response = requests.get(f"http://{hostname}", timeout=10)
-            headers = response.headers
-
-            # Common CDN headers
-            cdn_signatures = {
-                "cloudflare": "cloudflare",
-                "akamai": "akamai",
-                "incapsula": "incapsula",
-                "stackpath": "stackpath",
-                "cdn77": "cdn77",
-                "fastly": "fastly",
-                "azure": "azure",
-                "amazon": "amazon",
-                "stackpath": "stackpath",
-                "google": "google",
-                "sucuri": "sucuri",
-            }
-
-            detected_cdn = []
-            for cdn, signature in cdn_signatures.items():
-                if signature in headers.get('Server', '').lower() or signature in headers.get('X-CDN', '').lower():
-                    detected_cdn.append(cdn.capitalize())
-
-            # Additionally, check for CDN-specific URLs in HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            scripts = soup.find_all('script', src=True)
-            stylesheets = soup.find_all('link', href=True)
-            cdn_domains = set()
-            for tag in scripts + stylesheets:
-                src = tag.get('src') or tag.get('href')
-                for cdn in cdn_signatures.keys():
-                    if cdn in src:
-                        cdn_domains.add(cdn.capitalize())
-
-            if cdn_domains:
-                detected_cdn.extend(list(cdn_domains))
-
-            detected_cdn = list(set(detected_cdn))  # Remove duplicates
+            response = http_cache.fetch(url, timeout=10)
+
+            # CDN names in the Server / X-CDN headers and in script and stylesheet URLs (resources/signatures/cdn.json)
+            matches = get_signature_engine().scan(response.headers, response.text)
+            detected_cdn = matches.names("cdn")
 
             if detected_cdn:
                 cdn_info["CDN Providers"] = detected_cdn
@@ -99,6 +66,19 @@ class CDNHostingProviderPlugin(BasePlugin):
             ip_address = answers[0].to_text()
             hosting_info["IP Address"] = ip_address
 
+            # Attribute every address to its cloud/CDN provider and ASN from the local IP range index
+            addresses = [answer.to_text() for answer in answers]
+            try:
+                addresses += [answer.to_text() for answer in resolver.resolve(hostname, 'AAAA')]
+            except Exception:
+                pass  # No IPv6 addresses
+            attribution = get_ip_database().lookup_many(addresses)
+            hosting_info["IP Attribution"] = attribution
+            providers = sorted({a["Provider"] for a in attribution.values() if a.get("Provider")})
+            networks = sorted({f"AS{a['ASN']} {a['AS Name']}" for a in attribution.values() if a.get("ASN")})
+            hosting_info["Hosting Provider"] = ", ".join(providers) if providers else "Not a published cloud/CDN range."
+            hosting_info["Networks"] = networks
+
             # Perform reverse DNS lookup
             reverse_dns = resolver.resolve_address(ip_address)
             reverse_hostname = reverse_dns[0].to_text()
@@ -106,11 +86,10 @@ class CDNHostingProviderPlugin(BasePlugin):
 
             # Perform WHOIS lookup (requires 'python-whois' package)
             try:
-                import whois
-                domain_info = whois.whois(hostname)
-                hosting_info["Registrar"] = domain_info.registrar
-                hosting_info["Creation Date"] = domain_info.creation_date
-                hosting_info["Expiration Date"] = domain_info.expiration_date
+                domain_info = get_whois_service().lookup(hostname)
+                hosting_info["Registrar"] = domain_info.get("registrar")
+                hosting_info["Creation Date"] = domain_info.get("creation_date")
+                hosting_info["Expiration Date"] = domain_info.get("expiration_date")
             except ImportError:
                 hosting_info["Registrar"] = "whois package not installed."
             except Exception as e:
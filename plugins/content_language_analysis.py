@@ -1,23 +1,14 @@
 # plugins/content_language_analysis.py
-import requests
-from bs4 import BeautifulSoup
 from langdetect import detect, DetectorFactory
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from plugins.base_plugin import BasePlugin
+from utils import nlp_resources
+from utils.crawler import analyze_site
+from utils.text_analytics import analyze_corpus
 from collections import Counter
-import string
 
 # Ensure deterministic results in langdetect
 DetectorFactory.seed = 0
 
-# Download necessary NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('vader_lexicon')
-from nltk.sentiment import SentimentIntensityAnalyzer
-
 
 class ContentLanguageAnalysisPlugin(BasePlugin):
     @property
@@ -39,56 +30,48 @@ class ContentLanguageAnalysisPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def analyzes_pages(self) -> bool:
+        return True
+
+    def warm_up(self):
+        # Verify the NLTK corpora and build the shared analyzer, stopwords and tokenizer
+        nlp_resources.warm_up()
+
     def run(self, target: str) -> dict:
-        results = {}
         try:
-            url = self.normalize_url(target)
-            # 1. Fetch Content
-            content = self.fetch_content(url)
-            if not content:
-                results["Error"] = "Failed to retrieve content."
-                return results
+            return analyze_site(self, target)
+        except Exception as e:
+            return {"Error": str(e)}
 
+    def analyze_page(self, page) -> dict:
+        # 1. Content: visible text of every HTML page, for the site-wide corpus
+        if page.status_code != 200 or not page.text:
+            return {}
+        result = {"Text": page.visible_text}
+        if page.depth == 0:
+            # Language Tags and Localization Settings, from the root page
+            result["LanguageTags"] = self.get_language_tags(page.soup)
+        return result
+
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        root = next((result for result in page_results.values() if "LanguageTags" in result), None)
+        if root is None or not root["Text"].strip():
+            return {"Error": "Failed to retrieve content."}
+        content = root["Text"]
+        documents = {url: result["Text"] for url, result in page_results.items() if result.get("Text", "").strip()}
+        return {
             # 2. Language Detection
-            language = self.detect_language(content)
-            results["Language"] = language
-
+            "Language": self.detect_language(content),
             # 3. Sentiment Analysis
-            sentiment = self.analyze_sentiment(content)
-            results["Sentiment"] = sentiment
-
+            "Sentiment": self.analyze_sentiment(content),
             # 4. Keyword Extraction
-            keywords = self.extract_keywords(content)
-            results["Keywords"] = keywords
-
+            "Keywords": self.extract_keywords(content),
             # 5. Language Tags and Localization Settings
-            lang_tags = self.get_language_tags(url)
-            results["LanguageTags"] = lang_tags
-
-        except Exception as e:
-            results["Error"] = str(e)
-
-        return results
-
-    def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
-
-    def fetch_content(self, url: str) -> str:
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                # Remove scripts and styles
-                for script_or_style in soup(['script', 'style']):
-                    script_or_style.decompose()
-                text = soup.get_text(separator=' ')
-                return text
-            else:
-                return ""
-        except requests.RequestException:
-            return ""
+            "LanguageTags": root["LanguageTags"],
+            # 6. Site-wide language, sentiment and TF-IDF keywords over the crawled pages
+            "SiteAnalysis": analyze_corpus(documents),
+        }
 
     def detect_language(self, text: str) -> str:
         try:
@@ -99,7 +82,9 @@ class ContentLanguageAnalysisPlugin(BasePlugin):
 
     def analyze_sentiment(self, text: str) -> dict:
         try:
-            sia = SentimentIntensityAnalyzer()
+            sia = nlp_resources.get_sentiment_analyzer()
+            if sia is None:
+                return {"Error": "VADER lexicon is not available; connect once to download it."}
             sentiment = sia.polarity_scores(text)
             return sentiment
         except Exception as e:
@@ -108,9 +93,9 @@ class ContentLanguageAnalysisPlugin(BasePlugin):
     def extract_keywords(self, text: str) -> list:
         try:
             # Tokenize the text
-            words = word_tokenize(text.lower())
+            words = nlp_resources.tokenize(text.lower())
             # Remove punctuation and stopwords
-            stop_words = set(stopwords.words('english'))
+            stop_words = nlp_resources.get_stop_words('english')
             words = [
                 word for word in words
                 if word.isalpha() and word not in stop_words
@@ -123,19 +108,8 @@ class ContentLanguageAnalysisPlugin(BasePlugin):
         except Exception as e:
             return [f"Error extracting keywords: {str(e)}"]
 
-    def get_language_tags(self, url: str) -> dict:
-        lang_tags = {}
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                html_tag = soup.find('html')
-                if html_tag and html_tag.has_attr('lang'):
-                    lang_tags["html_lang"] = html_tag['lang']
-                else:
-                    lang_tags["html_lang"] = "Not specified."
-            else:
-                lang_tags["html_lang"] = "Failed to retrieve HTML."
-        except requests.RequestException as e:
-            lang_tags["html_lang"] = f"Error: {str(e)}"
-        return lang_tags
+    def get_language_tags(self, soup) -> dict:
+        html_tag = soup.find('html')
+        if html_tag and html_tag.has_attr('lang'):
+            return {"html_lang": html_tag['lang']}
+        return {"html_lang": "Not specified."}
@@ -4,6 +4,7 @@ from bs4 import BeautifulSoup
 import re
 from urllib.parse import urljoin
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 
 
 class CookiePolicyGDPRCompliancePlugin(BasePlugin):
@@ -54,9 +55,7 @@ class CookiePolicyGDPRCompliancePlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith(("http://", "https://")):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def fetch_response(self, url: str) -> requests.Response:
         try:
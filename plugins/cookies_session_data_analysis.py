@@ -5,6 +5,7 @@ import re
 from collections import Counter
 import math
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 
 
 class CookiesSessionDataAnalysisPlugin(BasePlugin):
@@ -27,6 +28,10 @@ class CookiesSessionDataAnalysisPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def cpu_bound(self) -> bool:
+        return True  # Entropy and pattern analysis of cookie values
+
     def run(self, target: str) -> dict:
         results = {}
         try:
@@ -60,9 +65,7 @@ class CookiesSessionDataAnalysisPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def fetch_response(self, url: str) -> requests.Response:
         try:
@@ -1,9 +1,12 @@
 # plugins/database_error_detection.py
-import requests
-from bs4 import BeautifulSoup
-import re
 from urllib.parse import urljoin
 from plugins.base_plugin import BasePlugin
+from utils.crawler import analyze_site, unique_forms
+from utils.form_probe import FormProbe
+from utils.signature_engine import get_signature_engine
+
+# Ordered so the payloads most likely to break a query are sent first
+SQL_PAYLOADS = ["'", "' OR '1'='1", '"', "1'\"", "')", "`", "1 AND 1=CONVERT(int, @@version)--", "\\"]
 
 
 class DatabaseErrorDetectionPlugin(BasePlugin):
@@ -23,47 +26,35 @@ class DatabaseErrorDetectionPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def analyzes_pages(self) -> bool:
+        return True
+
     def run(self, target: str) -> dict:
-        results = {}
         try:
-            base_url = self.normalize_url(target)
-            response = self.fetch_response(base_url)
-            if not response:
-                results["Error"] = "Failed to retrieve website content."
-                return results
-
-            # 1. Detect Forms that may interact with databases
-            forms = self.detect_forms(base_url, response.text)
-            results["Forms"] = forms
-
-            # 2. Test Forms for Database Errors
-            forms_analysis = self.test_forms_for_db_errors(base_url, forms)
-            results["FormsAnalysis"] = forms_analysis
-
+            return analyze_site(self, target)
         except Exception as e:
-            results["Error"] = str(e)
-
-        return results
-
-    def normalize_url(self, target: str) -> str:
-        if not target.startswith(("http://", "https://")):
-            target = "http://" + target
-        return target
-
-    def fetch_response(self, url: str) -> requests.Response:
-        try:
-            headers = {
-                "User-Agent": "DeepWebsiteAnalyzer/1.0"
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            return response
-        except requests.RequestException:
-            return None
-
-    def detect_forms(self, base_url: str, html_content: str) -> list:
+            return {"Error": str(e)}
+
+    def analyze_page(self, page) -> dict:
+        # 1. Detect Forms that may interact with databases
+        return {"Forms": self.detect_forms(page.final_url, page.soup)}
+
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        if not page_results:
+            return {"Error": "Failed to retrieve website content."}
+        # Forms shared by many pages (search boxes, newsletters) are tested once
+        forms = unique_forms(page_results, "Forms", ("Action", "Method", "Inputs"))
+        # 2. Test Forms for Database Errors
+        return {
+            "Forms": forms,
+            "FormsAnalysis": self.test_forms_for_db_errors(forms),
+            "PagesScanned": len(page_results),
+        }
+
+    def detect_forms(self, base_url: str, soup) -> list:
         forms = []
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
             for form in soup.find_all('form'):
                 form_details = {}
                 form_details["Action"] = urljoin(base_url, form.get('action', ''))
@@ -74,51 +65,71 @@ class DatabaseErrorDetectionPlugin(BasePlugin):
             pass
         return forms
 
-    def test_forms_for_db_errors(self, base_url: str, forms: list) -> list:
+    def test_forms_for_db_errors(self, forms: list) -> list:
         analysis_results = []
         try:
-            sql_error_patterns = [
-                re.compile(r'syntax error.*?MySQL', re.IGNORECASE),
-                re.compile(r'unclosed quotation mark after the character string', re.IGNORECASE),
-                re.compile(r'You have an error in your SQL syntax', re.IGNORECASE),
-                re.compile(r'Warning: mysql_', re.IGNORECASE),
-                re.compile(r'pg_query():', re.IGNORECASE),
-                re.compile(r'ORA-\d+', re.IGNORECASE),
-                re.compile(r'SQLServer', re.IGNORECASE)
-            ]
-
-            # SQL Injection payload
-            sql_payload = "' OR '1'='1"
-
+            engine = get_signature_engine()
+        except (OSError, ValueError) as e:
+            # Without signatures nothing can be tested; say so for every form
             for form in forms:
-                form_result = {}
-                form_result["Action"] = form["Action"]
-                form_result["Method"] = form["Method"]
-                form_result["Inputs"] = form["Inputs"]
-                form_result["VulnerableFields"] = []
-
-                # Prepare payload
-                data = {}
-                for input_name in form["Inputs"]:
-                    data[input_name] = sql_payload
-
-                try:
-                    if form["Method"] == "POST":
-                        response = requests.post(form["Action"], data=data, timeout=10)
-                    else:
-                        response = requests.get(form["Action"], params=data, timeout=10)
-
-                    if response:
-                        for pattern in sql_error_patterns:
-                            if pattern.search(response.text):
-                                form_result["VulnerableFields"].append(input_name)
-                                break
-                        if not form_result["VulnerableFields"]:
-                            form_result["VulnerableFields"] = "No database errors detected."
-                except requests.RequestException as e:
-                    form_result["Error"] = f"Error during form testing: {str(e)}"
-
-                analysis_results.append(form_result)
-        except Exception:
-            pass
+                analysis_results.append({
+                    "Action": form["Action"],
+                    "Method": form["Method"],
+                    "Inputs": form["Inputs"],
+                    "Error": f"Error during form testing: {str(e)}",
+                })
+            return analysis_results
+        testable = [form for form in forms if form["Inputs"]]
+        probe = FormProbe()
+        try:
+            def database_errors(response) -> set:
+                # One pass of the shared signature engine (resources/signatures/database_errors.json)
+                return set(engine.scan(body=response.text, status=response.status_code).names("database_errors"))
+
+            def ordinary_errors(form, label, response):
+                return database_errors(response)
+
+            # Errors a form shows for ordinary input are not caused by the payloads
+            baselines = {}
+            for report in probe.run(testable, self.benign_submission, ordinary_errors):
+                baselines[id(report.form)] = set().union(*report.findings)
+
+            def evaluate(form, label, response):
+                errors = database_errors(response) - baselines.get(id(form), set())
+                if not errors:
+                    return None
+                field, payload = label
+                return {"Field": field, "Payload": payload, "Databases": sorted(errors)}, True
+
+            reports = {id(report.form): report for report in probe.run(testable, self.sql_payloads, evaluate)}
+        finally:
+            probe.close()
+        for form in forms:
+            form_result = {}
+            form_result["Action"] = form["Action"]
+            form_result["Method"] = form["Method"]
+            form_result["Inputs"] = form["Inputs"]
+            report = reports.get(id(form))
+            findings = report.findings if report else []
+            form_result["VulnerableFields"] = (
+                list(dict.fromkeys(finding["Field"] for finding in findings)) or "No database errors detected."
+            )
+            if findings:
+                form_result["DatabaseErrors"] = findings
+            if report:
+                form_result["Requests"] = report.requests
+                if report.errors and len(report.errors) == report.requests:  # Not a single response
+                    form_result["Error"] = f"Error during form testing: {report.errors[0]}"
+            analysis_results.append(form_result)
         return analysis_results
+
+    def benign_submission(self, form: dict):
+        yield "baseline", {name: "test" for name in form["Inputs"]}, None
+
+    def sql_payloads(self, form: dict):
+        """One field at a time, so a reported error is attributed to its field."""
+        for payload in SQL_PAYLOADS:
+            for field in form["Inputs"]:
+                data = {name: "test" for name in form["Inputs"]}
+                data[field] = payload
+                yield (field, payload), data, None
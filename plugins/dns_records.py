@@ -1,5 +1,6 @@
 # plugins/dns_records.py
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 import dns.resolver
 
 class DNSRecordsPlugin(BasePlugin):
@@ -11,10 +12,19 @@ class DNSRecordsPlugin(BasePlugin):
     def description(self) -> str:
         return "Retrieve DNS records such as A, AAAA, MX, NS, SOA, TXT, CNAME, PTR, SRV, and DNSSEC records."
 
+    @property
+    def cache_ttl(self) -> int:
+        return 3600  # One hour
+
+    @property
+    def content_dependent(self) -> bool:
+        return False
+
     def run(self, target: str) -> dict:
         record_types = ['A', 'AAAA', 'MX', 'NS', 'SOA', 'TXT', 'CNAME', 'PTR', 'SRV', 'DNSKEY']
         results = {}
         resolver = dns.resolver.Resolver()
+        target = resolve_target(target).host
         for record in record_types:
             try:
                 answers = resolver.resolve(target, record)
@@ -1,8 +1,7 @@
 # plugins/email_addresses_extraction.py
-import requests
-from bs4 import BeautifulSoup
 import re
 from plugins.base_plugin import BasePlugin
+from utils.crawler import analyze_site, merge_lists
 
 
 class EmailAddressesExtractionPlugin(BasePlugin):
@@ -22,42 +21,27 @@ class EmailAddressesExtractionPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def analyzes_pages(self) -> bool:
+        return True
+
     def run(self, target: str) -> dict:
-        results = {}
         try:
-            url = self.normalize_url(target)
-            content = self.fetch_content(url)
-            if not content:
-                results["Error"] = "Failed to retrieve website content."
-                return results
-
-            emails = self.extract_emails(content)
-            results["EmailAddresses"] = emails
-
+            return analyze_site(self, target)
         except Exception as e:
-            results["Error"] = str(e)
-
-        return results
-
-    def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
-
-    def fetch_content(self, url: str) -> str:
-        try:
-            response = requests.get(url, timeout=15)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                # Remove scripts and styles
-                for script_or_style in soup(['script', 'style']):
-                    script_or_style.decompose()
-                text = soup.get_text(separator=' ')
-                return text
-            else:
-                return ""
-        except requests.RequestException:
-            return ""
+            return {"Error": str(e)}
+
+    def analyze_page(self, page) -> dict:
+        return {"EmailAddresses": self.extract_emails(page.visible_text)}
+
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        if not page_results:
+            return {"Error": "Failed to retrieve website content."}
+        return {
+            "EmailAddresses": merge_lists(page_results, "EmailAddresses"),
+            "FoundOn": {url: r["EmailAddresses"] for url, r in page_results.items() if r.get("EmailAddresses")},
+            "PagesScanned": len(page_results),
+        }
 
     def extract_emails(self, text: str) -> list:
         # Regex pattern for email extraction
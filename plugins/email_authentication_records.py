@@ -2,6 +2,7 @@
 import dns.resolver
 import socket
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 
 
 class EmailAuthenticationRecordsPlugin(BasePlugin):
@@ -23,6 +24,10 @@ class EmailAuthenticationRecordsPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def content_dependent(self) -> bool:
+        return False
+
     def run(self, target: str) -> dict:
         results = {}
         try:
@@ -53,10 +58,7 @@ class EmailAuthenticationRecordsPlugin(BasePlugin):
         return results
 
     def extract_domain(self, target: str) -> str:
-        if target.startswith("http"):
-            target = target.split("://")[1]
-        domain = target.split("/")[0]
-        return domain
+        return resolve_target(target).host
 
     def get_spf_record(self, domain: str) -> str:
         try:
@@ -10,6 +10,7 @@ from openpyxl import load_workbook
 from PyPDF2 import PdfReader
 import hashlib
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 
 
 class ExifMetadataExtractionPlugin(BasePlugin):
@@ -31,6 +32,10 @@ class ExifMetadataExtractionPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def cpu_bound(self) -> bool:
+        return True  # Image, PDF and DOCX metadata parsing
+
     def run(self, target: str) -> dict:
         results = {}
         try:
@@ -62,9 +67,7 @@ class ExifMetadataExtractionPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def fetch_response(self, url: str) -> requests.Response:
         try:
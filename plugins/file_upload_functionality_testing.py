@@ -1,9 +1,18 @@
 # plugins/file_upload_functionality_testing.py
 import requests
-from bs4 import BeautifulSoup
-import re
-import os
 from plugins.base_plugin import BasePlugin
+from utils.crawler import analyze_site, unique_forms
+from utils.form_probe import FormProbe
+from utils.signature_engine import get_signature_engine
+
+TEST_FILE_TEXT = b"This is a test file for upload functionality testing."
+# (filename, content, content type), riskiest first: a form that takes HTML takes anything
+TEST_FILES = [
+    ("test.html", b"<p>" + TEST_FILE_TEXT + b"</p>", "text/html"),
+    ("test.jpg", TEST_FILE_TEXT, "image/jpeg"),  # Content does not match the declared type
+    ("test.txt", TEST_FILE_TEXT, "text/plain"),
+]
+UNRESTRICTED = "Unrestricted File Upload: Potential success message revealed."
 
 
 class FileUploadFunctionalityTestingPlugin(BasePlugin):
@@ -23,47 +32,34 @@ class FileUploadFunctionalityTestingPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def analyzes_pages(self) -> bool:
+        return True
+
     def run(self, target: str) -> dict:
-        results = {}
         try:
-            base_url = self.normalize_url(target)
-            response = self.fetch_response(base_url)
-            if not response:
-                results["Error"] = "Failed to retrieve website content."
-                return results
-
-            # 1. Detect File Upload Forms
-            upload_forms = self.detect_file_upload_forms(base_url, response.text)
-            results["FileUploadForms"] = upload_forms
-
-            # 2. Analyze Each File Upload Form
-            forms_analysis = self.analyze_upload_forms(base_url, upload_forms)
-            results["FormsAnalysis"] = forms_analysis
-
+            return analyze_site(self, target)
         except Exception as e:
-            results["Error"] = str(e)
-
-        return results
-
-    def normalize_url(self, target: str) -> str:
-        if not target.startswith(("http://", "https://")):
-            target = "http://" + target
-        return target
-
-    def fetch_response(self, url: str) -> requests.Response:
-        try:
-            headers = {
-                "User-Agent": "DeepWebsiteAnalyzer/1.0"
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            return response
-        except requests.RequestException:
-            return None
-
-    def detect_file_upload_forms(self, base_url: str, html_content: str) -> list:
+            return {"Error": str(e)}
+
+    def analyze_page(self, page) -> dict:
+        # 1. Detect File Upload Forms
+        return {"FileUploadForms": self.detect_file_upload_forms(page.final_url, page.soup)}
+
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        if not page_results:
+            return {"Error": "Failed to retrieve website content."}
+        upload_forms = unique_forms(page_results, "FileUploadForms", ("Action", "Method", "FileInputNames"))
+        # 2. Analyze Each File Upload Form
+        return {
+            "FileUploadForms": upload_forms,
+            "FormsAnalysis": self.analyze_upload_forms(upload_forms),
+            "PagesScanned": len(page_results),
+        }
+
+    def detect_file_upload_forms(self, base_url: str, soup) -> list:
         upload_forms = []
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
             forms = soup.find_all('form')
             for form in forms:
                 file_inputs = form.find_all('input', {'type': 'file'})
@@ -78,64 +74,56 @@ class FileUploadFunctionalityTestingPlugin(BasePlugin):
             pass
         return upload_forms
 
-    def analyze_upload_forms(self, base_url: str, upload_forms: list) -> list:
+    def analyze_upload_forms(self, upload_forms: list) -> list:
         analysis_results = []
+        probe = FormProbe()
         try:
-            for form in upload_forms:
-                form_result = {}
-                form_result["Action"] = form["Action"]
-                form_result["Method"] = form["Method"]
-                form_result["FileInputNames"] = form["FileInputNames"]
-                form_result["AcceptedFileTypes"] = form["Accept"]
-
-                # Attempt to upload a benign file
-                test_file_path = self.create_test_file()
-                files = {}
-                for file_input in form["FileInputNames"]:
-                    files[file_input] = ('test.txt', open(test_file_path, 'rb'), 'text/plain')
-
-                try:
-                    if form["Method"] == "POST":
-                        response = requests.post(form["Action"], files=files, timeout=10)
-                    else:
-                        response = requests.get(form["Action"], files=files, timeout=10)
-
-                    if response.status_code in [200, 201, 302]:
-                        form_result["UploadStatus"] = "Success"
-                        # Analyze response for potential vulnerabilities
-                        vulnerability = self.analyze_response_for_vulnerabilities(response.text)
-                        form_result["PotentialVulnerabilities"] = vulnerability
-                    else:
-                        form_result["UploadStatus"] = f"Failed with status code {response.status_code}"
-                except requests.RequestException as e:
-                    form_result["UploadStatus"] = f"Error during upload: {str(e)}"
-                finally:
-                    # Clean up the opened file
-                    for file in files.values():
-                        file[1].close()
-                    # Remove the test file
-                    os.remove(test_file_path)
-
-                analysis_results.append(form_result)
-        except Exception:
-            pass
+            def evaluate(form, label, response):
+                accepted = response.status_code in [200, 201, 302]
+                vulnerabilities = self.analyze_response_for_vulnerabilities(response.text) if accepted else []
+                upload = {
+                    "File": label,
+                    "Status": response.status_code,
+                    "Accepted": accepted,
+                    "PotentialVulnerabilities": vulnerabilities,
+                }
+                # Accepting HTML settles it; the milder files need not be tried
+                return upload, accepted and label == TEST_FILES[0][0] and UNRESTRICTED in vulnerabilities
+
+            reports = probe.run(upload_forms, self.test_uploads, evaluate)
+        finally:
+            probe.close()
+        for report in reports:
+            form = report.form
+            form_result = {}
+            form_result["Action"] = form["Action"]
+            form_result["Method"] = form["Method"]
+            form_result["FileInputNames"] = form["FileInputNames"]
+            form_result["AcceptedFileTypes"] = form["Accept"]
+            uploads = sorted(report.findings, key=lambda upload: upload["File"])
+            if any(upload["Accepted"] for upload in uploads):
+                form_result["UploadStatus"] = "Success"
+                form_result["AcceptedFiles"] = [upload["File"] for upload in uploads if upload["Accepted"]]
+                form_result["PotentialVulnerabilities"] = sorted({
+                    vulnerability for upload in uploads for vulnerability in upload["PotentialVulnerabilities"]
+                })
+            elif uploads:
+                form_result["UploadStatus"] = f"Failed with status code {uploads[0]['Status']}"
+            else:
+                form_result["UploadStatus"] = f"Error during upload: {report.errors[0] if report.errors else ''}"
+            form_result["Uploads"] = uploads
+            analysis_results.append(form_result)
         return analysis_results
 
-    def create_test_file(self) -> str:
-        file_path = "test.txt"
-        with open(file_path, 'w') as f:
-            f.write("This is a test file for upload functionality testing.")
-        return file_path
+    def test_uploads(self, form: dict):
+        """Benign test files, built in memory, one submission per file type."""
+        for filename, content, content_type in TEST_FILES:
+            files = {name: (filename, content, content_type) for name in form["FileInputNames"]}
+            yield filename, None, files
 
     def analyze_response_for_vulnerabilities(self, response_text: str) -> list:
-        vulnerabilities = []
-        # Simple heuristic checks
-        if re.search(r'(uploaded successfully|file uploaded|successfully uploaded)', response_text, re.IGNORECASE):
-            vulnerabilities.append("Unrestricted File Upload: Potential success message revealed.")
-        if re.search(r'(error|failed|invalid)', response_text, re.IGNORECASE):
-            vulnerabilities.append("Error Messages: May reveal server-side validation.")
-        # Additional checks can be implemented here
-        return vulnerabilities
+        # Success and validation messages (resources/signatures/upload_responses.json), one pass
+        return get_signature_engine().scan(body=response_text).names("upload_responses")
 
     def check_url_exists(self, url: str) -> bool:
         try:
@@ -2,9 +2,12 @@
 import requests
 import json
 import dns.resolver
-import whois
 from datetime import datetime
+from urllib.parse import urlparse
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
+from utils.wayback import get_wayback_index
+from utils.whois_service import get_whois_service
 
 
 class HistoricalDataArchivePlugin(BasePlugin):
@@ -26,23 +29,25 @@ class HistoricalDataArchivePlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def content_dependent(self) -> bool:
+        return False
+
     def run(self, target: str) -> dict:
         results = {}
         try:
-            # Validate and normalize the target
-            if not target.startswith("http"):
-                target = "http://" + target
+            resolved = resolve_target(target)
 
             # 1. Wayback Machine Snapshots
-            snapshots = self.get_wayback_snapshots(target)
+            snapshots = self.get_wayback_snapshots(resolved.url)
             results["WaybackMachineSnapshots"] = snapshots
 
             # 2. Current DNS Records (Historical DNS without paid services is limited)
-            dns_records = self.get_dns_records(target)
+            dns_records = self.get_dns_records(resolved.host)
             results["DNSRecords"] = dns_records
 
             # 3. Domain History via WHOIS
-            domain_history = self.get_domain_history(target)
+            domain_history = self.get_domain_history(resolved.domain)
             results["DomainHistory"] = domain_history
 
         except Exception as e:
@@ -50,19 +55,18 @@ class HistoricalDataArchivePlugin(BasePlugin):
 
         return results
 
-    def get_wayback_snapshots(self, url: str) -> list:
-        snapshots = []
-        wayback_api = f"http://archive.org/wayback/available?url={url}"
-        response = requests.get(wayback_api, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if "archived_snapshots" in data and "closest" in data["archived_snapshots"]:
-                snapshot = data["archived_snapshots"]["closest"]
-                snapshots.append({
-                    "timestamp": snapshot.get("timestamp"),
-                    "available": snapshot.get("available"),
-                    "url": snapshot.get("url")
-                })
+    def get_wayback_snapshots(self, url: str) -> dict:
+        # Incremental CDX index of the whole domain, stored under data/wayback
+        hostname = urlparse(url).hostname or url
+        if hostname.startswith("www."):
+            hostname = hostname[4:]
+        index = get_wayback_index(hostname)
+        try:
+            progress = index.update()
+        except requests.RequestException as e:
+            progress = {"Error": f"CDX update failed, showing stored captures: {str(e)}"}
+        snapshots = index.summary()
+        snapshots["Update"] = progress
         return snapshots
 
     def get_dns_records(self, domain: str) -> dict:
@@ -82,14 +86,14 @@ class HistoricalDataArchivePlugin(BasePlugin):
     def get_domain_history(self, domain: str) -> dict:
         history = {}
         try:
-            w = whois.whois(domain)
-            history["creation_date"] = str(w.creation_date)
-            history["expiration_date"] = str(w.expiration_date)
-            history["updated_date"] = str(w.updated_date)
-            history["registrar"] = w.registrar
-            history["registrant_name"] = w.name
-            history["registrant_organization"] = w.org
-            history["status"] = w.status
+            w = get_whois_service().lookup(domain)
+            history["creation_date"] = w.get("creation_date")
+            history["expiration_date"] = w.get("expiration_date")
+            history["updated_date"] = w.get("updated_date")
+            history["registrar"] = w.get("registrar")
+            history["registrant_name"] = w.get("name")
+            history["registrant_organization"] = w.get("org")
+            history["status"] = w.get("status")
         except Exception as e:
             history["Error"] = str(e)
         return history
@@ -1,5 +1,6 @@
 # plugins/http_headers.py
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 import requests
 
 class HTTPHeadersPlugin(BasePlugin):
@@ -16,10 +17,11 @@ class HTTPHeadersPlugin(BasePlugin):
             headers = {
                 'User-Agent': 'DeepWebsiteAnalyzer/1.0'
             }
-            response = requests.head(target, headers=headers, allow_redirects=True, timeout=10)
+            url = resolve_target(target).url
+            response = requests.head(url, headers=headers, allow_redirects=True, timeout=10)
             if response.status_code >= 400:
                 # Some servers may not respond properly to HEAD requests
-                response = requests.get(target, headers=headers, allow_redirects=True, timeout=10)
+                response = requests.get(url, headers=headers, allow_redirects=True, timeout=10)
 
             headers = response.headers
 
@@ -4,6 +4,7 @@ import requests
 from bs4 import BeautifulSoup
 import re
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 
 
 class HTTPVersionProtocolSupportPlugin(BasePlugin):
@@ -53,9 +54,7 @@ class HTTPVersionProtocolSupportPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith(("http://", "https://")):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def detect_http_versions(self, url: str) -> list:
         supported_versions = []
@@ -1,6 +1,8 @@
 # plugins/ip_geolocation.py
 from plugins.base_plugin import BasePlugin
-import socket
+from utils.geoip import get_geoip_service
+from utils.ip_ranges import get_ip_database
+from utils.target import resolve_target
 
 class IPGeolocationPlugin(BasePlugin):
     @property
@@ -11,22 +13,46 @@ class IPGeolocationPlugin(BasePlugin):
     def description(self) -> str:
         return "Determine the physical location (country, region, city), coordinates, and ISP of an IP address."
 
+    @property
+    def cache_ttl(self) -> int:
+        return 604800  # One week
+
+    @property
+    def content_dependent(self) -> bool:
+        return False
+
+    def warm_up(self):
+        # Map the local geolocation database before the first run; the IP range indexes,
+        # which may need a download, are loaded on the first lookup instead
+        get_geoip_service().available
+
     def run(self, target: str) -> dict:
         try:
-            # Get IP address
-            ip = socket.gethostbyname(target)
-            # Use freegeoip.app for geolocation
-            import requests
-            response = requests.get(f"https://freegeoip.app/json/{ip}")
-            data = response.json()
-            return {
+            # Geolocate every address the host resolves to in one batch (data/geoip/*.mmdb)
+            addresses = resolve_target(target).ips
+            if not addresses:
+                return {"Error": f"Could not resolve {resolve_target(target).host}"}
+            locations = get_geoip_service().lookup_many(addresses)
+            networks = get_ip_database().lookup_many(addresses)
+            for ip, location in locations.items():
+                if location is not None and not location.get("ISP") and networks[ip].get("AS Name"):
+                    location["ISP"] = networks[ip]["AS Name"]
+
+            ip = addresses[0]
+            location = locations.get(ip) or {}
+            result = {
                 "IP": ip,
-                "Country": data.get("country_name"),
-                "Region": data.get("region_name"),
-                "City": data.get("city"),
-                "Latitude": data.get("latitude"),
-                "Longitude": data.get("longitude"),
-                "ISP": data.get("metro_code"),
+                "Country": location.get("Country"),
+                "Region": location.get("Region"),
+                "City": location.get("City"),
+                "Latitude": location.get("Latitude"),
+                "Longitude": location.get("Longitude"),
+                "ISP": location.get("ISP"),
             }
+            if len(addresses) > 1:
+                result["Addresses"] = {ip: location or "Unknown" for ip, location in locations.items()}
+            if not any(locations.values()):
+                result["Note"] = "No geolocation data; place a GeoLite2-City or DB-IP City Lite .mmdb file in data/geoip."
+            return result
         except Exception as e:
             return {"Error": str(e)}
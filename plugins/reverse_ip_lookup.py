@@ -1,5 +1,6 @@
 # plugins/reverse_ip_lookup.py
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 from sublist3r import Sublist3r
 import os
 import requests
@@ -19,6 +20,10 @@ class ReverseIPLookupPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return ["SecurityTrails_API_Key"]
 
+    @property
+    def content_dependent(self) -> bool:
+        return False
+
     def run(self, target: str) -> dict:
         try:
             # Retrieve API key from config.json
@@ -33,7 +38,7 @@ class ReverseIPLookupPlugin(BasePlugin):
 
             # Resolve target domain to IP
             resolver = dns.resolver.Resolver()
-            answers = resolver.resolve(target, 'A')
+            answers = resolver.resolve(resolve_target(target).host, 'A')
             ip_address = answers[0].to_text()
 
             # Use SecurityTrails API for Reverse IP Lookup
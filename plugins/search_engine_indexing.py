@@ -1,8 +1,17 @@
 # plugins/search_engine_indexing.py
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 import requests
 from bs4 import BeautifulSoup
+import logging
 import re
+from utils.link_checker import LinkChecker
+from utils.robots import get_robots_service
+from utils.sitemaps import SitemapReader
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+MAX_LISTED_URLS = 1000
 
 class SearchEngineIndexingPlugin(BasePlugin):
     @property
@@ -20,10 +29,9 @@ class SearchEngineIndexingPlugin(BasePlugin):
     def run(self, target: str) -> dict:
         results = {}
         try:
-            if not target.startswith(("http://", "https://")):
-                target = "http://" + target  # Default to HTTP if scheme not provided
-            parsed_url = requests.utils.urlparse(target)
-            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+            resolved = resolve_target(target)
+            target = resolved.url
+            base_url = resolved.base_url
 
             # 1. Estimate Number of Pages Indexed
             indexed_pages = self.estimate_indexed_pages(target)
@@ -38,12 +46,13 @@ class SearchEngineIndexingPlugin(BasePlugin):
             sitemap_urls = self.get_sitemap(base_url)
             results["Sitemap URLs"] = sitemap_urls
 
-            # 4. Sitemap Enumeration
-            sitemap_contents = self.enumerate_sitemap(sitemap_urls)
+            # 4. Sitemap Enumeration and 5. Sitemap Discrepancies, in one pass over the sitemaps
+            sitemap_contents, sitemap_statistics = {}, {"Total URLs": 0}
+            sitemap_locs = self.enumerate_sitemap(sitemap_urls, sitemap_contents, sitemap_statistics)
+            discrepancies = self.check_sitemap_discrepancies(sitemap_locs)
+            sitemap_locs.close()  # Finalizes the statistics even if checking stopped early
             results["Sitemap Contents"] = sitemap_contents
-
-            # 5. Check for Sitemap Discrepancies
-            discrepancies = self.check_sitemap_discrepancies(sitemap_contents, target)
+            results["Sitemap Statistics"] = sitemap_statistics
             results["Sitemap Discrepancies"] = discrepancies
 
         except Exception as e:
@@ -80,26 +89,13 @@ class SearchEngineIndexingPlugin(BasePlugin):
         return indexed_pages
 
     def get_robots_txt(self, base_url):
-        robots_txt = ""
-        disallowed = []
-        try:
-            robots_url = f"{base_url}/robots.txt"
-            response = requests.get(robots_url, timeout=10)
-            if response.status_code == 200:
-                robots_txt = response.text
-                # Parse disallowed entries
-                lines = robots_txt.split('\n')
-                for line in lines:
-                    if line.strip().lower().startswith('disallow'):
-                        parts = line.split(':', 1)
-                        if len(parts) == 2:
-                            path = parts[1].strip()
-                            disallowed.append(path)
-            else:
-                robots_txt = f"robots.txt not found. Status code: {response.status_code}"
-        except Exception as e:
-            robots_txt = f"Error retrieving robots.txt: {str(e)}"
-        return robots_txt, disallowed
+        # Fetched once per host and shared with the crawler and other plugins
+        robots = get_robots_service().get(base_url)
+        if robots.found:
+            return robots.text, robots.disallowed()
+        if robots.error:
+            return f"Error retrieving robots.txt: {robots.error}", []
+        return f"robots.txt not found. Status code: {robots.status}", []
 
     def get_sitemap(self, base_url):
         sitemap_urls = []
@@ -110,49 +106,57 @@ class SearchEngineIndexingPlugin(BasePlugin):
                 sitemap_urls.append(sitemap_url)
             else:
                 # Attempt to find sitemap location from robots.txt
-                robots_url = f"{base_url}/robots.txt"
-                robots_response = requests.get(robots_url, timeout=10)
-                if robots_response.status_code == 200:
-                    matches = re.findall(r'Sitemap:\s*(\S+)', robots_response.text, re.I)
-                    sitemap_urls.extend(matches)
+                sitemap_urls.extend(get_robots_service().get(base_url).sitemaps)
         except Exception as e:
             sitemap_urls.append(f"Error retrieving sitemap: {str(e)}")
         return sitemap_urls if sitemap_urls else "No sitemap.xml found."
 
-    def enumerate_sitemap(self, sitemap_urls):
-        sitemap_contents = {}
+    def enumerate_sitemap(self, sitemap_urls, sitemap_contents, statistics):
+        """Stream every sitemap (following indexes) and yield each URL.
+
+        The first MAX_LISTED_URLS URLs are listed in sitemap_contents; statistics counts all of them.
+        """
+        if not isinstance(sitemap_urls, list):
+            return
+        reader = SitemapReader()
         try:
-            for sitemap in sitemap_urls:
-                response = requests.get(sitemap, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'xml')
-                    urls = [loc.text for loc in soup.find_all('loc')]
-                    sitemap_contents[sitemap] = urls
-                else:
-                    sitemap_contents[sitemap] = f"Failed to retrieve sitemap. Status code: {response.status_code}"
+            for entry in reader.urls(url for url in sitemap_urls if url.startswith("http")):
+                statistics["Total URLs"] += 1
+                if statistics["Total URLs"] <= MAX_LISTED_URLS:
+                    sitemap_contents.setdefault(entry["sitemap"], []).append(entry["loc"])
+                yield entry["loc"]
         except Exception as e:
-            sitemap_contents[sitemap] = f"Error enumerating sitemap: {str(e)}"
-        return sitemap_contents
-
-    def check_sitemap_discrepancies(self, sitemap_contents, target):
+            statistics["Error"] = f"Error enumerating sitemap: {str(e)}"
+        finally:
+            for sitemap, error in reader.errors.items():
+                sitemap_contents[sitemap] = f"Failed to retrieve sitemap. {error}"
+            statistics["Sitemaps Read"] = reader.sitemaps
+            statistics["Duplicate URLs"] = reader.duplicates
+            if statistics["Total URLs"] > MAX_LISTED_URLS:
+                statistics["Note"] = f"Only the first {MAX_LISTED_URLS} URLs are listed."
+
+    def check_sitemap_discrepancies(self, sitemap_urls):
+        """Verify every sitemap URL as it is streamed in; only the broken ones are kept."""
         discrepancies = {}
+        checked = 0
+        broken_urls = []
         try:
-            # Extract all URLs from sitemap
-            sitemap_urls = []
-            for sitemap, urls in sitemap_contents.items():
-                if isinstance(urls, list):
-                    sitemap_urls.extend(urls)
-            # Simple check: compare with actual URLs on the site (limited)
-            # For demonstration, assume discrepancy if sitemap has URLs that return 404
-            broken_urls = []
-            for url in sitemap_urls:
-                try:
-                    response = requests.get(url, timeout=10)
-                    if response.status_code == 404:
-                        broken_urls.append(url)
-                except:
-                    broken_urls.append(url)
-            discrepancies["Broken URLs in Sitemap"] = broken_urls if broken_urls else "No broken URLs detected in sitemap."
+            # Verify every URL concurrently (HEAD, GET fallback, per-host limits)
+            checker = LinkChecker()
+            try:
+                for result in checker.check_many(sitemap_urls, progress=self._report_progress):
+                    checked += 1
+                    if result["Broken"]:
+                        broken_urls.append(result["URL"])
+            finally:
+                checker.close()
         except Exception as e:
             discrepancies["Error"] = str(e)
+        discrepancies["Checked URLs"] = checked
+        discrepancies["Broken URL Count"] = len(broken_urls)
+        discrepancies["Broken URLs in Sitemap"] = broken_urls if broken_urls else "No broken URLs detected in sitemap."
         return discrepancies
+
+    def _report_progress(self, done, submitted):
+        if done % 500 == 0:
+            logger.info(f"{self.name}: checked {done} sitemap URLs")
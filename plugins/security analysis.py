@@ -1,5 +1,6 @@
 # plugins/security_analysis.py
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 import socket
 import ssl
 import requests
@@ -28,11 +29,9 @@ class SecurityAnalysisPlugin(BasePlugin):
     def run(self, target: str) -> dict:
         results = {}
         try:
-            # Extract hostname from target
-            if not target.startswith(("http://", "https://")):
-                target = "http://" + target  # Default to HTTP if scheme not provided
-            parsed_url = requests.utils.urlparse(target)
-            hostname = parsed_url.hostname
+            resolved = resolve_target(target)
+            target = resolved.url
+            hostname = resolved.host
 
             # 1. Open Ports Scanning
             open_ports = self.scan_open_ports(hostname)
@@ -1,5 +1,6 @@
 # plugins/site_traffic_data.py
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 import requests
 
 class SiteTrafficDataPlugin(BasePlugin):
@@ -13,10 +14,7 @@ class SiteTrafficDataPlugin(BasePlugin):
 
     def run(self, target: str) -> dict:
         try:
-            # Extract domain from target URL
-            from urllib.parse import urlparse
-            parsed_url = urlparse(target)
-            domain = parsed_url.netloc if parsed_url.netloc else parsed_url.path
+            domain = resolve_target(target).domain
 
             # SimilarWeb API Endpoint
             # Note: You need to sign up for SimilarWeb API and obtain an API key.
@@ -1,8 +1,6 @@
 # plugins/social_media_third_party.py
 from plugins.base_plugin import BasePlugin
-import requests
-from bs4 import BeautifulSoup
-import re
+from utils.crawler import analyze_site, merge_list_dicts
 
 class SocialMediaThirdPartyPlugin(BasePlugin):
     @property
@@ -17,33 +15,41 @@ class SocialMediaThirdPartyPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []  # No API keys required
 
+    @property
+    def analyzes_pages(self) -> bool:
+        return True
+
     def run(self, target: str) -> dict:
-        results = {}
         try:
-            if not target.startswith(("http://", "https://")):
-                target = "http://" + target  # Default to HTTP if scheme not provided
-            response = requests.get(target, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            return analyze_site(self, target)
+        except Exception as e:
+            return {"Error": str(e)}
 
+    def analyze_page(self, page) -> dict:
+        soup = page.soup
+        return {
             # 1. Extract Social Media Profiles
-            social_media_profiles = self.extract_social_media_profiles(soup, target)
-            results["Social Media Profiles"] = social_media_profiles
-
+            "Social Media Profiles": self.extract_social_media_profiles(soup, page.final_url),
             # 2. Detect Third-party Tracking and Analytics Services
-            tracking_services = self.detect_tracking_services(soup)
-            results["Tracking and Analytics Services"] = tracking_services
-
+            "Tracking and Analytics Services": self.detect_tracking_services(soup),
             # 3. Detect Third-party Login Services
-            login_services = self.detect_login_services(soup)
-            results["Third-party Login Services"] = login_services
-
+            "Third-party Login Services": self.detect_login_services(soup),
             # 4. Detect Third-party Widgets
-            widgets = self.detect_widgets(soup)
-            results["Third-party Widgets"] = widgets
-
-        except Exception as e:
-            results["Error"] = str(e)
+            "Third-party Widgets": self.detect_widgets(soup),
+        }
 
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        if not page_results:
+            return {"Error": "Failed to retrieve website content."}
+        results = {}
+        for key, nothing_found in (
+            ("Social Media Profiles", "No social media profiles found."),
+            ("Tracking and Analytics Services", "No tracking or analytics services detected."),
+            ("Third-party Login Services", "No third-party login services detected."),
+            ("Third-party Widgets", "No third-party widgets detected."),
+        ):
+            results[key] = merge_list_dicts(page_results, key) or nothing_found
+        results["Pages Scanned"] = len(page_results)
         return results
 
     def extract_social_media_profiles(self, soup, base_url):
@@ -1,5 +1,6 @@
 # plugins/ssl_certificates.py
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 import ssl
 import socket
 import OpenSSL
@@ -14,9 +15,13 @@ class SSLCertificatesPlugin(BasePlugin):
     def description(self) -> str:
         return "Fetch SSL certificate details, including validity dates, issuer, subject, and SANs."
 
+    @property
+    def content_dependent(self) -> bool:
+        return False
+
     def run(self, target: str) -> dict:
         try:
-            hostname = target if ":" not in target else target.split(":")[0]
+            hostname = resolve_target(target).host
             context = ssl.create_default_context()
             with socket.create_connection((hostname, 443), timeout=10) as sock:
                 with context.wrap_socket(sock, server_hostname=hostname) as ssock:
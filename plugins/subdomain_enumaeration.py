@@ -4,6 +4,7 @@ from bs4 import BeautifulSoup
 import dns.resolver
 import re
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 
 
 class SubdomainEnumerationPlugin(BasePlugin):
@@ -25,6 +26,10 @@ class SubdomainEnumerationPlugin(BasePlugin):
     def required_api_keys(self) -> list:
         return []
 
+    @property
+    def content_dependent(self) -> bool:
+        return False
+
     def run(self, target: str) -> dict:
         results = {}
         try:
@@ -47,13 +52,11 @@ class SubdomainEnumerationPlugin(BasePlugin):
         return results
 
     def extract_domain(self, target: str) -> str:
-        if target.startswith("http"):
-            target = target.split("://")[1]
-        domain = target.split("/")[0]
-        return domain
+        return resolve_target(target).domain  # Enumerate the whole site, not just www
 
     def get_subdomains_crtsh(self, domain: str) -> list:
         subdomains = []
+        seen = set()  # Certificate logs repeat names thousands of times; avoid list scans
         try:
             url = f"https://crt.sh/?q=%25.{domain}&output=json"
             response = requests.get(url, timeout=15)
@@ -64,8 +67,10 @@ class SubdomainEnumerationPlugin(BasePlugin):
                     if name:
                         # crt.sh can return multiple subdomains in a single name_value separated by newlines
                         for sub in name.split("\n"):
-                            if sub.endswith(domain) and sub not in subdomains:
-                                subdomains.append(sub.strip())
+                            sub = sub.strip().lower()
+                            if sub.endswith(domain) and sub not in seen:
+                                seen.add(sub)
+                                subdomains.append(sub)
             else:
                 pass  # Non-200 response
         except Exception as e:
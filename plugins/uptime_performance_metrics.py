@@ -3,6 +3,11 @@ import requests
 import time
 from bs4 import BeautifulSoup
 from plugins.base_plugin import BasePlugin
+from utils.perf import PerformanceProbe, LOAD_LEVELS
+from utils.target import resolve_target
+
+SAMPLES = 10  # Sequential samples for the phase breakdown
+LOAD_SAMPLES = 8  # Per concurrency level of the load test
 
 
 class UptimePerformanceMetricsPlugin(BasePlugin):
@@ -33,9 +38,11 @@ class UptimePerformanceMetricsPlugin(BasePlugin):
             uptime = self.check_uptime(url)
             results["Uptime"] = uptime
 
-            # 2. Response Time
-            response_time = self.measure_response_time(url)
-            results["ResponseTime_ms"] = response_time
+            # 2. Response Time, by request phase, and under load
+            performance = self.measure_performance(url)
+            results["ResponseTime_ms"] = self.measure_response_time(performance)
+            results["PerformanceMetrics"] = performance
+            results["LoadTest"] = self.run_load_test(performance.get("URL", url))
 
             # 3. Response Headers
             headers = self.get_response_headers(url)
@@ -55,9 +62,7 @@ class UptimePerformanceMetricsPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def check_uptime(self, url: str) -> bool:
         try:
@@ -66,14 +71,25 @@ class UptimePerformanceMetricsPlugin(BasePlugin):
         except requests.RequestException:
             return False
 
-    def measure_response_time(self, url: str) -> float:
+    def measure_performance(self, url: str) -> dict:
+        # Per-phase timings of repeated requests over a kept-alive connection (utils/perf.py)
+        probe = PerformanceProbe()
         try:
-            start_time = time.time()
-            response = requests.get(url, timeout=10)
-            end_time = time.time()
-            return round((end_time - start_time) * 1000, 2)  # in milliseconds
-        except requests.RequestException:
-            return -1  # Indicates failure
+            return probe.run(probe.final_url(url), samples=SAMPLES)
+        except Exception as e:
+            return {"Error": str(e)}
+
+    def measure_response_time(self, performance: dict) -> float:
+        # Median total time, in milliseconds
+        median = performance.get("Phases_ms", {}).get("Total", {}).get("p50")
+        return median if median is not None else -1  # Indicates failure
+
+    def run_load_test(self, url: str) -> list:
+        # Latency and throughput as concurrency rises
+        try:
+            return PerformanceProbe().load_curve(url, LOAD_LEVELS, LOAD_SAMPLES)
+        except Exception as e:
+            return [{"Error": str(e)}]
 
     def get_response_headers(self, url: str) -> dict:
         try:
@@ -103,9 +119,9 @@ class UptimePerformanceMetricsPlugin(BasePlugin):
             # Measure load times
             for resource in resources:
                 try:
-                    start_time = time.time()
+                    start_time = time.perf_counter()
                     res = requests.get(resource, timeout=10)
-                    end_time = time.time()
+                    end_time = time.perf_counter()
                     load_time = round((end_time - start_time) * 1000, 2)
                     load_times[resource] = load_time
                 except requests.RequestException:
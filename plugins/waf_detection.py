@@ -1,8 +1,9 @@
 # plugins/waf_detection.py
 import requests
 from bs4 import BeautifulSoup
-import re
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
+from utils.signature_engine import get_signature_engine
 
 
 class WAFDetectionPlugin(BasePlugin):
@@ -40,9 +41,7 @@ class WAFDetectionPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith("http"):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def fetch_response(self, url: str) -> requests.Response:
         try:
@@ -57,72 +56,11 @@ class WAFDetectionPlugin(BasePlugin):
             return None
 
     def detect_wafs(self, response: requests.Response) -> list:
-        detected_wafs = []
-        # Define known WAF signatures
-        waf_signatures = {
-            "Cloudflare": {
-                "headers": ["Server"],
-                "patterns": [r"cloudflare"],
-                "error_patterns": [r"Cloudflare"]
-            },
-            "AWS WAF": {
-                "headers": ["X-Amzn-Trace-Id", "X-Cache"],
-                "patterns": [r"awswaf"],
-                "error_patterns": [r"AWS WAF"]
-            },
-            "Sucuri": {
-                "headers": ["Server"],
-                "patterns": [r"sucuri"],
-                "error_patterns": [r"Sucuri"]
-            },
-            "Incapsula": {
-                "headers": ["X-CDN"],
-                "patterns": [r"Incapsula"],
-                "error_patterns": [r"Incapsula"]
-            },
-            "ModSecurity": {
-                "headers": ["Server"],
-                "patterns": [r"Mod_Security"],
-                "error_patterns": [r"Mod_Security"]
-            },
-            "Barracuda": {
-                "headers": ["Server"],
-                "patterns": [r"Barracuda"],
-                "error_patterns": [r"Barracuda"]
-            },
-            "F5 BIG-IP": {
-                "headers": ["X-F5-"],
-                "patterns": [r"F5"],
-                "error_patterns": [r"F5 BIG-IP"]
-            },
-            "Fortinet": {
-                "headers": ["Server"],
-                "patterns": [r"FortiWeb"],
-                "error_patterns": [r"FortiWeb"]
-            },
-            "Akamai": {
-                "headers": ["Server"],
-                "patterns": [r"Akamai"],
-                "error_patterns": [r"Akamai"]
-            }
-            # Add more WAF signatures as needed
-        }
-
-        # Check headers for WAF signatures
-        for waf, signature in waf_signatures.items():
-            # Header Analysis
-            for header in signature["headers"]:
-                header_value = response.headers.get(header, "")
-                if any(re.search(pattern, header_value, re.IGNORECASE) for pattern in signature["patterns"]):
-                    if waf not in detected_wafs:
-                        detected_wafs.append(waf)
-            # Error Page Analysis
-            if response.status_code in [403, 406, 503]:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                page_text = soup.get_text()
-                for pattern in signature["error_patterns"]:
-                    if re.search(pattern, page_text, re.IGNORECASE):
-                        if waf not in detected_wafs:
-                            detected_wafs.append(waf)
+        # Header signatures, plus error-page signatures on blocking status codes (resources/signatures/waf.json)
+        matches = get_signature_engine().scan(response.headers, self.page_text(response.text), response.status_code)
+        return matches.names("waf")
 
-        return detected_wafs
+    def page_text(self, html: str) -> str:
+        # Error pages are matched on what they say, not on markup such as a cdnjs.cloudflare.com script
+        soup = BeautifulSoup(html, 'html.parser')
+        return " ".join(s for s in soup.find_all(string=True) if s.parent.name not in ("script", "style"))
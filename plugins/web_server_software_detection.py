@@ -4,6 +4,7 @@ from bs4 import BeautifulSoup, Comment
 import re
 import socket
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 
 
 class WebServerSoftwareDetectionPlugin(BasePlugin):
@@ -45,9 +46,7 @@ class WebServerSoftwareDetectionPlugin(BasePlugin):
         return results
 
     def normalize_url(self, target: str) -> str:
-        if not target.startswith(("http://", "https://")):
-            target = "http://" + target
-        return target
+        return resolve_target(target).url
 
     def banner_grabbing(self, url: str) -> dict:
         server_info = {}
@@ -1,5 +1,6 @@
 # plugins/website_content_analysis.py
 from plugins.base_plugin import BasePlugin
+from utils.target import resolve_target
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
@@ -18,6 +19,7 @@ class WebsiteContentAnalysisPlugin(BasePlugin):
             headers = {
                 'User-Agent': 'DeepWebsiteAnalyzer/1.0'
             }
+            target = resolve_target(target).url
             response = requests.get(target, headers=headers, timeout=10)
             if response.status_code != 200:
                 return {"Error": f"Failed to retrieve content. Status code: {response.status_code}"}
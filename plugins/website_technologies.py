@@ -1,7 +1,8 @@
 # plugins/website_technologies.py
 from plugins.base_plugin import BasePlugin
-import builtwith
-import requests
+from utils.target import resolve_target
+from utils import http_cache
+from utils.fingerprints import get_fingerprint_matcher, group_by_category
 
 class WebsiteTechnologiesPlugin(BasePlugin):
     @property
@@ -12,19 +13,24 @@ class WebsiteTechnologiesPlugin(BasePlugin):
     def description(self) -> str:
         return "Identify server-side technologies, CMS, JavaScript frameworks, and web application frameworks."
 
+    def warm_up(self):
+        # Compile the fingerprint database once, ahead of the first run
+        get_fingerprint_matcher()
+
     def run(self, target: str) -> dict:
         try:
-            headers = {
-                'User-Agent': 'DeepWebsiteAnalyzer/1.0'
-            }
-            response = requests.get(target, headers=headers, timeout=10)
+            response = http_cache.fetch(resolve_target(target).url, timeout=10)
             if response.status_code != 200:
                 return {"Error": f"Failed to retrieve content. Status code: {response.status_code}"}
 
-            technologies = builtwith.parse(response.text)
+            # Headers, cookies, meta tags and script URLs of the shared response (resources/fingerprints)
+            detected = get_fingerprint_matcher().analyze(
+                response.url, response.headers, response.cookies.get_dict(), response.text
+            )
 
             return {
-                "Detected Technologies": technologies
+                "Detected Technologies": group_by_category(detected),
+                "Details": detected
             }
         except Exception as e:
             return {"Error": str(e)}
@@ -1,6 +1,7 @@
 # plugins/whois_info.py
 from plugins.base_plugin import BasePlugin
-import whois
+from utils.target import resolve_target
+from utils.whois_service import get_whois_service
 
 class WHOISInfoPlugin(BasePlugin):
     @property
@@ -11,16 +12,25 @@ class WHOISInfoPlugin(BasePlugin):
     def description(self) -> str:
         return "Obtain domain registrar details, registration date, expiry date, and registrant contact details."
 
+    @property
+    def cache_ttl(self) -> int:
+        return 604800  # One week, registrar data changes rarely
+
+    @property
+    def content_dependent(self) -> bool:
+        return False
+
     def run(self, target: str) -> dict:
         try:
-            w = whois.whois(target)
+            # Shared with the other plugins and cached on disk (data/whois)
+            w = get_whois_service().lookup(resolve_target(target).domain)
             return {
-                "Registrar": w.registrar,
-                "Creation Date": str(w.creation_date),
-                "Expiration Date": str(w.expiration_date),
-                "Registrant Name": w.name,
-                "Registrant Email": w.email,
-                "Registrant Country": w.country,
+                "Registrar": w.get("registrar"),
+                "Creation Date": w.get("creation_date"),
+                "Expiration Date": w.get("expiration_date"),
+                "Registrant Name": w.get("name"),
+                "Registrant Email": w.get("email"),
+                "Registrant Country": w.get("country"),
             }
         except Exception as e:
             return {"Error": str(e)}
@@ -0,0 +1,61 @@
+"""Local HTTP server for tests that exercise real requests.
+
+Test modules supply only a route function: it receives the request handler, reads
+request.command, request.path and request.headers, and answers with request.reply().
+State shared between requests (logs, counters) is kept on request.server.
+"""
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class RouteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.route(self)
+
+    do_HEAD = do_GET
+
+    def reply(self, status: int, body: bytes = b"", headers: dict = None, content_length: bool = True):
+        """Send a complete response; without content_length the body ends when the connection closes."""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if content_length:
+            self.send_header("Content-Length", str(len(body)))
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+class LocalServer(ThreadingHTTPServer):
+    def __init__(self, route, port: int = 0):
+        super().__init__(("127.0.0.1", port), RouteHandler)
+        self.route = route
+        self.lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self.server_port}"
+        self._running = False
+
+    def start(self) -> "LocalServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        self._running = True
+        return self
+
+    def stop(self):
+        if self._running:
+            self._running = False
+            self.shutdown()
+            self.server_close()
+
+
+def serve(test, route, port: int = 0) -> LocalServer:
+    """Start a LocalServer answering with route; it is stopped when the test finishes."""
+    server = LocalServer(route, port).start()
+    test.addCleanup(server.stop)
+    return server
@@ -0,0 +1,32 @@
+import unittest
+from local_server import serve
+from plugins.api_endpoints_documentation import APIEndpointsDocumentationPlugin
+from utils.rate_limits import DEFAULT_STAGES
+
+
+def _route(request):
+    if request.command == "HEAD":
+        request.reply(404)  # No API documentation
+    elif request.path == "/":
+        request.reply(200, f'<script>fetch("{request.server.url}/api/items")</script>'.encode())
+    else:
+        request.reply(200, b"[]")
+
+
+class TestAPIEndpointsDocumentation(unittest.TestCase):
+    def setUp(self):
+        self.url = serve(self, _route).url + "/"
+
+    def test_latency_is_reported_apart_from_endpoints(self):
+        results = APIEndpointsDocumentationPlugin().run(self.url)
+        endpoint = self.url + "api/items"
+        self.assertEqual(results["APIEndpoints"], [endpoint])
+        self.assertEqual(list(results["APIRateLimits"]), [endpoint])
+        self.assertEqual(results["APILatency_ms"]["Count"], sum(count for count, _ in DEFAULT_STAGES))
+
+    def test_no_endpoints(self):
+        self.assertEqual(APIEndpointsDocumentationPlugin().test_api_rate_limits([]), ({}, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
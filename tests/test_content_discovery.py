@@ -0,0 +1,110 @@
+import random
+import time
+import unittest
+from local_server import serve
+from utils.content_discovery import (
+    ContentDiscovery, ResponseFingerprint, backup_variants, expand, path_kind,
+)
+
+REAL = {
+    "/admin/": b"<h1>Admin panel</h1><form><input name=user><input name=password></form>",
+    "/backup": b"<h1>Backups</h1><ul><li>2024-01-01.tar.gz</li><li>2024-02-01.tar.gz</li></ul>",
+    "/index.php": b"<?php echo 'home'; ?>",
+    "/index.php.bak": b"<?php $password = 'hunter2'; ?>",
+}
+
+
+def _soft_not_found(request):
+    """A site that hides missing paths: only unknown .php files get a real 404."""
+    html = {"Content-Type": "text/html"}
+    if request.path == "/busy":
+        with request.server.lock:
+            request.server.busy_hits = getattr(request.server, "busy_hits", 0) + 1
+            hits = request.server.busy_hits
+        if hits == 1:
+            request.reply(429, headers={"Retry-After": "0.2"})
+        else:
+            request.reply(200, b"<h1>Busy page</h1>" * 10, html)
+    elif request.path in REAL:
+        request.reply(200, REAL[request.path], html)
+    elif request.path.endswith("/"):
+        request.reply(302, headers=dict(html, Location=f"/login?next={request.path}"))
+    elif request.path.endswith(".php"):
+        request.reply(404, b"Not Found", html)
+    else:
+        # Echoes the path and a request id, so the body differs for every missing path
+        request_id = random.randrange(10 ** random.randrange(3, 9))
+        request.reply(200, f"<p>Sorry, {request.path} does not exist. Request {request_id}</p>".encode(), html)
+
+
+class TestContentDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.server = serve(self, _soft_not_found)
+        self.url = self.server.url
+        self.discovery = ContentDiscovery(self.url, max_workers=4, timeout=5)
+        self.addCleanup(self.discovery.close)
+
+    def test_soft_404s_are_filtered(self):
+        paths = [
+            "admin/", "nope/", "backup", "missing", "/index.php", "missing.php", "index.php.bak", "missing.bak",
+            "admin/",  # Probed once
+        ]
+        findings = sorted(self.discovery.discover(paths), key=lambda finding: finding["URL"])
+        self.assertEqual([finding["URL"][len(self.url):] for finding in findings], sorted(REAL))
+        self.assertTrue(all(finding["Status"] == 200 for finding in findings))
+        self.assertEqual(self.discovery.statistics(), {
+            "Probed": 8,
+            "Soft 404s Filtered": 3,
+            "Errors": 0,
+            "Missing Path Status": {"/": 302, "(no extension)": 200, ".php": 404, ".bak": 200},
+        })
+
+    def test_redirects_are_findings_unless_they_match_the_baseline(self):
+        self.assertIsNone(self.discovery.probe("nope/"))
+        self.discovery.baselines["/"] = None  # As if the site answered missing directories with 404
+        finding = self.discovery.probe("other/")
+        self.assertEqual((finding["Status"], finding["Location"]), (302, "/login?next=/other/"))
+
+    def test_throttled_probes_are_retried(self):
+        start = time.monotonic()
+        finding = self.discovery.probe("busy")
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual(finding["Status"], 200)
+        self.assertEqual(self.server.busy_hits, 2)
+        self.assertEqual(self.discovery.statistics()["Probed"], 1)
+
+
+class _Response:
+    def __init__(self, status_code: int, location: str = ""):
+        self.status_code = status_code
+        self.url = "https://example.com/x"
+        self.headers = {"Location": location} if location else {}
+
+
+class TestHelpers(unittest.TestCase):
+    def test_expand(self):
+        self.assertEqual(list(expand(["admin/", "/config"], [".php", ".bak"])),
+                         ["admin/", "config", "config.php", "config.bak"])
+
+    def test_backup_variants(self):
+        self.assertEqual(list(backup_variants("/a/index.php", [".bak", "~"])),
+                         ["/a/index.php.bak", "/a/index.bak", "/a/index.php~", "/a/index~"])
+        self.assertEqual(list(backup_variants("/a/", [".bak"])), [])
+
+    def test_path_kind(self):
+        self.assertEqual([path_kind(p) for p in ("a/", "a.PHP", "a.tar.gz", "a~", "a")], ["/", ".php", ".gz", "~", ""])
+
+    def test_fingerprint(self):
+        body = b"<p>Sorry, /x123 does not exist. Request 42</p>"
+        fingerprint = ResponseFingerprint.of(_Response(200), body, "x123")
+        other = ResponseFingerprint.of(_Response(200), b"<p>Sorry, /yy does not exist. Request 98765</p>", "yy")
+        self.assertTrue(fingerprint.matches(other))
+        self.assertFalse(fingerprint.matches(ResponseFingerprint.of(_Response(403), body, "x123")))
+        self.assertFalse(fingerprint.matches(ResponseFingerprint.of(_Response(200), b"<h1>Real page</h1>" * 5, "z")))
+        login = ResponseFingerprint.of(_Response(302, "/login?next=/a/"), b"", "a/")
+        self.assertTrue(login.matches(ResponseFingerprint.of(_Response(302, "/login?next=/b/"), b"", "b/")))
+        self.assertFalse(login.matches(ResponseFingerprint.of(_Response(302, "/a/index"), b"", "a/")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+from local_server import serve
+from utils.crawler import (
+    SiteCrawler, crawl_and_analyze, merge_list_dicts, merge_lists, merge_site_results, unique_forms,
+)
+
+REPEATED = " ".join(f"word{i}" for i in range(40))
+
+
+def _html(text: str, *links) -> str:
+    anchors = "".join(f'<a href="{link}">x</a>' for link in links)
+    return f"<html><body><p>{text}</p>{anchors}</body></html>"
+
+
+PAGES = {
+    "/": _html(
+        "Home", "/a", "/b", "/a#top", "/private/secret", "/logo.png", "http://elsewhere.invalid/page",
+        "/dup1", "/dup2", "/big",
+    ),
+    "/a": _html("Page A", "/a/deeper"),
+    "/a/deeper": _html("Deeper", "/a/deeper/deepest"),
+    "/a/deeper/deepest": _html("Too deep"),
+    "/b": _html("Page B", "/", "/a"),
+    "/dup1": _html(REPEATED, "/dup1/child"),
+    "/dup2": _html(REPEATED, "/dup2/child"),
+    "/dup1/child": _html("Child"),
+    "/dup2/child": _html("Child"),
+    "/private/secret": _html("Secret"),
+    "/big": _html("x" * 2000),
+}
+
+
+def _route(request):
+    with request.server.lock:
+        request.server.requests.append(request.path)
+    if request.path == "/robots.txt":
+        request.reply(200, b"User-agent: *\nDisallow: /private\n", {"Content-Type": "text/plain"})
+    elif request.path in PAGES:
+        # /big announces no length; it is read until the connection closes
+        request.reply(200, PAGES[request.path].encode(), {"Content-Type": "text/html; charset=utf-8"},
+                      content_length=request.path != "/big")
+    else:
+        request.reply(404)
+
+
+class _PathsPlugin:
+    name = "Paths"
+
+    def analyze_page(self, page) -> dict:
+        return {"Path": page.url}
+
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        return {"Pages": sorted(page_results)}
+
+
+class TestSiteCrawler(unittest.TestCase):
+    def setUp(self):
+        self.server = serve(self, _route)
+        self.server.requests = []
+        self.url = self.server.url + "/"
+
+    def crawl(self, **options) -> dict:
+        options.setdefault("max_workers", 1)  # Deterministic order
+        options.setdefault("max_page_bytes", 1000)
+        crawler = SiteCrawler(self.url, **options)
+        pages = {page.url[len(self.url) - 1:]: page for page in crawler.crawl()}
+        self.crawler = crawler
+        return pages
+
+    def test_scope_depth_and_robots(self):
+        pages = self.crawl()
+        self.assertEqual(set(pages), {"/", "/a", "/b", "/dup1", "/dup2", "/big", "/a/deeper", "/dup1/child"})
+        self.assertEqual(self.server.requests.count("/a"), 1)
+        self.assertNotIn("/private/secret", self.server.requests)
+        self.assertNotIn("/logo.png", self.server.requests)
+        self.assertNotIn("/a/deeper/deepest", self.server.requests)  # Beyond max_depth
+        self.assertEqual(pages["/a/deeper"].depth, 2)
+
+        pages = self.crawl(respect_robots=False, max_depth=1)
+        self.assertIn("/private/secret", pages)
+        self.assertNotIn("/a/deeper", pages)
+
+    def test_near_duplicates_are_not_followed(self):
+        pages = self.crawl()
+        self.assertEqual(pages["/dup2"].duplicate_of, pages["/dup1"].url)
+        self.assertNotIn("/dup2/child", self.server.requests)
+        statistics = self.crawler.statistics()
+        self.assertEqual(statistics["Pages Crawled"], len(pages))
+        self.assertEqual(statistics["Near-Duplicate Pages Skipped"], 1)
+        self.assertEqual(statistics["Near-Duplicates"], {pages["/dup2"].url: pages["/dup1"].url})
+
+    def test_page_budget(self):
+        pages = self.crawl(max_pages=3, max_workers=4)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(self.crawler.pages_crawled, 3)
+        self.assertEqual(len([path for path in self.server.requests if path != "/robots.txt"]), 3)
+
+    def test_body_size_limit_without_content_length(self):
+        page = self.crawl()["/big"]
+        self.assertEqual(page.status_code, 200)
+        self.assertEqual(page.text, "")
+        self.assertIn("x" * 2000, self.crawl(max_page_bytes=10_000)["/big"].text)
+
+    def test_crawl_and_analyze(self):
+        plugin = _PathsPlugin()
+        page_results, statistics = crawl_and_analyze(self.url, [plugin], max_workers=1, max_depth=1)
+        self.assertEqual(len(page_results["Paths"]), statistics["Pages Analyzed"])
+        self.assertNotIn(self.url + "dup2", page_results["Paths"])  # Near-duplicate
+        result = merge_site_results(plugin, self.url, page_results["Paths"], statistics)
+        self.assertEqual(result["Crawl Statistics"], statistics)
+        self.assertIn(self.url, result["Pages"])
+
+
+class TestMergeHelpers(unittest.TestCase):
+    PAGE_RESULTS = {
+        "https://example.com/": {
+            "Emails": ["b@example.com", "a@example.com"],
+            "Scripts": {"jQuery": ["3.6.0"]},
+            "Forms": [{"Action": "/search", "Method": "GET", "Inputs": ["q"]}],
+        },
+        "https://example.com/about": {
+            "Emails": ["a@example.com"],
+            "Scripts": {"jQuery": ["3.5.1"], "React": ["18"]},
+            "Forms": [
+                {"Action": "/search", "Method": "GET", "Inputs": ["q"], "Page": "/about"},
+                {"Action": "/search", "Method": "POST", "Inputs": ["q"]},
+            ],
+        },
+        "https://example.com/error": {"Error": "Timed out", "Emails": "n/a", "Scripts": ["jQuery"]},
+    }
+
+    def test_merge_lists(self):
+        self.assertEqual(merge_lists(self.PAGE_RESULTS, "Emails"), ["a@example.com", "b@example.com"])
+        self.assertEqual(merge_lists(self.PAGE_RESULTS, "Missing"), [])
+
+    def test_merge_list_dicts(self):
+        self.assertEqual(merge_list_dicts(self.PAGE_RESULTS, "Scripts"), {
+            "React": ["18"], "jQuery": ["3.5.1", "3.6.0"],
+        })
+
+    def test_unique_forms(self):
+        forms = unique_forms(self.PAGE_RESULTS, "Forms", ("Action", "Method", "Inputs"))
+        self.assertEqual(forms, [
+            {"Action": "/search", "Method": "GET", "Inputs": ["q"]},  # First occurrence wins
+            {"Action": "/search", "Method": "POST", "Inputs": ["q"]},
+        ])
+
+    def test_merge_site_results_leaves_errors_alone(self):
+        class Failing(_PathsPlugin):
+            def merge_page_results(self, target, page_results):
+                return {"Error": "Failed to retrieve website content."}
+
+        result = merge_site_results(Failing(), "https://example.com/", {}, {"Pages Crawled": 0})
+        self.assertEqual(result, {"Error": "Failed to retrieve website content."})
+
+
+if __name__ == '__main__':
+    unittest.main()
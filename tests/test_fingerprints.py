@@ -0,0 +1,55 @@
+import unittest
+from utils.fingerprints import (
+    FingerprintMatcher, Pattern, UnkeyedPatterns, get_fingerprint_matcher, group_by_category, required_literal,
+)
+
+
+class TestFingerprintMatcher(unittest.TestCase):
+    def test_patterns_matching_at_the_same_offset(self):
+        matcher = FingerprintMatcher({"Foo": {"html": ["<link[^>]+foo"]}, "Bar": {"html": ["<link[^>]+bar"]}})
+        self.assertEqual(set(matcher.analyze("http://example.com/", html="<link href=/foo/bar>")), {"Foo", "Bar"})
+
+    def test_backreferences_keep_their_numbering(self):
+        matcher = FingerprintMatcher({
+            "First": {"html": ["<(a)>"]},
+            "Quoted": {"html": [r"data-x=(['\"])([\d.]+)\1\;version:\2"]},
+        })
+        detected = matcher.analyze("http://example.com/", html="<a> <b data-x='1.2'>")
+        self.assertEqual(detected["Quoted"]["Version"], "1.2")
+
+    def test_database(self):
+        html = (
+            '<link href="/wp-content/themes/x/bootstrap.min.css">'
+            '<div data-v-1a2b3c4d ng-version="15.0.0"></div>'
+            '<script src="/js/jquery-3.6.0.min.js"></script>'
+        )
+        detected = get_fingerprint_matcher().analyze(
+            "http://example.com/", headers={"X-Pingback": "http://example.com/xmlrpc.php"}, html=html
+        )
+        for technology in ("WordPress", "Bootstrap", "Angular", "jQuery", "PHP"):
+            self.assertIn(technology, detected)
+        self.assertEqual(detected["Angular"]["Version"], "15.0.0")
+        self.assertEqual(detected["jQuery"]["Version"], "3.6.0")
+        self.assertIn("header:X-Pingback", detected["WordPress"]["Evidence"])
+        self.assertEqual(detected["PHP"]["Evidence"], ["implied by WordPress"])
+        self.assertIn("jQuery 3.6.0", group_by_category(detected)["JavaScript libraries"])
+
+    def test_required_literal(self):
+        self.assertEqual(required_literal("<link[^>]+/wp-content/"), "/wp-content/")
+        self.assertEqual(required_literal(r"ab?c\d{2}"), "a")
+        self.assertEqual(required_literal("(?:a|b)xyz"), "xyz")
+        self.assertEqual(required_literal("foo|bar"), "")
+
+
+class TestUnkeyedPatterns(unittest.TestCase):
+    def test_candidates_from_one_scan(self):
+        sources = ["abc", "BCD", "xabcx", "zzz", "a.c", "(?:q|r)"]
+        patterns = UnkeyedPatterns([Pattern(source, source) for source in sources])
+        # Overlapping literals and literals contained in others are all found
+        self.assertEqual(patterns._candidates("-xabcxabcd-"), [0, 1, 2, 4, 5])
+        self.assertEqual([p.technology for p, _ in patterns.scan("-xABCxabcd-")], ["abc", "BCD", "xabcx", "a.c"])
+        self.assertEqual(patterns._candidates("nothing"), [5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import time
+import unittest
+from urllib.parse import urlparse, parse_qs
+from local_server import serve
+from utils.form_probe import FormProbe
+
+
+def _route(request):
+    server = request.server
+    form = urlparse(request.path).path
+    payload = parse_qs(urlparse(request.path).query).get("q", [""])[0]
+    with server.lock:
+        server.log.append((form, payload))
+        server.active[form] = server.active.get(form, 0) + 1
+        server.peak[form] = max(server.peak.get(form, 0), server.active[form])
+    time.sleep(server.delay)
+    with server.lock:
+        server.active[form] -= 1
+    request.reply(200, b"SQL syntax error" if payload == "bad" else b"ok")
+
+
+class TestFormProbe(unittest.TestCase):
+    def setUp(self):
+        self.server = serve(self, _route)
+        self.server.log = []
+        self.server.active = {}
+        self.server.peak = {}
+        self.server.delay = 0.0
+        self.url = self.server.url
+
+    def form(self, name: str) -> dict:
+        return {"Action": f"{self.url}/{name}", "Method": "GET", "Payloads": []}
+
+    @staticmethod
+    def payloads(form):
+        for payload in form["Payloads"]:
+            yield payload, {"q": payload}, None
+
+    @staticmethod
+    def evaluate(form, label, response):
+        if "SQL" in response.text:
+            return label, True
+        return None
+
+    def probe(self, forms: list, **options) -> list:
+        probe = FormProbe(**options)
+        try:
+            return probe.run(forms, self.payloads, self.evaluate)
+        finally:
+            probe.close()
+
+    def test_round_robin_order(self):
+        a, b = self.form("a"), self.form("b")
+        a["Payloads"] = ["a1", "a2", "a3"]
+        b["Payloads"] = ["b1", "b2"]
+        reports = self.probe([a, b], max_workers=1)
+        self.assertEqual([payload for _, payload in self.server.log], ["a1", "b1", "a2", "b2", "a3"])
+        self.assertEqual([report.requests for report in reports], [3, 2])
+        self.assertEqual([report.findings for report in reports], [[], []])
+
+    def test_per_form_cap(self):
+        self.server.delay = 0.05
+        forms = [self.form("a"), self.form("b")]
+        for form in forms:
+            form["Payloads"] = [f"p{i}" for i in range(8)]
+        self.probe(forms, max_workers=8, per_host=8, per_form=2)
+        self.assertEqual(len(self.server.log), 16)
+        self.assertLessEqual(max(self.server.peak.values()), 2)
+
+    def test_skips_after_a_conclusive_finding(self):
+        flagged, clean = self.form("flagged"), self.form("clean")
+        flagged["Payloads"] = ["bad", "p1", "p2", "p3"]
+        clean["Payloads"] = ["p1", "p2", "p3"]
+        reports = self.probe([flagged, clean], max_workers=1, per_form=1)
+        self.assertTrue(reports[0].flagged)
+        self.assertEqual(reports[0].findings, ["bad"])
+        self.assertEqual((reports[0].requests, reports[0].skipped), (1, 3))
+        self.assertEqual((reports[1].requests, reports[1].skipped), (3, 0))
+        self.assertNotIn(("/flagged", "p1"), self.server.log)
+
+    def test_errors_are_recorded(self):
+        form = {"Action": "http://127.0.0.1:1/closed", "Method": "GET", "Payloads": ["p1", "p2"]}
+        report, = self.probe([form], timeout=2)
+        self.assertEqual(report.requests, 2)
+        self.assertEqual(len(report.errors), 2)
+        self.assertTrue(report.errors[0].startswith("p1: ") or report.errors[0].startswith("p2: "))
+
+
+if __name__ == '__main__':
+    unittest.main()
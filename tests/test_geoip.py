@@ -0,0 +1,216 @@
+import ipaddress
+import os
+import struct
+import tempfile
+import unittest
+from utils.geoip import METADATA_START, GeoIPService, MMDBReader
+
+
+def _control(data_type: int, size: int) -> bytes:
+    if size < 29:
+        head, extra = size, b""
+    elif size < 285:
+        head, extra = 29, bytes([size - 29])
+    elif size < 65821:
+        head, extra = 30, (size - 285).to_bytes(2, "big")
+    else:
+        head, extra = 31, (size - 65821).to_bytes(3, "big")
+    if data_type <= 7:
+        return bytes([(data_type << 5) | head]) + extra
+    return bytes([head, data_type - 7]) + extra  # Extended type
+
+
+def encode(value) -> bytes:
+    if isinstance(value, Pointer):
+        return value.encode()
+    if isinstance(value, bool):
+        return _control(14, int(value))
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return _control(2, len(data)) + data
+    if isinstance(value, float):
+        return _control(3, 8) + struct.pack(">d", value)
+    if isinstance(value, int):
+        data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+        return _control(6, len(data)) + data
+    if isinstance(value, dict):
+        return _control(7, len(value)) + b"".join(encode(k) + encode(v) for k, v in value.items())
+    if isinstance(value, list):
+        return _control(11, len(value)) + b"".join(encode(item) for item in value)
+    raise TypeError(value)
+
+
+class Pointer:
+    """Reference to an offset in the data section."""
+
+    def __init__(self, offset: int):
+        self.offset = offset
+
+    def encode(self) -> bytes:
+        p = self.offset
+        if p < 2048:
+            return bytes([0x20 | (p >> 8), p & 0xFF])
+        if p < 526336:
+            p -= 2048
+            return bytes([0x20 | (1 << 3) | (p >> 16)]) + (p & 0xFFFF).to_bytes(2, "big")
+        if p < 134744064:
+            p -= 526336
+            return bytes([0x20 | (2 << 3) | (p >> 24)]) + (p & 0xFFFFFF).to_bytes(3, "big")
+        return bytes([0x20 | (3 << 3)]) + p.to_bytes(4, "big")
+
+
+class MMDBWriter:
+    """Just enough of the MaxMind DB format to build test databases."""
+
+    def __init__(self, ip_version: int = 6, record_size: int = 24):
+        self.ip_version = ip_version
+        self.record_size = record_size
+        self.data = bytearray()
+        self.nodes = [[None, None]]  # Child node index, ("data", offset) or None
+
+    def add_data(self, value) -> int:
+        offset = len(self.data)
+        self.data += encode(value)
+        return offset
+
+    def insert(self, network: str, offset: int):
+        network = ipaddress.ip_network(network)
+        bits, prefix = int(network.network_address), network.prefixlen
+        total = network.max_prefixlen
+        if network.version == 4 and self.ip_version == 6:
+            total = 128  # IPv4 lives under ::/96
+            prefix += 96
+        node = 0
+        for i in range(prefix):
+            bit = (bits >> (total - 1 - i)) & 1
+            if i == prefix - 1:
+                self.nodes[node][bit] = ("data", offset)
+            else:
+                if not isinstance(self.nodes[node][bit], int):
+                    self.nodes.append([None, None])
+                    self.nodes[node][bit] = len(self.nodes) - 1
+                node = self.nodes[node][bit]
+
+    def _record(self, value) -> int:
+        if value is None:
+            return len(self.nodes)
+        if isinstance(value, int):
+            return value
+        return len(self.nodes) + 16 + value[1]
+
+    def _node(self, left: int, right: int) -> bytes:
+        if self.record_size == 24:
+            return left.to_bytes(3, "big") + right.to_bytes(3, "big")
+        if self.record_size == 28:
+            middle = ((left >> 24) << 4) | (right >> 24)
+            return (left & 0xFFFFFF).to_bytes(3, "big") + bytes([middle]) + (right & 0xFFFFFF).to_bytes(3, "big")
+        return left.to_bytes(4, "big") + right.to_bytes(4, "big")
+
+    def write(self, path: str):
+        tree = b"".join(self._node(self._record(left), self._record(right)) for left, right in self.nodes)
+        metadata = {
+            "node_count": len(self.nodes),
+            "record_size": self.record_size,
+            "ip_version": self.ip_version,
+            "database_type": "Test-City",
+            "languages": ["en"],
+        }
+        with open(path, "wb") as f:
+            f.write(tree + bytes(16) + bytes(self.data) + METADATA_START + encode(metadata))
+
+
+class TestMMDBReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def build(self, ip_version: int, record_size: int) -> MMDBReader:
+        writer = MMDBWriter(ip_version, record_size)
+        germany = writer.add_data({"iso_code": "DE", "names": {"en": "Germany"}})
+        writer.add_data("x" * 3000)  # Pushes later offsets past the one-byte pointer range
+        berlin = writer.add_data({
+            "city": {"names": {"en": "Berlin"}},
+            "country": Pointer(germany),
+            "location": {"latitude": 52.5, "longitude": 13.4, "time_zone": "Europe/Berlin"},
+            "subdivisions": [{"names": {"en": "Land Berlin"}}],
+            "is_in_european_union": True,
+            "note": "y" * 300,
+        })
+        chained = writer.add_data(Pointer(berlin))  # A record that is only a pointer
+        writer.insert("1.2.3.0/24", chained)
+        writer.insert("5.0.0.0/8", germany)
+        if ip_version == 6:
+            writer.insert("2001:db8::/32", berlin)
+        path = os.path.join(self.directory.name, f"test-{ip_version}-{record_size}.mmdb")
+        writer.write(path)
+        reader = MMDBReader(path)
+        self.addCleanup(reader.close)
+        return reader
+
+    def check(self, reader: MMDBReader):
+        record = reader.get("1.2.3.4")
+        self.assertEqual(record["city"]["names"]["en"], "Berlin")
+        self.assertEqual(record["country"]["iso_code"], "DE")
+        self.assertEqual(record["location"]["latitude"], 52.5)
+        self.assertIs(record["is_in_european_union"], True)
+        self.assertEqual(len(record["note"]), 300)
+        self.assertEqual(reader.get("5.255.0.1"), {"iso_code": "DE", "names": {"en": "Germany"}})
+        self.assertIsNone(reader.get("8.8.8.8"))
+        self.assertEqual(reader.metadata["languages"], ["en"])
+
+    def test_record_sizes(self):
+        for record_size in (24, 28, 32):
+            with self.subTest(record_size=record_size):
+                self.check(self.build(6, record_size))
+                self.check(self.build(4, record_size))
+
+    def test_28_bit_records_use_the_middle_nibbles(self):
+        reader = self.build(4, 28)
+        mapped, reader._buffer = reader._buffer, MMDBWriter(4, 28)._node(0xABCDEF1, 0x2345678)
+        try:  # Record values too large for a test tree
+            self.assertEqual((reader._read_node(0, 0), reader._read_node(0, 1)), (0xABCDEF1, 0x2345678))
+        finally:
+            reader._buffer = mapped
+
+    def test_ipv4_in_ipv6_tree(self):
+        reader = self.build(6, 28)
+        self.assertEqual(reader.get("::ffff:1.2.3.4"), reader.get("1.2.3.4"))
+        self.assertEqual(reader.get("2001:db8::1")["city"]["names"]["en"], "Berlin")
+        self.assertIsNone(reader.get("2001:db9::1"))
+        with self.assertRaises(ValueError):
+            self.build(4, 24).get("2001:db8::1")
+
+    def test_large_pointers_and_sizes(self):
+        writer = MMDBWriter(4, 24)
+        writer.add_data("z" * 70000)  # Three-byte size extension; later pointers need two bytes
+        target = writer.add_data({"names": {"en": "Far"}})
+        writer.insert("10.0.0.0/8", writer.add_data({"country": Pointer(target)}))
+        path = os.path.join(self.directory.name, "large.mmdb")
+        writer.write(path)
+        reader = MMDBReader(path)
+        self.addCleanup(reader.close)
+        self.assertEqual(reader.get("10.1.2.3"), {"country": {"names": {"en": "Far"}}})
+
+    def test_service(self):
+        self.build(6, 24)
+        service = GeoIPService(directory=self.directory.name, http_fallback=False)
+        location = service.lookup("1.2.3.4")
+        self.assertEqual(location["City"], "Berlin")
+        self.assertEqual(location["Region"], "Land Berlin")
+        self.assertEqual(location["Time Zone"], "Europe/Berlin")
+        self.assertEqual(service.lookup_many(["8.8.8.8"]), {"8.8.8.8": None})
+
+    def test_http_fallback_is_opt_in(self):
+        class Service(GeoIPService):
+            def _lookup_http(self, ips):
+                return {ip: {"City": "Remote"} for ip in ips}
+
+        missing = os.path.join(self.directory.name, "missing")
+        self.assertEqual(Service(directory=missing).lookup("1.2.3.4"), {})
+        self.assertEqual(Service(directory=missing, http_fallback=True).lookup("1.2.3.4"), {"City": "Remote"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from local_server import serve
+from utils import http_cache
+
+
+def _route(request):
+    with request.server.lock:
+        request.server.requests += 1
+    request.reply(200, b"ok")
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        http_cache.clear()
+        self.addCleanup(http_cache.clear)
+        self.server = serve(self, _route)
+        self.server.requests = 0
+        self.url = self.server.url + "/"
+
+    def test_concurrent_fetches_share_one_request(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(lambda _: http_cache.fetch(self.url), range(8)))
+        self.assertEqual(self.server.requests, 1)
+        self.assertTrue(all(response is responses[0] for response in responses))
+        http_cache.fetch(self.url.rstrip("/").replace("http", "HTTP"))  # Same canonical URL
+        self.assertEqual(self.server.requests, 1)
+
+    def test_max_age_and_clear(self):
+        http_cache.fetch(self.url)
+        http_cache.fetch(self.url, max_age=0)
+        self.assertEqual(self.server.requests, 2)
+        http_cache.clear()
+        http_cache.fetch(self.url)
+        self.assertEqual(self.server.requests, 3)
+
+    def test_failures_are_not_cached(self):
+        self.server.stop()
+        with self.assertRaises(http_cache.requests.RequestException):
+            http_cache.fetch(self.url, timeout=2)
+        self.server = serve(self, _route, port=self.server.server_port)
+        self.server.requests = 0
+        self.assertEqual(http_cache.fetch(self.url).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import ipaddress
+import os
+import tempfile
+import threading
+import time
+import unittest
+from utils.ip_ranges import ASN_FILE, PROVIDERS_FILE, IntervalIndex, IPRangeDatabase, flatten, write_index
+
+
+def _v4(network: str) -> tuple:
+    network = ipaddress.ip_network(network)
+    return int(network.network_address), int(network.broadcast_address)
+
+
+class TestFlatten(unittest.TestCase):
+    def test_nested_blocks(self):
+        # 10.0.0.0/8 with a /16 inside it and a /24 inside that
+        intervals = [(*_v4("10.0.0.0/8"), "A"), (*_v4("10.1.0.0/16"), "B"), (*_v4("10.1.2.0/24"), "C")]
+        a, b, c = _v4("10.0.0.0/8"), _v4("10.1.0.0/16"), _v4("10.1.2.0/24")
+        self.assertEqual(flatten(intervals), [
+            (a[0], b[0] - 1, "A"), (b[0], c[0] - 1, "B"), c + ("C",), (c[1] + 1, b[1], "B"), (b[1] + 1, a[1], "A"),
+        ])
+
+    def test_duplicates_and_adjacent_ranges(self):
+        self.assertEqual(flatten([(0, 9, "A"), (0, 9, "B")]), [(0, 9, "B")])  # The later duplicate wins
+        self.assertEqual(flatten([(10, 19, "A"), (0, 9, "A")]), [(0, 19, "A")])
+        self.assertEqual(flatten([(0, 9, "A"), (20, 29, "B")]), [(0, 9, "A"), (20, 29, "B")])
+
+    def test_partial_overlap(self):
+        # The later start wins where they overlap; the rest of each range keeps its own attribute
+        self.assertEqual(flatten([(0, 10, "A"), (5, 15, "B")]), [(0, 4, "A"), (5, 15, "B")])
+        self.assertEqual(flatten([(0, 10, "A"), (5, 15, "B"), (8, 9, "C")]),
+                         [(0, 4, "A"), (5, 7, "B"), (8, 9, "C"), (10, 15, "B")])
+
+
+class TestIntervalIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, v4: list, v6: list, attributes: list) -> str:
+        path = os.path.join(self.directory.name, name)
+        write_index(path, v4, v6, attributes)
+        return path
+
+    def test_lookups(self):
+        v6 = int(ipaddress.ip_address("2001:db8::")) >> 64
+        path = self.write("test.idx", flatten([(*_v4("10.0.0.0/8"), 0), (*_v4("10.1.0.0/16"), 1)]),
+                          [(v6, v6 + 0xFFFF, 2)], [{"Provider": "A"}, {"Provider": "B"}, {"Provider": "C"}])
+        index = IntervalIndex(path)
+        self.addCleanup(index.close)
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.lookup("10.2.0.1"), {"Provider": "A"})
+        self.assertEqual(index.lookup("10.1.255.255"), {"Provider": "B"})
+        self.assertEqual(index.lookup("::ffff:10.1.0.1"), {"Provider": "B"})  # IPv4-mapped
+        self.assertEqual(index.lookup("2001:db8:0:ffff::1"), {"Provider": "C"})
+        self.assertIsNone(index.lookup("2001:db9::1"))
+        self.assertIsNone(index.lookup("11.0.0.0"))
+        self.assertIsNone(index.lookup("not an ip"))
+        self.assertEqual(index.lookup_many(["11.0.0.0", "10.1.0.0", "10.0.0.0", "2001:db8::"]), {
+            "10.0.0.0": {"Provider": "A"}, "10.1.0.0": {"Provider": "B"},
+            "11.0.0.0": None, "2001:db8::": {"Provider": "C"},
+        })
+
+    def test_database_loads_on_first_lookup_only(self):
+        self.write(PROVIDERS_FILE, [(*_v4("1.1.1.0/24"), 0)], [], [{"Provider": "Cloudflare"}])
+        self.write(ASN_FILE, [(*_v4("1.1.0.0/16"), 0)], [], [{"ASN": 13335, "AS Name": "CLOUDFLARENET"}])
+
+        class Database(IPRangeDatabase):
+            refreshes = 0
+
+            def refresh(self, include_asn=True, force=False):
+                self.refreshes += 1  # Would download; the indexes are fresh
+
+        database = Database(self.directory.name)
+        self.assertIsNone(database.providers)
+        self.assertEqual(database.lookup("1.1.1.1"),
+                         {"ASN": 13335, "AS Name": "CLOUDFLARENET", "Provider": "Cloudflare"})
+        self.assertEqual(database.lookup("1.1.2.1"), {"ASN": 13335, "AS Name": "CLOUDFLARENET"})
+        self.assertEqual(database.refreshes, 0)
+
+        stale = Database(os.path.join(self.directory.name, "missing"))
+        stale.lookup("1.1.1.1")
+        stale.lookup("1.1.1.1")
+        self.assertEqual(stale.refreshes, 1)  # A failed build is not retried on every lookup
+        database.providers.close()
+        database.asn.close()
+
+    def test_concurrent_first_lookups_refresh_once(self):
+        class Database(IPRangeDatabase):
+            refreshes = 0
+
+            def refresh(self, include_asn=True, force=False):
+                with self._lock:
+                    self.refreshes += 1
+                    time.sleep(0.05)  # A slow download
+
+        database = Database(os.path.join(self.directory.name, "missing"))
+        threads = [threading.Thread(target=database.lookup, args=("1.1.1.1",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(database.refreshes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import time
+import unittest
+from local_server import serve
+from utils.link_checker import LinkChecker
+
+
+def _route(request):
+    server = request.server
+    with server.lock:
+        server.log.append((request.command, request.path, request.headers.get("Range")))
+        hits = server.hits[request.path] = server.hits.get(request.path, 0) + 1
+        server.active += 1
+        server.peak = max(server.peak, server.active)
+    try:
+        if request.path == "/no-head" and request.command == "HEAD":
+            request.reply(405)
+        elif request.path == "/no-head":
+            request.reply(206, b"x", {"Content-Range": "bytes 0-0/5000"})
+        elif request.path == "/missing":
+            request.reply(404)
+        elif request.path == "/busy" and hits == 1:
+            request.reply(429, headers={"Retry-After": "0.3"})
+        elif request.path == "/unavailable" and hits == 1:
+            request.reply(503)  # No Retry-After: exponential backoff
+        elif request.path.startswith("/slow"):
+            time.sleep(0.05)
+            request.reply(200)
+        else:
+            request.reply(200)
+    finally:
+        with server.lock:
+            server.active -= 1
+
+
+class TestLinkChecker(unittest.TestCase):
+    def setUp(self):
+        self.server = serve(self, _route)
+        self.server.log = []
+        self.server.hits = {}
+        self.server.active = self.server.peak = 0
+        self.url = self.server.url
+        self.checker = LinkChecker(max_workers=4, per_host=2, timeout=5)
+        self.addCleanup(self.checker.close)
+
+    def test_head(self):
+        result = self.checker.check(self.url + "/ok")
+        self.assertEqual(result, {
+            "URL": self.url + "/ok", "Status": 200, "Final URL": self.url + "/ok", "Method": "HEAD", "Broken": False,
+        })
+        self.assertTrue(self.checker.check(self.url + "/missing")["Broken"])
+        self.assertEqual([method for method, _, _ in self.server.log], ["HEAD", "HEAD"])
+
+    def test_range_get_fallback(self):
+        result = self.checker.check(self.url + "/no-head")
+        self.assertEqual((result["Status"], result["Method"], result["Broken"]), (206, "GET", False))
+        self.assertEqual(self.server.log, [("HEAD", "/no-head", None), ("GET", "/no-head", "bytes=0-0")])
+
+    def test_backoff_honours_retry_after(self):
+        start = time.monotonic()
+        result = self.checker.check(self.url + "/busy")
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+        self.assertEqual(result["Status"], 200)
+        self.assertEqual(self.server.hits["/busy"], 2)
+
+    def test_backoff_without_retry_after(self):
+        start = time.monotonic()
+        result = self.checker.check(self.url + "/unavailable")
+        self.assertGreaterEqual(time.monotonic() - start, 0.5)
+        self.assertEqual((result["Status"], result["Broken"]), (200, False))
+        limiter = self.checker._limiter(self.url)
+        self.assertEqual(limiter.delay, 0.25)  # Relaxes after the success
+
+    def test_unreachable(self):
+        result = self.checker.check("http://127.0.0.1:1/")
+        self.assertTrue(result["Broken"])
+        self.assertIsNone(result["Status"])
+        self.assertIn("Error", result)
+
+    def test_check_many_is_bounded(self):
+        pulled = []
+
+        def urls():
+            for i in range(60):
+                pulled.append(i)
+                yield f"{self.url}/slow/{i}"
+
+        in_flight = []
+        progress = []
+        results = []
+        for result in self.checker.check_many(urls(), progress=lambda done, submitted: progress.append(submitted)):
+            in_flight.append(len(pulled) - len(results))
+            results.append(result)
+        self.assertEqual(len(results), 60)
+        self.assertEqual(len({result["URL"] for result in results}), 60)
+        self.assertLessEqual(max(in_flight), self.checker.max_workers * 4)
+        self.assertLessEqual(self.server.peak, 2)  # per_host
+        self.assertEqual(progress[-1], 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from utils.metrics import LatencyHistogram
+from utils.rate_limits import advertised_limits
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_precision(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(float(value))
+        self.assertAlmostEqual(histogram.percentile(50), 500, delta=500 * 0.02)
+        self.assertAlmostEqual(histogram.percentile(99), 990, delta=990 * 0.02)
+        self.assertEqual(histogram.summary()["Max"], 1000)
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(10)
+        second.record(20)
+        second.record(0)
+        first.merge(second)
+        self.assertEqual((first.count, first.min, first.max), (3, 0, 20))
+        with self.assertRaises(ValueError):
+            first.merge(LatencyHistogram(precision=0.01))
+
+
+class TestAdvertisedLimits(unittest.TestCase):
+    def test_header_forms(self):
+        self.assertEqual(advertised_limits({"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "0"}),
+                         {"Limit": 60, "Remaining": 0})
+        self.assertEqual(advertised_limits({"RateLimit": "limit=100, remaining=50, reset=30"}),
+                         {"Limit": 100, "Remaining": 50, "Reset": 30})
+        self.assertEqual(advertised_limits({"RateLimit-Policy": "100;w=60"}), {"Policy": "100;w=60"})
+        self.assertEqual(advertised_limits({"Content-Type": "application/json"}), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
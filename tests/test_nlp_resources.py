@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+import types
+import unittest
+from utils import nlp_resources
+
+
+class _OfflineNLTK(types.ModuleType):
+    """Stands in for nltk on a machine without corpora or network access."""
+
+    def __init__(self, installed=()):
+        super().__init__("nltk")
+        self.installed = set(installed)
+        self.downloads = []
+        self.data = types.SimpleNamespace(find=self.find)
+
+    def find(self, path: str):
+        if path not in self.installed:
+            raise LookupError(path)
+
+    def download(self, name: str, quiet: bool = False, raise_on_error: bool = False):
+        self.downloads.append(name)
+        raise ValueError("Network is unreachable")
+
+
+class TestNLPResources(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "data", "nltk_unavailable.json")
+        saved = (nlp_resources.UNAVAILABLE_PATH, nlp_resources._analyzer, nlp_resources._tokenizer,
+                 sys.modules.get("nltk"))
+        self.addCleanup(self.restore, saved)
+        nlp_resources.UNAVAILABLE_PATH = self.path
+        self.nltk = self.install(_OfflineNLTK())
+
+    def restore(self, saved):
+        nlp_resources.UNAVAILABLE_PATH, nlp_resources._analyzer, nlp_resources._tokenizer, nltk = saved
+        if nltk is None:
+            sys.modules.pop("nltk", None)
+        else:
+            sys.modules["nltk"] = nltk
+        self.new_process()
+
+    def install(self, nltk):
+        sys.modules["nltk"] = nltk
+        self.new_process()
+        return nltk
+
+    def new_process(self):
+        """Forget everything cached in memory, as a fresh start of the application would."""
+        nlp_resources._resource_status.clear()
+        nlp_resources._stop_words.clear()
+        nlp_resources._analyzer = None
+        nlp_resources._tokenizer = None
+
+    def test_failed_download_is_not_retried_by_the_next_run(self):
+        self.assertFalse(nlp_resources.ensure_resource("stopwords"))
+        self.assertFalse(nlp_resources.ensure_resource("stopwords"))
+        self.assertEqual(self.nltk.downloads, ["stopwords"])
+        self.assertTrue(os.path.exists(self.path))
+        nltk = self.install(_OfflineNLTK())
+        self.assertFalse(nlp_resources.ensure_resource("stopwords"))
+        self.assertEqual(nltk.downloads, [])
+
+    def test_download_is_retried_after_the_interval(self):
+        nlp_resources.ensure_resource("stopwords")
+        interval, nlp_resources.RETRY_INTERVAL = nlp_resources.RETRY_INTERVAL, 0
+        self.addCleanup(setattr, nlp_resources, "RETRY_INTERVAL", interval)
+        nltk = self.install(_OfflineNLTK())
+        nlp_resources.ensure_resource("stopwords")
+        self.assertEqual(nltk.downloads, ["stopwords"])
+
+    def test_installed_resources_need_no_download(self):
+        nltk = self.install(_OfflineNLTK(installed=["corpora/stopwords"]))
+        self.assertTrue(nlp_resources.ensure_resource("stopwords"))
+        self.assertFalse(nlp_resources.ensure_resource("vader_lexicon", download=False))
+        self.assertEqual(nltk.downloads, [])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_fallbacks(self):
+        self.assertIsNone(nlp_resources.get_sentiment_analyzer())
+        self.assertIs(nlp_resources.get_stop_words(), nlp_resources.FALLBACK_STOP_WORDS)
+        self.assertEqual(nlp_resources.get_stop_words("german"), frozenset())
+        self.assertEqual(nlp_resources.tokenize("Don't stop, it's fine."),
+                         ["Don't", "stop", ",", "it's", "fine", "."])
+        nlp_resources.warm_up()
+        self.assertEqual(sorted(self.nltk.downloads), ["punkt", "stopwords", "vader_lexicon"])
+
+    def test_without_nltk(self):
+        sys.modules["nltk"] = None  # Makes "import nltk" raise ImportError
+        self.new_process()
+        self.assertFalse(nlp_resources.ensure_resource("punkt"))
+        self.assertEqual(nlp_resources.tokenize("a b"), ["a", "b"])
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
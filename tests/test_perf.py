@@ -0,0 +1,30 @@
+import unittest
+from local_server import serve
+from utils.perf import PerformanceProbe
+
+
+def _route(request):
+    if request.path == "/":
+        request.reply(301, headers={"Location": "/home"})
+    else:
+        request.reply(200, b"ok")
+
+
+class TestPerformanceProbe(unittest.TestCase):
+    def setUp(self):
+        self.url = serve(self, _route).url + "/"
+
+    def test_phases_and_connection_reuse(self):
+        probe = PerformanceProbe(timeout=5)
+        url = probe.final_url(self.url)
+        self.assertTrue(url.endswith("/home"))
+        result = probe.run(url, samples=6, concurrency=2)
+        self.assertEqual(result["StatusCodes"], {200: 6})
+        self.assertEqual(result["ConnectionReuse"]["New Connections"], 2)  # One per worker
+        self.assertEqual(result["Phases_ms"]["Connect"]["Count"], 2)
+        self.assertEqual(result["Phases_ms"]["Total"]["Count"], 6)
+        self.assertNotIn("TLS", result["Phases_ms"])
+
+
+if __name__ == '__main__':
+    unittest.main()
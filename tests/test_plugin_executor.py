@@ -0,0 +1,70 @@
+import os
+import time
+import unittest
+from utils.plugin_executor import PluginProcessPool, plugin_location
+
+
+class _InfoPlugin:
+    """Reports which plugins the worker it runs in has loaded."""
+    warmed_up = False
+
+    def warm_up(self):
+        self.warmed_up = True
+
+    def run(self, target: str) -> dict:
+        from utils import plugin_executor
+        return {
+            "Target": target,
+            "Pid": os.getpid(),
+            "Warmed Up": self.warmed_up,
+            "Loaded": sorted(name for _, name in plugin_executor._worker_plugins),
+        }
+
+
+class _OtherPlugin(_InfoPlugin):
+    pass
+
+
+class _SlowPlugin(_InfoPlugin):
+    def run(self, target: str) -> dict:
+        time.sleep(60)
+        return {}
+
+
+class TestPluginProcessPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = PluginProcessPool(max_workers=1)
+        self.addCleanup(self.pool.shutdown, terminate=True)
+
+    def test_runs_in_a_preloaded_worker(self):
+        self.pool.start([_InfoPlugin(), _OtherPlugin()])
+        result = self.pool.submit(_InfoPlugin(), "https://example.com/").result(timeout=120)
+        self.assertEqual(result["Target"], "https://example.com/")
+        self.assertNotEqual(result["Pid"], os.getpid())
+        self.assertTrue(result["Warmed Up"])
+        self.assertEqual(result["Loaded"], ["_InfoPlugin", "_OtherPlugin"])
+
+    def test_restart_preloads_every_plugin_seen(self):
+        self.pool.start([_InfoPlugin()])
+        self.pool.submit(_OtherPlugin(), "a").result(timeout=120)
+        self.pool.shutdown()
+        result = self.pool.submit(_InfoPlugin(), "b").result(timeout=120)
+        self.assertEqual(result["Loaded"], ["_InfoPlugin", "_OtherPlugin"])
+        self.assertEqual(self.pool._preloaded, [plugin_location(_InfoPlugin()), plugin_location(_OtherPlugin())])
+
+    def test_terminate_stops_running_workers(self):
+        self.pool.start([_SlowPlugin()])
+        future = self.pool.submit(_SlowPlugin(), "a")
+        deadline = time.monotonic() + 120
+        while not future.running() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        processes = list(self.pool._executor._processes.values())
+        self.pool.shutdown(terminate=True)
+        self.assertFalse(self.pool.started)
+        for process in processes:
+            process.join(timeout=30)
+            self.assertFalse(process.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
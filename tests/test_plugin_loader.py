@@ -0,0 +1,179 @@
+import importlib
+import json
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from plugins.base_plugin import BasePlugin
+from utils.plugin_loader import (
+    LazyPlugin, build_manifest, load_plugins, needs_warm_up, read_manifest, scan_plugin_source,
+)
+
+LITERAL_PLUGIN = '''
+from plugins.base_plugin import BasePlugin
+
+
+class Helper:
+    @property
+    def name(self):
+        return "Not a plugin"
+
+
+class {cls}(BasePlugin):
+    @property
+    def name(self) -> str:
+        """Shown in the tools table."""
+        return "{name}"
+
+    @property
+    def description(self) -> str:
+        return "Literal description."
+
+    @property
+    def cache_ttl(self) -> int:
+        return 60 * 60
+
+    @property
+    def required_api_keys(self) -> list:
+        return ["KEY"]
+
+    @property
+    def cpu_bound(self) -> bool:
+        return True
+
+    def warm_up(self):
+        pass
+
+    def run(self, target: str) -> dict:
+        return {{"Target": target}}
+'''
+
+COMPUTED_PLUGIN = '''
+from plugins.base_plugin import BasePlugin
+
+NAME = "Computed"
+
+
+class ComputedPlugin(BasePlugin):
+    @property
+    def name(self) -> str:
+        return NAME
+
+    @property
+    def description(self) -> str:
+        return "Name is not a literal."
+
+    def run(self, target: str) -> dict:
+        return {}
+'''
+
+
+class _PlainPlugin(BasePlugin):
+    name = "Plain"
+    description = "No warm-up."
+
+    def run(self, target: str) -> dict:
+        return {}
+
+
+class _WarmPlugin(_PlainPlugin):
+    def warm_up(self):
+        pass
+
+
+class TestNeedsWarmUp(unittest.TestCase):
+    def test_plugins(self):
+        self.assertFalse(needs_warm_up(_PlainPlugin()))
+        self.assertTrue(needs_warm_up(_WarmPlugin()))
+
+    def test_lazy_plugins_stay_unloaded(self):
+        plain = LazyPlugin("plugins.missing", "Plain", {"name": "Plain"}, ["run"])
+        warm = LazyPlugin("plugins.missing", "Warm", {"name": "Warm"}, ["run", "warm_up"])
+        self.assertFalse(needs_warm_up(plain))
+        self.assertTrue(needs_warm_up(warm))
+        self.assertFalse(plain.loaded or warm.loaded)
+
+
+class TestPluginLoader(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # A second "plugins" directory; the plugins namespace package picks it up from sys.path
+        self.folder = os.path.join(directory.name, "plugins")
+        os.makedirs(self.folder)
+        sys.path.append(directory.name)
+        self.addCleanup(sys.path.remove, directory.name)
+        self.addCleanup(importlib.invalidate_caches)
+        self.manifest_path = os.path.join(directory.name, "data", "plugin_manifest.json")
+
+    def write(self, filename: str, source: str):
+        path = os.path.join(self.folder, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(textwrap.dedent(source))
+        module = f"plugins.{filename[:-3]}"
+        self.addCleanup(sys.modules.pop, module, None)
+        return path
+
+    def test_scan_plugin_source(self):
+        path = self.write("loader_scan.py", LITERAL_PLUGIN.format(cls="ScanPlugin", name="Scan"))
+        classes = scan_plugin_source(path)
+        self.assertEqual(len(classes), 1)  # Helper does not derive from BasePlugin
+        self.assertEqual(classes[0]["class"], "ScanPlugin")
+        self.assertEqual(classes[0]["properties"], {
+            "name": "Scan", "description": "Literal description.", "required_api_keys": ["KEY"], "cpu_bound": True,
+        })
+        self.assertEqual(classes[0]["overrides"], ["cache_ttl", "warm_up", "run"])
+
+    def test_build_manifest_rescans_changed_files_only(self):
+        self.write("loader_a.py", LITERAL_PLUGIN.format(cls="APlugin", name="A"))
+        self.write("loader_b.py", LITERAL_PLUGIN.format(cls="BPlugin", name="B"))
+        self.write("loader_broken.py", "class Broken(BasePlugin:\n")
+        manifest = build_manifest(self.folder, self.manifest_path)
+        self.assertEqual(read_manifest(self.manifest_path), manifest)
+        self.assertIsNone(manifest["modules"]["loader_broken.py"]["classes"])
+        self.assertEqual(manifest["modules"]["loader_a.py"]["module"], "plugins.loader_a")
+
+        # Unchanged files are served from the manifest, even if it disagrees with the source
+        manifest["modules"]["loader_a.py"]["classes"][0]["properties"]["name"] = "Cached"
+        manifest["modules"]["loader_b.py"]["classes"][0]["properties"]["name"] = "Cached"
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f)
+        self.write("loader_b.py", LITERAL_PLUGIN.format(cls="BPlugin", name="B2"))
+        os.remove(os.path.join(self.folder, "loader_broken.py"))
+        manifest = build_manifest(self.folder, self.manifest_path)
+        self.assertEqual(manifest["modules"]["loader_a.py"]["classes"][0]["properties"]["name"], "Cached")
+        self.assertEqual(manifest["modules"]["loader_b.py"]["classes"][0]["properties"]["name"], "B2")
+        self.assertEqual(sorted(manifest["modules"]), ["loader_a.py", "loader_b.py"])
+
+    def test_load_plugins(self):
+        self.write("loader_lazy.py", LITERAL_PLUGIN.format(cls="LazyOne", name="Lazy"))
+        self.write("loader_computed.py", COMPUTED_PLUGIN)
+        self.write("loader_broken.py", "class Broken(BasePlugin:\n")
+        plugins = {plugin.name: plugin for plugin in load_plugins(self.folder, manifest_path=self.manifest_path)}
+        self.assertEqual(sorted(plugins), ["Computed", "Lazy"])
+
+        lazy = plugins["Lazy"]
+        self.assertIsInstance(lazy, LazyPlugin)
+        self.assertTrue(lazy.cpu_bound)
+        self.assertFalse(lazy.analyzes_pages)  # BasePlugin default, no import needed
+        self.assertFalse(lazy.loaded)
+        self.assertEqual(lazy.description, "Literal description.")
+        self.assertFalse(lazy.loaded)
+        self.assertEqual(lazy.cache_ttl, 3600)  # Not a literal: imports the module
+        self.assertTrue(lazy.loaded)
+        self.assertEqual(lazy.run("x"), {"Target": "x"})
+
+        # A name that is not a literal falls back to importing the module up front
+        self.assertEqual(type(plugins["Computed"]).__name__, "ComputedPlugin")
+        self.assertIn("plugins.loader_computed", sys.modules)
+
+    def test_eager_loading(self):
+        self.write("loader_eager.py", LITERAL_PLUGIN.format(cls="EagerPlugin", name="Eager"))
+        plugins = load_plugins(self.folder, lazy=False, manifest_path=self.manifest_path)
+        self.assertEqual([type(plugin).__name__ for plugin in plugins], ["EagerPlugin"])
+        self.assertFalse(os.path.exists(self.manifest_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
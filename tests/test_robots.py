@@ -0,0 +1,61 @@
+import unittest
+import requests
+from utils.robots import RobotsRules, RobotsService
+
+ROBOTS_TXT = """# Example
+User-agent: Googlebot
+User-agent: DeepWebsiteAnalyzer
+Disallow: /private
+Allow: /private/public
+Disallow: /*.pdf$
+Crawl-delay: 2
+
+User-agent: *
+Disallow: /admin
+Sitemap: https://example.com/sitemap_index.xml
+"""
+
+
+class TestRobotsRules(unittest.TestCase):
+    def setUp(self):
+        self.rules = RobotsRules("https://example.com/robots.txt", ROBOTS_TXT, 200)
+
+    def test_longest_match_wins(self):
+        self.assertFalse(self.rules.can_fetch("https://example.com/private/x"))
+        self.assertTrue(self.rules.can_fetch("https://example.com/private/public/x"))
+        self.assertFalse(self.rules.can_fetch("https://example.com/files/a.pdf"))
+        self.assertTrue(self.rules.can_fetch("https://example.com/files/a.pdf?download=1"))
+
+    def test_groups(self):
+        self.assertTrue(self.rules.can_fetch("https://example.com/admin"))
+        self.assertFalse(self.rules.can_fetch("https://example.com/admin", "OtherBot/2.0"))
+        self.assertEqual(self.rules.crawl_delay(), 2.0)
+        self.assertEqual(self.rules.disallowed("*"), ["/admin"])
+        self.assertEqual(self.rules.sitemaps, ["https://example.com/sitemap_index.xml"])
+
+    def test_missing_robots_allows_everything(self):
+        self.assertTrue(RobotsRules("https://example.com/robots.txt", status=404).can_fetch("https://example.com/x"))
+
+    def test_server_errors_disallow_everything(self):
+        rules = RobotsRules("https://example.com/robots.txt", status=503)
+        self.assertTrue(rules.unavailable)
+        self.assertFalse(rules.can_fetch("https://example.com/x"))
+
+
+class _Session:
+    def __init__(self):
+        self.headers = {}
+
+    def get(self, url, **kwargs):
+        raise requests.ConnectionError("Connection refused")
+
+
+class TestRobotsService(unittest.TestCase):
+    def test_unreachable_robots_disallows_everything(self):
+        rules = RobotsService(session=_Session()).get("https://example.com/page")
+        self.assertEqual(rules.error, "Connection refused")
+        self.assertFalse(rules.can_fetch("https://example.com/page"))
+
+
+if __name__ == '__main__':
+    unittest.main()
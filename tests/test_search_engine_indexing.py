@@ -0,0 +1,39 @@
+import unittest
+from local_server import serve
+import plugins.search_engine_indexing as search_engine_indexing
+from plugins.search_engine_indexing import SearchEngineIndexingPlugin
+
+
+def _route(request):
+    if request.path == "/sitemap.xml":
+        locs = "".join(f"<url><loc>{request.server.url}/page/{i}</loc></url>" for i in range(8))
+        locs += "".join(f"<url><loc>{request.server.url}/missing/{i}</loc></url>" for i in range(4))
+        body = f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>'
+        request.reply(200, body.encode(), {"Content-Type": "application/xml"})
+    elif request.path.startswith("/missing/"):
+        request.reply(404)
+    else:
+        request.reply(200)
+
+
+class TestSitemapDiscrepancies(unittest.TestCase):
+    def setUp(self):
+        self.url = serve(self, _route).url
+        listed = search_engine_indexing.MAX_LISTED_URLS
+        search_engine_indexing.MAX_LISTED_URLS = 3
+        self.addCleanup(setattr, search_engine_indexing, "MAX_LISTED_URLS", listed)
+
+    def test_every_url_is_checked_not_only_the_listed_ones(self):
+        plugin = SearchEngineIndexingPlugin()
+        sitemap = self.url + "/sitemap.xml"
+        contents, statistics = {}, {"Total URLs": 0}
+        discrepancies = plugin.check_sitemap_discrepancies(plugin.enumerate_sitemap([sitemap], contents, statistics))
+        self.assertEqual(len(contents[sitemap]), 3)
+        self.assertEqual(statistics["Total URLs"], 12)
+        self.assertIn("Note", statistics)
+        self.assertEqual((discrepancies["Checked URLs"], discrepancies["Broken URL Count"]), (12, 4))
+        self.assertEqual(sorted(discrepancies["Broken URLs in Sitemap"]), [f"{self.url}/missing/{i}" for i in range(4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import json
+import tempfile
+from datetime import datetime, timedelta
+from utils.session_utils import (
+    SessionWriter, open_session_writer, session_target_key, find_latest_session, is_result_fresh, validators_match,
+    diff_results, load_session, read_plugin_result, read_session_header, recover_session, list_sessions
+)
+
+
+class TestSessionUtils(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def write_session(self, session_id, data):
+        with open(os.path.join(self.cache_dir, f"session_{session_id}.json"), 'w') as f:
+            json.dump(data, f)
+
+    def test_target_key(self):
+        self.assertEqual(session_target_key("https://Example.com/"), session_target_key("example.com"))
+
+    def test_find_latest_session(self):
+        self.write_session("20240101_000000", {"Target": "example.com", "Timestamp": "2024-01-01 00:00:00"})
+        self.write_session("20240102_000000", {"Target": "http://example.com", "Timestamp": "2024-01-02 00:00:00"})
+        self.write_session("20240103_000000", {"Target": "other.com", "Timestamp": "2024-01-03 00:00:00"})
+        session = find_latest_session(self.cache_dir, "example.com")
+        self.assertEqual(session["Timestamp"], "2024-01-02 00:00:00")
+        self.assertIsNone(find_latest_session(self.cache_dir, "missing.com"))
+
+    def test_result_freshness(self):
+        now = datetime(2024, 1, 2, 12, 0, 0)
+        recent = (now - timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S")
+        self.assertTrue(is_result_fresh(recent, 3600 * 2, now=now))
+        self.assertFalse(is_result_fresh(recent, 60, now=now))
+        self.assertFalse(is_result_fresh(None, 3600, now=now))
+
+    def test_validators_match(self):
+        self.assertTrue(validators_match({"ETag": "abc"}, {"ETag": "abc"}))
+        self.assertFalse(validators_match({"ETag": "abc"}, {"ETag": "def"}))
+        self.assertFalse(validators_match({"ETag": "abc"}, {"Content-Hash": "abc"}))
+        self.assertFalse(validators_match({}, {"ETag": "abc"}))
+
+    def test_diff_results(self):
+        old = {"Server": "nginx", "Headers": {"A": 1, "B": 2}, "Gone": True}
+        new = {"Server": "apache", "Headers": {"A": 1, "C": 3}, "New": []}
+        diff = diff_results(old, new)
+        self.assertEqual(diff["Changed"], ["Server"])
+        self.assertCountEqual(diff["Added"], ["Headers.C", "New"])
+        self.assertCountEqual(diff["Removed"], ["Headers.B", "Gone"])
+        self.assertFalse(any(diff_results(old, old).values()))
+
+    def test_streaming_session_round_trip(self):
+        writer = SessionWriter(self.cache_dir, "session_20240104_000000", "example.com", "2024-01-04 00:00:00")
+        writer.write_result("DNS Records", {"A": ["93.184.216.34"]}, run_time="2024-01-04 00:00:01")
+        writer.write_result("HTTP Headers", {"Server": "nginx", "When": datetime(2024, 1, 4)})
+        self.assertTrue(os.path.exists(writer.partial_path))
+        path = writer.finalize({"Validators": {"ETag": "abc"}})
+        self.assertFalse(os.path.exists(writer.partial_path))
+
+        self.assertEqual(read_session_header(path)["Target"], "example.com")
+        self.assertEqual(read_plugin_result(path, "HTTP Headers")["Server"], "nginx")
+        self.assertIsNone(read_plugin_result(path, "Missing"))
+        session = load_session(path)
+        self.assertEqual(session["DNS Records"], {"A": ["93.184.216.34"]})
+        self.assertEqual(session["Validators"], {"ETag": "abc"})
+        self.assertEqual(session["RunTimes"]["DNS Records"], "2024-01-04 00:00:01")
+        self.assertEqual(find_latest_session(self.cache_dir, "example.com")["Timestamp"], "2024-01-04 00:00:00")
+
+    def test_recover_interrupted_session(self):
+        writer = SessionWriter(self.cache_dir, "session_20240105_000000", "example.com", "2024-01-05 00:00:00")
+        writer.write_result("DNS Records", {"A": []})
+        # Simulate a crash in the middle of writing the next record
+        writer._file.write(b'{"Type":"Result","Plugin":"WHO')
+        writer._file.close()
+        path = recover_session(writer.partial_path)
+        self.assertEqual(read_plugin_result(path, "DNS Records"), {"A": []})
+        self.assertIn(("session_20240105_000000", path), list_sessions(self.cache_dir))
+
+    def test_compact_session_round_trip(self):
+        writer = open_session_writer(self.cache_dir, "session_20240106_000000", "example.com",
+                                     "2024-01-06 00:00:00", compact=True)
+        writer.write_result("Subdomain Enumeration", {"AllSubdomains": [f"h{i}.example.com" for i in range(1000)]})
+        writer.write_result("HTTP Headers", {"Server": "nginx"})
+        path = writer.finalize({"Validators": {"ETag": "abc"}})
+        self.assertTrue(path.endswith(".dwas"))
+        self.assertEqual(read_session_header(path)["Target"], "example.com")
+        self.assertEqual(read_plugin_result(path, "HTTP Headers"), {"Server": "nginx"})
+        session = load_session(path)
+        self.assertEqual(len(session["Subdomain Enumeration"]["AllSubdomains"]), 1000)
+        self.assertEqual(session["Validators"], {"ETag": "abc"})
+
+        writer = open_session_writer(self.cache_dir, "session_20240107_000000", "example.com",
+                                     "2024-01-07 00:00:00", compact=True)
+        writer.write_result("HTTP Headers", {"Server": "nginx"})
+        writer._file.write(b"\x00\x00\x10\x00partial")
+        writer._file.close()
+        path = recover_session(writer.partial_path)
+        self.assertEqual(read_plugin_result(path, "HTTP Headers"), {"Server": "nginx"})
+
+
+if __name__ == '__main__':
+    unittest.main()
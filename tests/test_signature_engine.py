@@ -0,0 +1,38 @@
+# tests/test_signature_engine.py
+import unittest
+from utils.signature_engine import SignatureEngine
+
+
+class TestSignatureEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = SignatureEngine.from_directory()
+
+    def test_headers_and_body_in_one_scan(self):
+        matches = self.engine.scan(
+            {"Server": "cloudflare", "X-F5-Node": "f5 pool", "Via": "1.1 proxy"},
+            '<script src="https://cdn.fastly.net/app.js"></script> ORA-00933 docker-swarm',
+            403,
+        )
+        self.assertEqual(matches.names("waf"), ["Cloudflare", "F5 BIG-IP"])
+        self.assertEqual(matches.names("cdn", "Assets"), ["Fastly"])
+        self.assertEqual(matches.names("infrastructure", "Databases"), ["Oracle"])
+        self.assertEqual(matches.names("infrastructure", "Containerization"), ["Docker"])
+        self.assertIn("Reverse Proxy", matches.names("infrastructure", "OtherComponents"))
+
+    def test_scope_and_status_restrictions(self):
+        # Header names are not values, and WAF error-page signatures need a blocking status
+        matches = self.engine.scan({"X-Akamai-Request": "1"}, "Blocked by Sucuri", 200)
+        self.assertEqual(matches.names("waf"), [])
+        self.assertEqual(self.engine.scan({}, "Blocked by Sucuri", 403).names("waf"), ["Sucuri"])
+
+    def test_overlapping_literals(self):
+        engine = SignatureEngine([
+            {"group": "g", "name": "AB", "pattern": "ab", "body": True},
+            {"group": "g", "name": "BC", "pattern": "bc", "body": True},
+            {"group": "g", "name": "B", "pattern": "b", "body": True},
+        ])
+        self.assertEqual(engine.scan(body="xabcx").names("g"), ["AB", "BC", "B"])
+
+
+if __name__ == '__main__':
+    unittest.main()
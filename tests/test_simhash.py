@@ -0,0 +1,26 @@
+import unittest
+from utils.simhash import SimHashIndex, distance, simhash, tokenize
+
+
+class TestSimHash(unittest.TestCase):
+    def setUp(self):
+        self.words = [f"word{i}" for i in range(400)]
+
+    def test_near_duplicates_are_close(self):
+        page = "<html><script>var tracking = 1;</script><p>" + " ".join(self.words) + "</p></html>"
+        variant = page.replace("word200", "changed").replace("<p>", "<p>Sorted by price ")
+        other = "<p>" + " ".join(reversed(self.words)) + "</p>"
+        self.assertNotIn("tracking", tokenize(page))
+        self.assertLessEqual(distance(simhash(tokenize(page)), simhash(tokenize(variant))), 3)
+        self.assertGreater(distance(simhash(tokenize(page)), simhash(tokenize(other))), 10)
+
+    def test_index(self):
+        index = SimHashIndex(max_distance=3)
+        self.assertIsNone(index.add_if_new(0b1011 << 40, "a"))
+        self.assertEqual(index.add_if_new((0b1011 << 40) ^ 0b111, "b"), "a")  # 3 bits apart
+        self.assertIsNone(index.add_if_new((0b1011 << 40) ^ 0b1111, "c"))  # 4 bits apart
+        self.assertEqual(index.count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
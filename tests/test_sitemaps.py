@@ -0,0 +1,105 @@
+import gzip
+import unittest
+from utils.bloom import BloomFilter
+from utils.sitemaps import SitemapReader
+
+URLSET = (
+    b'<?xml version="1.0" encoding="UTF-8"?>'
+    b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    b'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+    b'<url><loc>https://example.com/a</loc><lastmod>2024-01-01</lastmod>'
+    b'<image:image><image:loc>https://example.com/a.png</image:loc></image:image></url>'
+    b'<url><loc>https://example.com/b</loc></url>'
+    b'</urlset>'
+)
+
+
+class _Response:
+    def __init__(self, body: bytes, status_code: int = 200):
+        self.body = body
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), 7):  # Small chunks split tags across feeds
+            yield self.body[i:i + 7]
+
+
+class _Session:
+    def __init__(self, bodies: dict):
+        self.bodies = bodies
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if url not in self.bodies:
+            return _Response(b"", 404)
+        return _Response(self.bodies[url])
+
+
+class TestSitemapReader(unittest.TestCase):
+    def read(self, bodies: dict, start: str, **kwargs):
+        reader = SitemapReader(session=_Session(bodies), **kwargs)
+        return reader, [entry["loc"] for entry in reader.urls([start])]
+
+    def test_index_recursion_gzip_and_dedup(self):
+        index = (
+            b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            b'<sitemap><loc>https://example.com/pages.xml.gz</loc></sitemap>'
+            b'<sitemap><loc>https://example.com/more.xml</loc></sitemap>'
+            b'<sitemap><loc>https://example.com/missing.xml</loc></sitemap>'
+            b'</sitemapindex>'
+        )
+        more = URLSET.replace(b"/a<", b"/c<").replace(b"example.com/b", b"EXAMPLE.com:443/b")
+        reader, urls = self.read({
+            "https://example.com/index.xml": index,
+            "https://example.com/pages.xml.gz": gzip.compress(URLSET),
+            "https://example.com/more.xml": more,
+        }, "https://example.com/index.xml")
+        self.assertEqual(urls, ["https://example.com/a", "https://example.com/b", "https://example.com/c"])
+        self.assertEqual(reader.duplicates, 1)
+        self.assertEqual(reader.sitemaps["https://example.com/index.xml"], 3)
+        self.assertIn("https://example.com/missing.xml", reader.errors)
+
+    def test_nesting_limit(self):
+        loop = b'<sitemapindex><sitemap><loc>https://example.com/next.xml</loc></sitemap></sitemapindex>'
+        reader, urls = self.read({"https://example.com/index.xml": loop, "https://example.com/next.xml": loop},
+                                 "https://example.com/index.xml", max_depth=1)
+        self.assertEqual(urls, [])
+        self.assertEqual(reader.errors["https://example.com/next.xml"], "Sitemap index nested too deeply.")
+
+    def test_text_sitemap(self):
+        body = b"https://example.com/a\r\n\r\nnot a url\nhttps://example.com/b"
+        self.assertEqual(self.read({"https://example.com/s.txt": body}, "https://example.com/s.txt")[1],
+                         ["https://example.com/a", "https://example.com/b"])
+
+    def test_byte_order_mark(self):
+        urls = self.read({"https://example.com/s.xml": b"\xef\xbb\xbf" + URLSET}, "https://example.com/s.xml")[1]
+        self.assertEqual(urls, ["https://example.com/a", "https://example.com/b"])
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_membership(self):
+        bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+        self.assertTrue(bloom.add("a"))
+        self.assertFalse(bloom.add("a"))
+        self.assertTrue(bloom.add(b"b"))
+        self.assertIn("a", bloom)
+        self.assertEqual(len(bloom), 2)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=10_000, error_rate=1e-2)
+        for i in range(10_000):
+            bloom.add(f"in-{i}")
+        self.assertTrue(all(f"in-{i}" in bloom for i in range(10_000)))  # No false negatives
+        false_positives = sum(f"out-{i}" in bloom for i in range(10_000))
+        self.assertLess(false_positives, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
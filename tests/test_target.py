@@ -0,0 +1,44 @@
+import unittest
+import pickle
+from utils.target import Target, resolve_target, registrable_domain
+
+
+class TestTarget(unittest.TestCase):
+    def test_parse(self):
+        target = resolve_target("https://WWW.Shop.Example.co.uk:443/a/?utm_source=x&b=1")
+        self.assertIsInstance(target, str)
+        self.assertEqual(target.host, "www.shop.example.co.uk")
+        self.assertIsNone(target.port)
+        self.assertEqual(target.base_url, "https://www.shop.example.co.uk")
+        self.assertEqual(target.url, "https://WWW.Shop.Example.co.uk:443/a/?utm_source=x&b=1")  # As typed
+        self.assertEqual(target.canonical_url, "https://www.shop.example.co.uk/a/?b=1")
+        self.assertEqual(target.domain, "example.co.uk")
+
+    def test_bare_inputs(self):
+        self.assertEqual(resolve_target("example.com").url, "http://example.com/")
+        ip = resolve_target("[::1]:8080")
+        self.assertTrue(ip.is_ip)
+        self.assertEqual(ip.base_url, "http://[::1]:8080")
+        self.assertEqual(ip.ips, ["::1"])
+        self.assertEqual(registrable_domain("192.168.0.1"), "192.168.0.1")
+
+    def test_key_and_memoization(self):
+        self.assertEqual(resolve_target("https://Example.com/").key, resolve_target("example.com").key)
+        target = resolve_target("example.com")
+        self.assertIs(resolve_target(" example.com "), target)
+        self.assertIs(resolve_target(target), target)
+
+    def test_refresh(self):
+        target = Target("localhost")
+        target.__dict__["ips"] = ["192.0.2.1"]  # A stale answer from an earlier run
+        target.refresh()
+        self.assertNotIn("192.0.2.1", target.ips)
+
+    def test_pickle(self):
+        target = pickle.loads(pickle.dumps(Target("http://example.com:8080/x")))
+        self.assertIsInstance(target, Target)
+        self.assertEqual(target.netloc, "example.com:8080")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import math
+import unittest
+from collections import Counter
+from utils.text_analytics import TermStatistics, analyze_corpus, terms
+
+
+class TestTermStatistics(unittest.TestCase):
+    def test_frequency_arrays(self):
+        statistics = TermStatistics()
+        statistics.add(Counter({"apple": 2, "pear": 2}), 4)
+        statistics.add(Counter({"apple": 1, "plum": 3}), 4)
+        statistics.add(Counter(), 0)  # An empty page still counts as a document
+        apple, pear, plum = (statistics.vocabulary[term] for term in ("apple", "pear", "plum"))
+        self.assertEqual(statistics.documents, 3)
+        self.assertEqual(list(statistics.document_frequency), [2, 1, 1])
+        self.assertAlmostEqual(statistics.term_frequency[apple], 0.5 + 0.25)
+        self.assertAlmostEqual(statistics.term_frequency[pear], 0.5)
+        self.assertAlmostEqual(statistics.term_frequency[plum], 0.75)
+
+    def test_tf_idf_ranking(self):
+        statistics = TermStatistics()
+        statistics.add(Counter({"apple": 2, "pear": 2}), 4)
+        statistics.add(Counter({"apple": 1, "plum": 3}), 4)
+        statistics.add(Counter(), 0)
+        keywords = statistics.top_keywords()
+        # plum: tf 0.75 in one document outranks apple, which is in two
+        self.assertEqual([keyword["Term"] for keyword in keywords], ["plum", "apple", "pear"])
+        self.assertEqual(keywords[0]["Score"], round(0.75 * (math.log(4 / 2) + 1), 4))
+        self.assertEqual(keywords[1]["Documents"], 2)
+        self.assertEqual(len(statistics.top_keywords(limit=1)), 1)
+
+
+class TestAnalyzeCorpus(unittest.TestCase):
+    def test_corpus(self):
+        self.assertEqual(terms("The Apples, 42 apples and x!", frozenset({"the", "and"})), ["apples", "apples"])
+        documents = {
+            "https://example.com/": "Gardening tools and gardening gloves for every gardener.",
+            "https://example.com/tools": "Gardening tools: spades, rakes and hoes.",
+            "https://example.com/empty": "",
+        }
+        result = analyze_corpus(documents, workers=1, batch_size=2)
+        self.assertEqual(result["Pages Analyzed"], 3)
+        self.assertEqual(result["Pages"]["https://example.com/empty"]["Words"], 0)
+        self.assertEqual(result["Pages"]["https://example.com/empty"]["Language"], "unknown")
+        self.assertEqual(result["Keywords"][0]["Term"], "gardening")
+        self.assertNotIn("and", [keyword["Term"] for keyword in result["Keywords"]])  # Stopword
+
+
+if __name__ == '__main__':
+    unittest.main()
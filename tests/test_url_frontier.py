@@ -0,0 +1,53 @@
+import unittest
+from utils.url_frontier import SpillingQueue, URLFrontier, canonicalize
+
+
+class TestCanonicalize(unittest.TestCase):
+    def test_equivalent_spellings(self):
+        self.assertEqual(canonicalize("HTTP://Example.COM:80/a/./b/../c?b=2&utm_source=x&a=1#top"),
+                         "http://example.com/a/c?a=1&b=2")
+        self.assertEqual(canonicalize("https://example.com"), "https://example.com/")
+        self.assertEqual(canonicalize("https://example.com/%7euser/%2f"), "https://example.com/~user/%2F")
+        self.assertEqual(canonicalize("https://[::1]:8443/"), "https://[::1]:8443/")
+
+    def test_repeated_parameters_keep_their_order(self):
+        self.assertEqual(canonicalize("http://example.com/?b=1&a=1&a=0"), "http://example.com/?a=1&a=0&b=1")
+        self.assertNotEqual(canonicalize("http://example.com/?a=1&a=0"), canonicalize("http://example.com/?a=0&a=1"))
+
+
+class TestSpillingQueue(unittest.TestCase):
+    def test_fifo_across_spills(self):
+        queue = SpillingQueue(memory_items=4, chunk=3)
+        for i in range(10):
+            queue.push(i)
+        self.assertGreater(queue.spilled_total, 0)
+        popped = [queue.pop() for _ in range(5)]
+        for i in range(10, 20):  # Interleave pushes with refills from the file
+            queue.push(i)
+        self.assertEqual(len(queue), 15)
+        popped.extend(queue.pop() for _ in range(15))
+        self.assertEqual(popped, list(range(20)))
+        with self.assertRaises(IndexError):
+            queue.pop()
+        queue.push([1, "a"])  # The file was reset once drained
+        self.assertEqual(queue.pop(), [1, "a"])
+        queue.close()
+
+
+class TestURLFrontier(unittest.TestCase):
+    def test_dedup_keeps_the_linked_url(self):
+        frontier = URLFrontier(capacity=1000, memory_items=2)
+        self.assertTrue(frontier.add("http://example.com/list?a=1&a=0&utm_source=x", 1))
+        self.assertFalse(frontier.add("HTTP://EXAMPLE.com:80/list?a=1&a=0"))
+        self.assertTrue(frontier.add("http://example.com/list?a=0&a=1"))
+        self.assertTrue(frontier.mark_seen("http://example.com/out"))
+        self.assertIn("http://example.com/out#x", frontier)
+        self.assertFalse(frontier.add("http://example.com/out"))
+        self.assertEqual(frontier.pop(), ("http://example.com/list?a=1&a=0&utm_source=x", 1))
+        self.assertEqual(frontier.pop(), ("http://example.com/list?a=0&a=1", 0))
+        self.assertIsNone(frontier.pop())
+        frontier.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from plugins.waf_detection import WAFDetectionPlugin
+
+
+class _Response:
+    def __init__(self, status_code: int, text: str = "", headers: dict = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class TestWAFDetection(unittest.TestCase):
+    def setUp(self):
+        self.plugin = WAFDetectionPlugin()
+
+    def test_block_page_text(self):
+        page = "<html><body><h1>Attention Required! | Cloudflare</h1></body></html>"
+        self.assertEqual(self.plugin.detect_wafs(_Response(403, page)), ["Cloudflare"])
+        self.assertEqual(self.plugin.detect_wafs(_Response(200, page)), [])  # Not a blocking status
+
+    def test_markup_is_not_a_signature(self):
+        page = (
+            '<html><head><script src="https://cdnjs.cloudflare.com/ajax/libs/jquery/3.6.0/jquery.min.js"></script>'
+            '<script>var cdn = "akamai";</script><link href="https://sucuri.net/x.css" rel="stylesheet"></head>'
+            '<body><p>Forbidden</p></body></html>'
+        )
+        self.assertEqual(self.plugin.detect_wafs(_Response(403, page)), [])
+
+    def test_headers(self):
+        response = _Response(200, "<p>ok</p>", {"Server": "cloudflare", "X-F5-Request": "f5-1"})
+        self.assertEqual(sorted(self.plugin.detect_wafs(response)), ["Cloudflare", "F5 BIG-IP"])
+
+
+if __name__ == '__main__':
+    unittest.main()
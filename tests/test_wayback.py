@@ -0,0 +1,131 @@
+import tempfile
+import unittest
+import requests
+from utils.wayback import WaybackIndex
+
+
+def _capture(path: str, timestamp: str, digest: str) -> str:
+    return f"com,example){path} {timestamp} https://example.com{path} text/html 200 {digest} 1234"
+
+
+class _Response:
+    def __init__(self, lines: list):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, decode_unicode: bool = False):
+        return iter(self.lines)
+
+
+class _CDXSession:
+    """Serves CDX pages keyed by resume key (None for the first page)."""
+
+    def __init__(self, pages: dict):
+        self.pages = pages
+        self.requests = []
+        self.fail_on = ()  # Resume keys whose page request fails
+
+    def get(self, url, params=None, stream=False, timeout=None):
+        self.requests.append(dict(params))
+        key = params.get("resumeKey")
+        if key in self.fail_on:
+            raise requests.ConnectionError("Connection reset by peer")
+        lines, next_key = self.pages[key]
+        return _Response(lines + (["", next_key] if next_key else []))
+
+
+class TestWaybackIndex(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def open(self) -> WaybackIndex:
+        index = WaybackIndex("Example.com", self.directory)
+        self.addCleanup(index.close)
+        return index
+
+    def paths(self, index: WaybackIndex) -> list:
+        return [(capture["urlkey"].split(")")[1], capture["timestamp"]) for capture in index.iter_captures()]
+
+    def test_resume_after_an_interrupted_run(self):
+        session = _CDXSession({
+            None: ([
+                _capture("/", "20200101000000", "AAA"),
+                _capture("/", "20200201000000", "AAA"),  # Unchanged content
+                _capture("/", "20200301000000", "BBB"),
+                _capture("/about", "20200115000000", "CCC"),
+            ], "page-2"),
+            "page-2": ([
+                _capture("/about", "20210101000000", "CCC"),  # Same as the last capture on page 1
+                _capture("/blog", "20210101000000", "DDD"),
+            ], None),
+        })
+        session.fail_on = ("page-2",)
+        index = self.open()
+        with self.assertRaises(requests.ConnectionError):
+            index.update(session=session)
+        self.assertEqual(len(self.paths(index)), 3)  # Page 1 was committed
+        self.assertEqual(index._state("resume_key"), "page-2")
+        index.close()
+
+        session.fail_on = ()
+        session.requests.clear()
+        index = self.open()  # As after a restart
+        result = index.update(session=session)
+        self.assertEqual(result, {"Added": 1, "Skipped Duplicates": 1, "Complete": True})
+        self.assertEqual([request.get("resumeKey") for request in session.requests], ["page-2"])
+        self.assertEqual(self.paths(index), [
+            ("/", "20200101000000"), ("/about", "20200115000000"), ("/", "20200301000000"), ("/blog", "20210101000000"),
+        ])
+        self.assertIsNone(index._state("resume_key"))
+        self.assertIsNone(index._state("since"))
+
+    def test_later_runs_only_ask_for_newer_captures(self):
+        session = _CDXSession({None: ([
+            _capture("/", "20200101000000", "AAA"),
+            _capture("/", "20200301000000", "BBB"),
+        ], None)})
+        index = self.open()
+        self.assertEqual(index.update(session=session)["Added"], 2)
+        self.assertNotIn("from", session.requests[0])
+
+        session.pages = {None: ([
+            _capture("/", "20200301000000", "BBB"),  # "from" is inclusive: the newest stored capture again
+            _capture("/", "20200401000000", "BBB"),  # Unchanged since the stored capture
+            _capture("/", "20200501000000", "CCC"),
+        ], None)}
+        result = index.update(session=session)
+        self.assertEqual(session.requests[1]["from"], "20200301000000")
+        self.assertEqual(result, {"Added": 1, "Skipped Duplicates": 2, "Complete": True})
+        summary = index.summary()
+        self.assertEqual(summary["Total Captures"], 3)
+        self.assertEqual(summary["Last Capture"], "20200501000000")
+        self.assertEqual(
+            summary["Latest Snapshots"][0]["url"], "https://web.archive.org/web/20200501000000/https://example.com/"
+        )
+
+    def test_page_budget_keeps_the_cutoff(self):
+        session = _CDXSession({
+            None: ([_capture("/", "20220101000000", "EEE")], "page-2"),
+            "page-2": ([_capture("/x", "20220101000000", "FFF")], None),
+        })
+        index = self.open()
+        index._insert([("com,example)/old", "20190101000000", "https://example.com/old", "text/html", "200", "O", 1)])
+        self.assertFalse(index.update(max_pages=1, session=session)["Complete"])
+        self.assertEqual(index._state("since"), "20190101000000")
+        self.assertTrue(index.update(max_pages=1, session=session)["Complete"])
+        self.assertEqual([request.get("from") for request in session.requests], ["20190101000000"] * 2)
+        self.assertIsNone(index._state("since"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import datetime
+import tempfile
+import threading
+import time
+import unittest
+from utils import whois_service
+from utils.whois_service import WhoisService
+
+
+class _Backend:
+    """Stands in for the python-whois module."""
+
+    def __init__(self, delay: float = 0.0, error: str = None):
+        self.delay = delay
+        self.error = error
+        self.calls = []  # (domain, time.monotonic())
+        self._lock = threading.Lock()
+
+    def whois(self, domain: str) -> dict:
+        with self._lock:
+            self.calls.append((domain, time.monotonic()))
+        time.sleep(self.delay)
+        if self.error:
+            raise ConnectionError(self.error)
+        return {"domain_name": domain.upper(), "creation_date": datetime.datetime(2001, 2, 3, 4, 5, 6)}
+
+
+class TestWhoisService(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.addCleanup(setattr, whois_service, "whois", whois_service.whois)
+        self.backend = whois_service.whois = _Backend()
+
+    def test_disk_cache(self):
+        record = WhoisService(self.directory).lookup("https://www.example.com/page")
+        self.assertEqual(record["domain_name"], "EXAMPLE.COM")
+        self.assertTrue(record["creation_date"].startswith("2001-02-03"))
+        # A new service (a later run) reads the record back from disk
+        self.assertEqual(WhoisService(self.directory).lookup("example.com"), record)
+        self.assertEqual(len(self.backend.calls), 1)
+        # Expired records are queried again
+        WhoisService(self.directory, ttl=0).lookup("example.com")
+        self.assertEqual(len(self.backend.calls), 2)
+
+    def test_failures_are_remembered(self):
+        self.backend.error = "Connection reset"
+        service = WhoisService(self.directory)
+        with self.assertRaises(ConnectionError):
+            service.lookup("example.com")
+        with self.assertRaisesRegex(LookupError, "Connection reset"):
+            service.lookup("www.example.com")
+        self.assertEqual(len(self.backend.calls), 1)
+        self.assertEqual(service.lookup_many(["example.com"]), {"example.com": {"Error": "Connection reset"}})
+
+        # After FAILURE_TTL the registry is asked again
+        failed_at, message = service._failures["example.com"]
+        service._failures["example.com"] = (failed_at - whois_service.FAILURE_TTL, message)
+        self.backend.error = None
+        self.assertEqual(service.lookup("example.com")["domain_name"], "EXAMPLE.COM")
+        self.assertEqual(len(self.backend.calls), 2)
+
+    def test_concurrent_lookups_share_one_query(self):
+        self.backend.delay = 0.2
+        service = WhoisService(self.directory)
+        results = []
+        threads = [
+            threading.Thread(target=lambda t=target: results.append(service.lookup(t)))
+            for target in ("example.com", "www.example.com", "https://example.com/", "mail.example.com")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.backend.calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_registry_throttle(self):
+        intervals = dict(whois_service.REGISTRY_INTERVALS)
+        self.addCleanup(setattr, whois_service, "REGISTRY_INTERVALS", intervals)
+        whois_service.REGISTRY_INTERVALS = dict(intervals, com=0.3, org=0.3)
+        service = WhoisService(self.directory)
+        results = service.lookup_many(["a.com", "www.a.com", "b.com", "c.org"])
+        self.assertEqual(list(results), ["a.com", "b.com", "c.org"])
+        calls = dict(self.backend.calls)
+        self.assertEqual(len(self.backend.calls), 3)
+        self.assertGreaterEqual(abs(calls["b.com"] - calls["a.com"]), 0.29)  # Same registry: spaced out
+        self.assertLess(calls["c.org"], max(calls["a.com"], calls["b.com"]))  # Other registry: not kept waiting
+
+    def test_missing_backend(self):
+        whois_service.whois = None
+        with self.assertRaises(ImportError):
+            WhoisService(self.directory).lookup("example.com")
+
+
+if __name__ == '__main__':
+    unittest.main()
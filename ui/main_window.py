@@ -8,18 +8,30 @@ from PyQt6.QtWidgets import (
 
 
 from PyQt6.QtCore import Qt, pyqtSlot, QSize
-from utils.plugin_loader import load_plugins
+from utils.plugin_loader import load_plugins, needs_warm_up
 from plugins.base_plugin import BasePlugin
 import os
 import shutil
 import json
 from PyQt6.QtPrintSupport import QPrinter
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QPixmap, QColor
 from ui.terminals import TerminalWidget
 from PyQt6.QtCore import QThread, pyqtSignal
-from utils.json_utils import serialize_json, generate_session_id
+from utils.json_utils import serialize_json, dumps_fast, generate_session_id
+from utils.session_utils import (
+    SESSION_META_KEYS, TIMESTAMP_FORMAT, PARTIAL_SUFFIX, open_session_writer, find_latest_session,
+    is_result_fresh, validators_match, diff_results, list_sessions, load_session,
+    read_session_header, recover_session, session_file_path
+)
 from datetime import datetime
+import hashlib
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from utils.plugin_executor import get_plugin_pool, shutdown_plugin_pool
+from utils import http_cache
+from utils.crawler import crawl_and_analyze, merge_site_results
+from utils.target import resolve_target
 import requests
 
 
@@ -28,23 +40,63 @@ class AnalysisThread(QThread):
     result = pyqtSignal(str, dict)  # plugin_name, result
     finished = pyqtSignal()
 
-    def __init__(self, plugins, target, logger=None):
+    def __init__(self, plugins, target, logger=None, previous_session=None):
         super().__init__()
         self.plugins = plugins
-        self.target = target
+        self.target = resolve_target(target)  # Parsed once; every plugin gets the same Target
         self.logger = logger
+        self.previous_session = previous_session  # Set in incremental mode
+        self.validators = {}  # Root page ETag / Last-Modified / Content-Hash
+        self.run_times = {}  # plugin_name -> time its result was produced
+        self.changes = {}  # plugin_name -> diff against the previous session
         self._terminate = False  # Termination flag
 
     def run(self):
         if self.logger:
             self.logger.info(f"Analysis thread started for target: {self.target}")
+        http_cache.clear()  # Pages shared between plugins are fetched fresh for every run
+        self.target.refresh()  # So are the target's addresses; the Target itself is memoized
+        if not self.target.ips and self.logger:
+            self.logger.warning(f"Could not resolve {self.target.host}")
+        self.validators = self.fetch_validators(self.target)
+        content_unchanged = False
+        if self.previous_session is not None:
+            content_unchanged = validators_match(self.previous_session.get("Validators"), self.validators)
+            state = "unchanged" if content_unchanged else "changed"
+            self.progress.emit(f"Incremental mode: root page {state} since last session.", "cyan")
+        pending = []  # (plugin, future) dispatched to the CPU-bound worker pool
+        page_plugins = []  # Plugins fed by the shared site crawl
+        cpu_bound = [plugin for plugin in self.plugins if plugin.cpu_bound and not plugin.analyzes_pages]
+        if cpu_bound:
+            try:
+                get_plugin_pool().start(cpu_bound)  # Every worker preloads all of them
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(f"Could not start the worker pool: {str(e)}")
         for plugin in self.plugins:
             if self._terminate:
-                self.progress.emit("Analysis terminated by user.", "red")
-                if self.logger:
-                    self.logger.info("Analysis thread terminated by user.")
-                self.finished.emit()
+                self.stop(pending)
                 return
+            cached_result = self.reusable_result(plugin, content_unchanged)
+            if cached_result is not None:
+                self.result.emit(plugin.name, cached_result)
+                self.progress.emit(f"{plugin.name} unchanged, reusing previous result.", "yellow")
+                if self.logger:
+                    self.logger.info(f"Plugin '{plugin.name}' skipped in incremental mode.")
+                continue
+            if plugin.analyzes_pages:
+                page_plugins.append(plugin)
+                continue
+            if plugin.cpu_bound:
+                try:
+                    pending.append((plugin, get_plugin_pool().submit(plugin, self.target)))
+                    self.progress.emit(f"Running {plugin.name} in a worker process...", "cyan")
+                    if self.logger:
+                        self.logger.info(f"Dispatched plugin to worker process: {plugin.name}")
+                    continue
+                except Exception as e:
+                    if self.logger:
+                        self.logger.warning(f"Worker pool unavailable, running '{plugin.name}' in-process: {str(e)}")
             message = f"Running {plugin.name}..."
             self.progress.emit(message, "cyan")
             if self.logger:
@@ -52,30 +104,182 @@ class AnalysisThread(QThread):
             try:
                 result = plugin.run(self.target)
                 if self._terminate:
-                    self.progress.emit("Analysis terminated by user.", "red")
-                    if self.logger:
-                        self.logger.info("Analysis thread terminated by user.")
-                    self.finished.emit()
+                    self.stop(pending)
                     return
-                self.result.emit(plugin.name, result)
-                message = f"{plugin.name} completed."
-                self.progress.emit(message, "green")
-                if self.logger:
-                    self.logger.info(f"Plugin '{plugin.name}' completed successfully.")
+                self.complete(plugin, result)
             except Exception as e:
-                message = f"Error in {plugin.name}: {str(e)}"
-                self.progress.emit(message, "red")
-                if self.logger:
-                    self.logger.error(f"Error in plugin '{plugin.name}': {str(e)}")
+                self.fail(plugin, e)
+        if page_plugins:
+            self.run_page_plugins(page_plugins)
+            if self._terminate:
+                self.stop(pending)
+                return
+        for plugin, future in pending:
+            while not self._terminate:
+                try:
+                    result = future.result(timeout=0.2)
+                    self.complete(plugin, result)
+                except FutureTimeoutError:
+                    continue
+                except Exception as e:
+                    self.fail(plugin, e)
+                break
+            if self._terminate:
+                self.stop(pending)
+                return
         if not self._terminate:
             self.progress.emit("Analysis completed.", "green")
             if self.logger:
                 self.logger.info("Analysis thread finished.")
         self.finished.emit()
 
+    def run_page_plugins(self, plugins):
+        """Crawl the site once and feed every page to all page-level plugins."""
+        names = ", ".join(plugin.name for plugin in plugins)
+        self.progress.emit(f"Crawling site for {names}...", "cyan")
+        if self.logger:
+            self.logger.info(f"Crawling {self.target} for {len(plugins)} page-level plugins")
+
+        def report(pages, url):
+            if pages % 10 == 0:
+                self.progress.emit(f"Crawled {pages} pages...", "cyan")
+
+        try:
+            page_results, statistics = crawl_and_analyze(
+                self.target, plugins, progress=report, should_stop=lambda: self._terminate
+            )
+        except Exception as e:
+            for plugin in plugins:
+                self.fail(plugin, e)
+            return
+        if self._terminate:
+            return
+        if statistics["Near-Duplicate Pages Skipped"]:
+            self.progress.emit(
+                f"Skipped {statistics['Near-Duplicate Pages Skipped']} of {statistics['Pages Crawled']} pages "
+                f"as near-duplicates ({statistics['Skip Ratio']:.0%}).", "yellow"
+            )
+        for plugin in plugins:
+            try:
+                self.complete(plugin, merge_site_results(plugin, self.target, page_results[plugin.name], statistics))
+            except Exception as e:
+                self.fail(plugin, e)
+
     def terminate_analysis(self):
         self._terminate = True
 
+    def fetch_validators(self, target):
+        """Fetch the root page validators used to detect content changes between sessions."""
+        url = resolve_target(target).url
+        validators = {}
+        try:
+            response = requests.head(url, allow_redirects=True, timeout=10)
+            for header in ("ETag", "Last-Modified"):
+                if response.headers.get(header):
+                    validators[header] = response.headers[header]
+            if not validators:
+                # No validators from the server, fall back to hashing the body
+                response = requests.get(url, timeout=10)
+                validators["Content-Hash"] = hashlib.sha256(response.content).hexdigest()
+        except requests.RequestException as e:
+            if self.logger:
+                self.logger.warning(f"Failed to fetch validators for {url}: {str(e)}")
+        return validators
+
+    def complete(self, plugin, result):
+        self.run_times[plugin.name] = datetime.now().strftime(TIMESTAMP_FORMAT)
+        self.record_changes(plugin.name, result)
+        self.result.emit(plugin.name, result)
+        message = f"{plugin.name} completed."
+        self.progress.emit(message, "green")
+        if self.logger:
+            self.logger.info(f"Plugin '{plugin.name}' completed successfully.")
+
+    def fail(self, plugin, error):
+        message = f"Error in {plugin.name}: {str(error)}"
+        self.progress.emit(message, "red")
+        if self.logger:
+            self.logger.error(f"Error in plugin '{plugin.name}': {str(error)}")
+
+    def stop(self, pending):
+        running = [future for _, future in pending if not future.cancel() and not future.done()]
+        if running:
+            get_plugin_pool().shutdown(terminate=True)  # Workers still busy with this run
+        self.progress.emit("Analysis terminated by user.", "red")
+        if self.logger:
+            self.logger.info("Analysis thread terminated by user.")
+        self.finished.emit()
+
+    def reusable_result(self, plugin, content_unchanged):
+        """Return the previous session's result if it can be reused instead of re-running the plugin."""
+        if self.previous_session is None:
+            return None
+        previous = self.previous_session.get(plugin.name)
+        if not isinstance(previous, dict) or "Error" in previous:
+            return None
+        # Sessions saved before per-plugin run times were recorded fall back to the session timestamp
+        run_time = self.previous_session.get("RunTimes", {}).get(plugin.name, self.previous_session.get("Timestamp"))
+        if not is_result_fresh(run_time, plugin.cache_ttl):
+            return None
+        if plugin.content_dependent and not content_unchanged:
+            return None
+        self.run_times[plugin.name] = run_time
+        return previous
+
+    def record_changes(self, plugin_name, result):
+        """Diff a fresh result against the previous session and report changed keys."""
+        if self.previous_session is None:
+            return
+        diff = diff_results(self.previous_session.get(plugin_name, {}), result)
+        if not any(diff.values()):
+            return
+        self.changes[plugin_name] = diff
+        summary = ", ".join(f"{len(keys)} {kind.lower()}" for kind, keys in diff.items() if keys)
+        self.progress.emit(f"Changes in {plugin_name}: {summary}.", "yellow")
+
+
+class PluginLoaderThread(QThread):
+    plugins_loaded = pyqtSignal(list)  # plugins, emitted as soon as they are listed
+    status = pyqtSignal(int, str, str)  # row, status, detail
+    finished = pyqtSignal()
+
+    MAX_WORKERS = 4
+
+    def __init__(self, plugin_folder, logger=None):
+        super().__init__()
+        self.plugin_folder = plugin_folder
+        self.logger = logger
+
+    def run(self):
+        plugins = load_plugins(self.plugin_folder, logger=self.logger)
+        self.plugins_loaded.emit(plugins)
+        # Import and warm up plugins in parallel; the main thread stays responsive meanwhile.
+        # Plugins without a warm_up of their own stay lazy and are imported on their first run.
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            futures = {}
+            for row, plugin in enumerate(plugins):
+                if not needs_warm_up(plugin):
+                    self.status.emit(row, "Listed", "Imported on first run")
+                    continue
+                self.status.emit(row, "Loading", "")
+                futures[executor.submit(self.warm_up, plugin)] = row
+            for future in as_completed(futures):
+                row = futures[future]
+                try:
+                    seconds = future.result()
+                    self.status.emit(row, "Ready", f"Warmed up in {seconds:.2f}s")
+                except Exception as e:
+                    self.status.emit(row, "Failed", str(e))
+                    if self.logger:
+                        self.logger.error(f"Failed to warm up plugin '{plugins[row].name}': {str(e)}")
+        self.finished.emit()
+
+    @staticmethod
+    def warm_up(plugin):
+        start = time.perf_counter()
+        plugin.warm_up()
+        return time.perf_counter() - start
+
 
 class ColorSelectionDialog(QDialog):
     def __init__(self, parent=None):
@@ -133,6 +337,7 @@ class ColorSelectionDialog(QDialog):
 class MainWindow(QMainWindow):
     CONFIG_FILE = "config.json"
     CACHE_DIR = "cache"  # Directory to store cached sessions
+    TOOL_STATUS_COLORS = {"Listed": "gray", "Loading": "orange", "Ready": "green", "Failed": "red"}
 
     def __init__(self, logger=None):
         super().__init__()
@@ -145,6 +350,13 @@ class MainWindow(QMainWindow):
         # Load config
         self.api_keys = self.load_config()
 
+        # Streaming writer for the session of the running analysis
+        self.session_writer = None
+
+        # Plugins are listed and warmed up in the background after the window is shown
+        self.plugins = []
+        self.plugin_loader_thread = None
+
         # Ensure the cache directory exists
         if not os.path.exists(self.CACHE_DIR):
             os.makedirs(self.CACHE_DIR)
@@ -198,9 +410,11 @@ class MainWindow(QMainWindow):
         tools_label = QLabel("Available Tools")
         tools_label.setStyleSheet("font-weight: bold; font-size: 16px; border-bottom: 2px solid #000;")
         self.tools_table = QTableWidget()
-        # Modify columns: Name, Description, Enable, Requires API, Edit API Keys
-        self.tools_table.setColumnCount(5)
-        self.tools_table.setHorizontalHeaderLabels(["Name", "Description", "Enable", "Requires API", "Edit API Keys"])
+        # Modify columns: Name, Description, Enable, Requires API, Edit API Keys, Status
+        self.tools_table.setColumnCount(6)
+        self.tools_table.setHorizontalHeaderLabels(
+            ["Name", "Description", "Enable", "Requires API", "Edit API Keys", "Status"]
+        )
         self.tools_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.tools_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.tools_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
@@ -295,6 +509,32 @@ class MainWindow(QMainWindow):
             column = 0
             row += 1
 
+        # Incremental Mode Toggle Button
+        self.incremental_btn = QPushButton("Incremental Mode: OFF")
+        self.incremental_btn.setCheckable(True)
+        self.incremental_btn.setChecked(False)
+        self.incremental_btn.clicked.connect(self.toggle_incremental_mode)
+        self.incremental_btn.setFixedWidth(150)
+        self.incremental_btn.setToolTip("Re-run only plugins whose inputs changed or whose cached result expired.")
+        settings_layout.addWidget(self.incremental_btn, row, column)
+        column += 1
+        if column > 1:
+            column = 0
+            row += 1
+
+        # Compact Session Format Toggle Button
+        self.compact_sessions_btn = QPushButton("Compact Sessions: OFF")
+        self.compact_sessions_btn.setCheckable(True)
+        self.compact_sessions_btn.setChecked(False)
+        self.compact_sessions_btn.clicked.connect(self.toggle_compact_sessions)
+        self.compact_sessions_btn.setFixedWidth(150)
+        self.compact_sessions_btn.setToolTip("Save sessions in a compressed binary format instead of JSON Lines.")
+        settings_layout.addWidget(self.compact_sessions_btn, row, column)
+        column += 1
+        if column > 1:
+            column = 0
+            row += 1
+
         # Settings Container
         settings_container = QWidget()
         settings_container.setLayout(settings_layout)
@@ -434,6 +674,11 @@ class MainWindow(QMainWindow):
         # Initialize Analysis Thread
         self.analysis_thread = None
 
+    def closeEvent(self, event):
+        # Worker processes for CPU-bound plugins outlive analyses; stop them with the window
+        shutdown_plugin_pool()
+        super().closeEvent(event)
+
     def center_window(self):
         """Centers the window on the screen."""
         frame_gm = self.frameGeometry()
@@ -478,7 +723,21 @@ class MainWindow(QMainWindow):
                 self.logger.error(f"Failed to save configuration: {str(e)}")
 
     def load_plugins_into_table(self):
-        self.plugins = load_plugins('plugins', logger=self.logger)
+        """Start listing and warming up plugins in the background; the table fills in as they arrive."""
+        if self.plugin_loader_thread and self.plugin_loader_thread.isRunning():
+            return False
+        self.plugins = []
+        self.tools_table.setRowCount(0)
+        self.plugin_loader_thread = PluginLoaderThread('plugins', logger=self.logger)
+        self.plugin_loader_thread.plugins_loaded.connect(self.populate_tools_table)
+        self.plugin_loader_thread.status.connect(self.update_tool_status)
+        self.plugin_loader_thread.finished.connect(self.plugins_warmed_up)
+        self.plugin_loader_thread.start()
+        return True
+
+    @pyqtSlot(list)
+    def populate_tools_table(self, plugins):
+        self.plugins = plugins
         self.tools_table.setRowCount(len(self.plugins))
         for row, plugin in enumerate(self.plugins):
             name_item = QTableWidgetItem(plugin.name)
@@ -514,6 +773,36 @@ class MainWindow(QMainWindow):
             self.tools_table.setCellWidget(row, 2, toggle_btn)
             self.tools_table.setItem(row, 3, requires_api_item)
             self.tools_table.setCellWidget(row, 4, edit_api_btn)
+            self.tools_table.setItem(row, 5, self.status_item("Listed"))
+        self.filter_tools()
+        self.terminal1.append_text(f"Listed {len(self.plugins)} tools, warming up...\n", color="yellow")
+
+    def status_item(self, status, detail=""):
+        item = QTableWidgetItem(status)
+        item.setFlags(Qt.ItemFlag.ItemIsEnabled)
+        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        item.setForeground(QColor(self.TOOL_STATUS_COLORS.get(status, "black")))
+        if detail:
+            item.setToolTip(detail)
+        return item
+
+    @pyqtSlot(int, str, str)
+    def update_tool_status(self, row, status, detail):
+        if row < self.tools_table.rowCount():
+            self.tools_table.setItem(row, 5, self.status_item(status, detail))
+
+    @pyqtSlot()
+    def plugins_warmed_up(self):
+        failed = sum(
+            1 for row in range(self.tools_table.rowCount())
+            if self.tools_table.item(row, 5) and self.tools_table.item(row, 5).text() == "Failed"
+        )
+        message = f"All {len(self.plugins)} tools are ready.\n"
+        if failed:
+            message = f"{len(self.plugins) - failed} tools ready, {failed} failed to load (see Status tooltip).\n"
+        self.terminal1.append_text(message, color="red" if failed else "green")
+        if self.logger:
+            self.logger.info(message.strip())
 
     def toggle_tool(self):
         button = self.sender()
@@ -720,6 +1009,28 @@ class MainWindow(QMainWindow):
             if self.logger:
                 self.logger.info("Typing effect disabled.")
 
+    def toggle_incremental_mode(self):
+        """Toggle incremental re-scans against the latest cached session."""
+        if self.incremental_btn.isChecked():
+            self.incremental_btn.setText("Incremental Mode: ON")
+            if self.logger:
+                self.logger.info("Incremental mode enabled.")
+        else:
+            self.incremental_btn.setText("Incremental Mode: OFF")
+            if self.logger:
+                self.logger.info("Incremental mode disabled.")
+
+    def toggle_compact_sessions(self):
+        """Toggle the compressed binary session format for new sessions."""
+        if self.compact_sessions_btn.isChecked():
+            self.compact_sessions_btn.setText("Compact Sessions: ON")
+            if self.logger:
+                self.logger.info("Compact session format enabled.")
+        else:
+            self.compact_sessions_btn.setText("Compact Sessions: OFF")
+            if self.logger:
+                self.logger.info("Compact session format disabled.")
+
     def validate_color_contrast(self, bg_color, text_color):
         """Simple contrast validation based on luminance."""
         def hex_to_rgb(hex_color):
@@ -797,8 +1108,8 @@ class MainWindow(QMainWindow):
     def export_to_json(self, path):
         data = self.terminal2.get_all_data()
         try:
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=4, default=serialize_json)
+            with open(path, 'wb') as f:
+                f.write(dumps_fast(data, indent=True))
             self.terminal1.append_text(f"Data exported to {path}\n", color="green")
             if self.logger:
                 self.logger.info(f"Data exported to {path}")
@@ -887,8 +1198,9 @@ class MainWindow(QMainWindow):
                 os.makedirs(cache_dir)
                 if self.logger:
                     self.logger.info("Cleared cache directory.")
-            self.tools_table.setRowCount(0)
-            self.load_plugins_into_table()
+            if not self.load_plugins_into_table():
+                self.terminal1.append_text("Tools are still loading, try again shortly.\n", color="yellow")
+                return
             self.terminal1.append_text("Tools refreshed.\n", color="green")
             if self.logger:
                 self.logger.info("Tools refreshed.")
@@ -925,8 +1237,31 @@ class MainWindow(QMainWindow):
         if self.logger:
             self.logger.info("Run button disabled to prevent multiple analysis runs.")
 
+        previous_session = None
+        if self.incremental_btn.isChecked():
+            previous_session = find_latest_session(self.CACHE_DIR, target)
+            if previous_session is None:
+                self.terminal1.append_text("No cached session for this target, running a full analysis.\n", color="yellow")
+            else:
+                self.terminal1.append_text(
+                    f"Incremental analysis against session from {previous_session.get('Timestamp', 'N/A')}.\n",
+                    color="green"
+                )
+
+        # Open the session so each plugin result is persisted as soon as it arrives
+        try:
+            self.session_writer = open_session_writer(
+                self.CACHE_DIR, f"session_{generate_session_id()}", target, datetime.now().strftime(TIMESTAMP_FORMAT),
+                compact=self.compact_sessions_btn.isChecked()
+            )
+        except Exception as e:
+            self.session_writer = None
+            self.terminal1.append_text(f"Failed to open session cache: {str(e)}\n", color="red")
+            if self.logger:
+                self.logger.error(f"Failed to open session cache: {str(e)}")
+
         # Start analysis thread
-        self.analysis_thread = AnalysisThread(enabled_plugins, target, logger=self.logger)
+        self.analysis_thread = AnalysisThread(enabled_plugins, target, logger=self.logger, previous_session=previous_session)
         self.analysis_thread.progress.connect(self.append_text_with_color)
         self.analysis_thread.result.connect(self.handle_plugin_result)
         self.analysis_thread.finished.connect(self.analysis_finished)
@@ -939,6 +1274,13 @@ class MainWindow(QMainWindow):
     @pyqtSlot(str, dict)
     def handle_plugin_result(self, plugin_name, result):
         self.terminal2.append_json(plugin_name, result)
+        if self.session_writer is not None:
+            try:
+                run_time = self.analysis_thread.run_times.get(plugin_name) if self.analysis_thread else None
+                self.session_writer.write_result(plugin_name, result, run_time=run_time)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Failed to persist result of {plugin_name}: {str(e)}")
         # Scan the result for image URLs
         image_urls = self.extract_image_urls(result)
         for url in image_urls:
@@ -968,110 +1310,103 @@ class MainWindow(QMainWindow):
         # Save the session to cache
         self.save_session_to_cache()
 
-    def save_session_to_cache(self):
-        """Save the current analysis session to the cache."""
-        session_id = generate_session_id()
-        session_data = self.terminal2.get_all_data()
-        session_data["Target"] = self.target_input.text().strip()
-        session_data["Timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        session_path = os.path.join(self.CACHE_DIR, f"session_{session_id}.json")
-        try:
-            with open(session_path, 'w') as f:
-                json.dump(session_data, f, default=serialize_json, indent=4)
-            self.terminal1.append_text(f"Session saved to cache with ID: {session_id}\n", color="green")
-            if self.logger:
-                self.logger.info(f"Session saved to cache with ID: {session_id}")
-            # Reload cached sessions table
-            self.load_cached_sessions()
-        except Exception as e:
-            self.terminal1.append_text(f"Failed to save session to cache: {str(e)}\n", color="red")
-            if self.logger:
-                self.logger.error(f"Failed to save session to cache: {str(e)}")
-
     def load_cached_sessions(self):
         """Load all cached sessions into the table."""
         self.cached_table.setRowCount(0)  # Clear existing rows
-        sessions = sorted(os.listdir(self.CACHE_DIR), reverse=True)
-        for session_file in sessions:
-            if session_file.endswith(".json"):
-                session_path = os.path.join(self.CACHE_DIR, session_file)
-                try:
-                    with open(session_path, 'r') as f:
-                        session_data = json.load(f)
-                except json.JSONDecodeError as e:
-                    if hasattr(self, 'terminal1'):
-                        self.terminal1.append_text(f"Failed to read session {session_file}: {str(e)}\n", color="red")
-                    if self.logger:
-                        self.logger.error(f"Failed to read session {session_file}: {str(e)}")
-                    # Optionally delete the malformed file:
-                    os.remove(session_path)
-                    continue
-                except Exception as e:
-                    if hasattr(self, 'terminal1'):
-                        self.terminal1.append_text(f"Failed to read session {session_file}: {str(e)}\n", color="red")
-                    else:
-                        print(f"Failed to read session {session_file}: {str(e)}")
-                    if self.logger:
-                        self.logger.error(f"Failed to read session {session_file}: {str(e)}")
-                    continue
+        self.recover_interrupted_sessions()
+        for session_id, session_path in list_sessions(self.CACHE_DIR):
+            session_file = os.path.basename(session_path)
+            try:
+                session_data = read_session_header(session_path)
+            except json.JSONDecodeError as e:
+                if hasattr(self, 'terminal1'):
+                    self.terminal1.append_text(f"Failed to read session {session_file}: {str(e)}\n", color="red")
+                if self.logger:
+                    self.logger.error(f"Failed to read session {session_file}: {str(e)}")
+                # Optionally delete the malformed file:
+                os.remove(session_path)
+                continue
+            except Exception as e:
+                if hasattr(self, 'terminal1'):
+                    self.terminal1.append_text(f"Failed to read session {session_file}: {str(e)}\n", color="red")
+                else:
+                    print(f"Failed to read session {session_file}: {str(e)}")
+                if self.logger:
+                    self.logger.error(f"Failed to read session {session_file}: {str(e)}")
+                continue
 
-                session_id = session_file.replace(".json", "")
-                target = session_data.get("Target", "N/A")
-                timestamp = session_data.get("Timestamp", "N/A")
+            target = session_data.get("Target", "N/A")
+            timestamp = session_data.get("Timestamp", "N/A")
 
-                row_position = self.cached_table.rowCount()
-                self.cached_table.insertRow(row_position)
+            row_position = self.cached_table.rowCount()
+            self.cached_table.insertRow(row_position)
 
-                # Session ID
-                session_id_item = QTableWidgetItem(session_id)
-                self.cached_table.setItem(row_position, 0, session_id_item)
+            # Session ID
+            session_id_item = QTableWidgetItem(session_id)
+            self.cached_table.setItem(row_position, 0, session_id_item)
 
-                # Target
-                target_item = QTableWidgetItem(target)
-                self.cached_table.setItem(row_position, 1, target_item)
+            # Target
+            target_item = QTableWidgetItem(target)
+            self.cached_table.setItem(row_position, 1, target_item)
 
-                # Timestamp
-                timestamp_item = QTableWidgetItem(timestamp)
-                self.cached_table.setItem(row_position, 2, timestamp_item)
+            # Timestamp
+            timestamp_item = QTableWidgetItem(timestamp)
+            self.cached_table.setItem(row_position, 2, timestamp_item)
 
-                # Actions (Export, Delete, Preview)
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout()
-                actions_layout.setContentsMargins(0, 0, 0, 0)
+            # Actions (Export, Delete, Preview)
+            actions_widget = QWidget()
+            actions_layout = QHBoxLayout()
+            actions_layout.setContentsMargins(0, 0, 0, 0)
 
-                export_btn = QPushButton("Export")
-                export_btn.setFixedWidth(60)
-                export_btn.clicked.connect(lambda _, s=session_id: self.export_cached_session(s))
+            export_btn = QPushButton("Export")
+            export_btn.setFixedWidth(60)
+            export_btn.clicked.connect(lambda _, s=session_id: self.export_cached_session(s))
 
-                delete_btn = QPushButton("Delete")
-                delete_btn.setFixedWidth(60)
-                delete_btn.clicked.connect(lambda _, s=session_id: self.delete_cached_session(s))
+            delete_btn = QPushButton("Delete")
+            delete_btn.setFixedWidth(60)
+            delete_btn.clicked.connect(lambda _, s=session_id: self.delete_cached_session(s))
 
-                preview_btn = QPushButton("Preview")
-                preview_btn.setFixedWidth(60)
-                preview_btn.clicked.connect(lambda _, s=session_id: self.preview_cached_session(s))
+            preview_btn = QPushButton("Preview")
+            preview_btn.setFixedWidth(60)
+            preview_btn.clicked.connect(lambda _, s=session_id: self.preview_cached_session(s))
 
-                actions_layout.addWidget(export_btn)
-                actions_layout.addWidget(delete_btn)
-                actions_layout.addWidget(preview_btn)
-                actions_widget.setLayout(actions_layout)
+            actions_layout.addWidget(export_btn)
+            actions_layout.addWidget(delete_btn)
+            actions_layout.addWidget(preview_btn)
+            actions_widget.setLayout(actions_layout)
 
-                self.cached_table.setCellWidget(row_position, 3, actions_widget)
+            self.cached_table.setCellWidget(row_position, 3, actions_widget)
         if self.logger:
             self.logger.info("Cached sessions loaded into the table.")
 
+    def recover_interrupted_sessions(self):
+        """Finalize partial sessions left behind by a run that did not complete."""
+        active_path = self.session_writer.partial_path if self.session_writer and not self.session_writer.closed else None
+        for session_file in os.listdir(self.CACHE_DIR):
+            if not session_file.endswith(PARTIAL_SUFFIX):
+                continue
+            partial_path = os.path.join(self.CACHE_DIR, session_file)
+            if partial_path == active_path:
+                continue
+            try:
+                recover_session(partial_path)
+                if self.logger:
+                    self.logger.info(f"Recovered interrupted session {session_file}")
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Failed to recover session {session_file}: {str(e)}")
+
     def export_cached_session(self, session_id):
         """Export a cached session."""
-        session_file = os.path.join(self.CACHE_DIR, f"{session_id}.json")
-        if not os.path.exists(session_file):
+        session_file = session_file_path(self.CACHE_DIR, session_id)
+        if session_file is None:
             self.terminal1.append_text(f"Session {session_id} does not exist.\n", color="red")
             if self.logger:
                 self.logger.warning(f"Export attempted for non-existent session: {session_id}")
             return
 
         try:
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
+            session_data = load_session(session_file)
         except Exception as e:
             self.terminal1.append_text(f"Failed to read session {session_id}: {str(e)}\n", color="red")
             if self.logger:
@@ -1100,8 +1435,8 @@ class MainWindow(QMainWindow):
                         self.terminal1.append_text("Export cancelled: No background color selected.\n", color="red")
                         return
                 if file_path.endswith(".json"):
-                    with open(file_path, 'w') as f:
-                        json.dump(session_data, f, indent=4, default=serialize_json)
+                    with open(file_path, 'wb') as f:
+                        f.write(dumps_fast(session_data, indent=True))
                     self.terminal1.append_text(f"Session {session_id} exported to {file_path}\n", color="green")
                     if self.logger:
                         self.logger.info(f"Session {session_id} exported to {file_path}")
@@ -1109,7 +1444,7 @@ class MainWindow(QMainWindow):
                     # Generate HTML content
                     html_content = ""
                     for plugin, data in session_data.items():
-                        if plugin in ["Target", "Timestamp"]:
+                        if plugin in SESSION_META_KEYS:
                             continue
                         html_content += f"<h3 style='color:#4CAF50;'>{plugin} Results</h3><table border='1' cellspacing='0' cellpadding='5' style='color: white;'>"
                         html_content += "<tr style='background-color:#333;'><th>Key</th><th>Value</th></tr>"
@@ -1145,7 +1480,7 @@ class MainWindow(QMainWindow):
                     # Generate HTML content
                     html_content = ""
                     for plugin, data in session_data.items():
-                        if plugin in ["Target", "Timestamp"]:
+                        if plugin in SESSION_META_KEYS:
                             continue
                         html_content += f"<h3 style='color:#4CAF50;'>{plugin} Results</h3><table border='1' cellspacing='0' cellpadding='5' style='color: white;'>"
                         html_content += "<tr style='background-color:#333;'><th>Key</th><th>Value</th></tr>"
@@ -1195,8 +1530,8 @@ class MainWindow(QMainWindow):
 
     def delete_cached_session(self, session_id):
         """Delete a cached session."""
-        session_file = os.path.join(self.CACHE_DIR, f"{session_id}.json")
-        if not os.path.exists(session_file):
+        session_file = session_file_path(self.CACHE_DIR, session_id)
+        if session_file is None:
             self.terminal1.append_text(f"Session {session_id} does not exist.\n", color="red")
             if self.logger:
                 self.logger.warning(f"Delete attempted for non-existent session: {session_id}")
@@ -1215,16 +1550,15 @@ class MainWindow(QMainWindow):
 
     def preview_cached_session(self, session_id):
         """Preview a cached session by rendering it in the terminal."""
-        session_file = os.path.join(self.CACHE_DIR, f"{session_id}.json")
-        if not os.path.exists(session_file):
+        session_file = session_file_path(self.CACHE_DIR, session_id)
+        if session_file is None:
             self.terminal1.append_text(f"Session {session_id} does not exist.\n", color="red")
             if self.logger:
                 self.logger.warning(f"Preview attempted for non-existent session: {session_id}")
             return
 
         try:
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
+            session_data = load_session(session_file)
         except Exception as e:
             self.terminal1.append_text(f"Failed to read session {session_id}: {str(e)}\n", color="red")
             if self.logger:
@@ -1239,22 +1573,23 @@ class MainWindow(QMainWindow):
 
         # Render the cached data into the terminal
         for plugin, data in session_data.items():
-            if plugin in ["Target", "Timestamp"]:
+            if plugin in SESSION_META_KEYS:
                 continue
             self.terminal2.append_json(plugin, data)
 
     def save_session_to_cache(self):
-        """Save the current analysis session to the cache."""
-        session_id = generate_session_id()
-        session_data = self.terminal2.get_all_data()
-        session_data["Target"] = self.target_input.text().strip()
-        session_data["Timestamp"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if self.logger:
-            self.logger.debug(f"Session Data: {session_data}")
-        session_path = os.path.join(self.CACHE_DIR, f"session_{session_id}.json")
+        """Finalize the streamed session of the analysis that just finished."""
+        if self.session_writer is None or self.session_writer.closed:
+            return
+        meta = {}
+        if self.analysis_thread is not None:
+            meta["Validators"] = self.analysis_thread.validators
+            meta["RunTimes"] = self.analysis_thread.run_times
+            if self.analysis_thread.changes:
+                meta["Changes"] = self.analysis_thread.changes
+        session_id = self.session_writer.session_id
         try:
-            with open(session_path, 'w') as f:
-                json.dump(session_data, f, default=serialize_json, indent=4)
+            self.session_writer.finalize(meta)
             self.terminal1.append_text(f"Session saved to cache with ID: {session_id}\n", color="green")
             if self.logger:
                 self.logger.info(f"Session saved to cache with ID: {session_id}")
@@ -0,0 +1,58 @@
+# utils/bloom.py
+"""Fixed-size Bloom filter for "have we seen this before" checks over millions of items."""
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Set membership in a fixed amount of memory, with a bounded false-positive rate.
+
+    Sized for capacity items at error_rate; past capacity it keeps working but the
+    false-positive rate grows. There are no false negatives.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-4):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _hashes(self, item):
+        if isinstance(item, str):
+            item = item.encode('utf-8')
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        # Double hashing: k positions h1 + i*h2 from the two 64-bit halves
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def __contains__(self, item) -> bool:
+        bits, size = self._bits, self.size
+        h1, h2 = self._hashes(item)
+        for i in range(self.hash_count):
+            p = (h1 + i * h2) % size
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, item) -> bool:
+        """Add item; return True if it was (probably) not present before."""
+        bits, size = self._bits, self.size
+        h1, h2 = self._hashes(item)
+        new = False
+        for i in range(self.hash_count):
+            p = (h1 + i * h2) % size
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                bits[p >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
@@ -0,0 +1,195 @@
+# utils/compact_session.py
+import json
+import os
+import struct
+import zlib
+from typing import Any, Iterator, Optional
+from utils.json_utils import json_serial
+
+# Optional faster codecs; compact JSON and zlib are always available as fallbacks
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# File layout:
+#   MAGIC | encoding id (1 byte) | compression id (1 byte)
+#   frames: length (4 bytes, big endian) | compressed record
+#   footer: offset of the index frame (8 bytes, big endian) | FOOTER_MAGIC
+# Every record is compressed on its own so a single plugin result can be read
+# by seeking to its frame without decompressing the rest of the session.
+COMPACT_EXTENSION = ".dwas"
+MAGIC = b"DWAS1"
+FOOTER_MAGIC = b"DWAX"
+FRAME_HEADER = struct.Struct(">I")
+FOOTER = struct.Struct(">Q4s")
+
+ENCODING_JSON = 0
+ENCODING_MSGPACK = 1
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+
+def available_codecs() -> tuple:
+    """Return the (encoding, compression) ids used for newly written sessions."""
+    encoding = ENCODING_MSGPACK if msgpack is not None else ENCODING_JSON
+    compression = COMPRESSION_ZSTD if zstandard is not None else COMPRESSION_ZLIB
+    return encoding, compression
+
+
+def encode_record(record: Any, encoding: int, compression: int) -> bytes:
+    if encoding == ENCODING_MSGPACK:
+        payload = msgpack.packb(record, default=json_serial, use_bin_type=True)
+    else:
+        payload = json.dumps(record, default=json_serial, separators=(',', ':')).encode('utf-8')
+    if compression == COMPRESSION_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return zlib.compress(payload, 6)
+
+
+def decode_record(data: bytes, encoding: int, compression: int) -> Any:
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("Session is zstd-compressed but the 'zstandard' package is not installed.")
+        payload = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        payload = zlib.decompress(data)
+    if encoding == ENCODING_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Session is msgpack-encoded but the 'msgpack' package is not installed.")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return json.loads(payload)
+
+
+class CompactSessionWriter:
+    """Streaming session writer producing length-framed, per-record compressed files.
+
+    Mirrors SessionWriter: records are flushed as they arrive and finalize() writes
+    the index and atomically renames the partial file.
+    """
+
+    def __init__(self, cache_dir: str, session_id: str, target: str, timestamp: str, partial_suffix: str = ".part"):
+        self.session_id = session_id
+        self.path = os.path.join(cache_dir, f"{session_id}{COMPACT_EXTENSION}")
+        self.partial_path = self.path + partial_suffix
+        self.offsets = {}
+        self.encoding, self.compression = available_codecs()
+        self._file = open(self.partial_path, 'wb')
+        self._file.write(MAGIC + bytes([self.encoding, self.compression]))
+        self._append({"Type": "Header", "Target": target, "Timestamp": timestamp})
+
+    def _append(self, record: dict) -> int:
+        offset = self._file.tell()
+        data = encode_record(record, self.encoding, self.compression)
+        self._file.write(FRAME_HEADER.pack(len(data)) + data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return offset
+
+    def write_result(self, plugin_name: str, result: Any, run_time: Optional[str] = None):
+        """Persist a single plugin result."""
+        record = {"Type": "Result", "Plugin": plugin_name, "Result": result}
+        if run_time:
+            record["RunTime"] = run_time
+        self.offsets[plugin_name] = self._append(record)
+
+    def finalize(self, meta: Optional[dict] = None) -> str:
+        """Write the meta and index frames plus the footer, then move the session into place."""
+        meta_offset = self._append(dict(meta or {}, Type="Meta"))
+        index_offset = self._append({"Type": "Index", "Offsets": self.offsets, "Meta": meta_offset})
+        self._file.write(FOOTER.pack(index_offset, FOOTER_MAGIC))
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+        return self.path
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+
+def _read_preamble(f) -> tuple:
+    preamble = f.read(len(MAGIC) + 2)
+    if len(preamble) < len(MAGIC) + 2 or not preamble.startswith(MAGIC):
+        raise ValueError("Not a compact session file.")
+    return preamble[-2], preamble[-1]
+
+
+def _read_frame(f, encoding: int, compression: int) -> Optional[Any]:
+    header = f.read(FRAME_HEADER.size)
+    if len(header) < FRAME_HEADER.size:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    data = f.read(length)
+    if len(data) < length:
+        return None  # Truncated by an interrupted run
+    return decode_record(data, encoding, compression)
+
+
+def iter_records(session_path: str) -> Iterator[dict]:
+    """Yield every record of a compact session in write order, up to the index."""
+    with open(session_path, 'rb') as f:
+        encoding, compression = _read_preamble(f)
+        while True:
+            try:
+                record = _read_frame(f, encoding, compression)
+            except Exception:
+                return  # Truncated or corrupt tail of an interrupted run
+            if not isinstance(record, dict) or record.get("Type") == "Index":
+                return
+            yield record
+
+
+def read_index(session_path: str) -> Optional[dict]:
+    """Read the index frame through the footer, without touching the other frames."""
+    with open(session_path, 'rb') as f:
+        encoding, compression = _read_preamble(f)
+        f.seek(0, os.SEEK_END)
+        if f.tell() < FOOTER.size:
+            return None
+        f.seek(-FOOTER.size, os.SEEK_END)
+        index_offset, footer_magic = FOOTER.unpack(f.read(FOOTER.size))
+        if footer_magic != FOOTER_MAGIC:
+            return None
+        f.seek(index_offset)
+        return _read_frame(f, encoding, compression)
+
+
+def read_record_at(session_path: str, offset: int) -> Optional[dict]:
+    with open(session_path, 'rb') as f:
+        encoding, compression = _read_preamble(f)
+        f.seek(offset)
+        return _read_frame(f, encoding, compression)
+
+
+def recover(partial_path: str, final_path: str) -> str:
+    """Finalize a compact session left behind by an interrupted run."""
+    offsets = {}
+    with open(partial_path, 'rb') as f:
+        encoding, compression = _read_preamble(f)
+        valid_end = f.tell()
+        while True:
+            offset = f.tell()
+            try:
+                record = _read_frame(f, encoding, compression)
+            except Exception:
+                break
+            if not isinstance(record, dict) or record.get("Type") == "Index":
+                break
+            valid_end = f.tell()
+            if record.get("Type") == "Result":
+                offsets[record["Plugin"]] = offset
+    with open(partial_path, 'r+b') as f:
+        f.truncate(valid_end)
+        f.seek(valid_end)
+        data = encode_record({"Type": "Index", "Offsets": offsets}, encoding, compression)
+        f.write(FRAME_HEADER.pack(len(data)) + data)
+        f.write(FOOTER.pack(valid_end, FOOTER_MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial_path, final_path)
+    return final_path
@@ -0,0 +1,232 @@
+# utils/content_discovery.py
+"""Concurrent content discovery with soft-404 filtering.
+
+ContentDiscovery probes wordlist paths under a base URL on a bounded worker pool,
+limited per host (see utils/link_checker.py), and yields findings as they arrive.
+Many sites answer unknown paths with 200, a redirect or a generic error page
+instead of 404. Before probing, the site's response to random paths is
+fingerprinted once per kind of path (directory or file extension): status,
+redirect target, body length and a hash of the body with the requested path
+removed. A probe whose response matches the baseline of its kind is discarded
+without a further request.
+"""
+import hashlib
+import os
+import posixpath
+import re
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from utils.bloom import BloomFilter
+from utils.http_cache import USER_AGENT
+from utils.link_checker import HostLimiter, MAX_RETRIES, THROTTLED, _retry_after
+
+WORDLISTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "wordlists"
+)
+PATHS_WORDLIST = os.path.join(WORDLISTS_DIR, "content_discovery.txt")
+EXTENSIONS_WORDLIST = os.path.join(WORDLISTS_DIR, "backup_extensions.txt")
+MAX_WORKERS = 16
+PER_HOST = 8
+TIMEOUT = 10
+MAX_BODY_BYTES = 64 * 1024  # Enough to fingerprint an error page
+LENGTH_TOLERANCE = 0.05  # Soft-404 pages that echo the path vary slightly in length
+NOT_FOUND = {404, 410}
+INTERESTING = {200, 204, 206, 301, 302, 307, 308, 401, 403, 405, 500}
+
+_NUMBERS = re.compile(rb"\d+")
+
+
+def load_wordlist(path: str):
+    """Yield the non-empty, non-comment lines of a wordlist file without loading it whole."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def expand(words, extensions: list):
+    """Yield probe paths: directories ("x/") as-is, other words bare and with each extension."""
+    for word in words:
+        word = word.lstrip("/")
+        yield word
+        if not word.endswith("/"):
+            for extension in extensions:
+                yield word + extension
+
+
+def backup_variants(path: str, extensions: list):
+    """Backup names of an existing file: /a/index.php -> /a/index.php.bak, /a/index.bak, ..."""
+    directory, name = posixpath.split(path)
+    if not name:
+        return
+    stem = name.split(".", 1)[0]
+    for extension in extensions:
+        yield posixpath.join(directory, name + extension)
+        if stem != name:
+            yield posixpath.join(directory, stem + extension)
+
+
+def path_kind(path: str) -> str:
+    """Baseline key: "/" for directories, "~" for editor backups, else the last extension ("" if none)."""
+    if path.endswith(("/", "~")):
+        return path[-1]
+    return posixpath.splitext(path)[1].lower()
+
+
+class ResponseFingerprint:
+    def __init__(self, status: int, location: str, length: int, digest: str):
+        self.status = status
+        self.location = location
+        self.length = length
+        self.digest = digest
+
+    @classmethod
+    def of(cls, response, body: bytes, path: str) -> "ResponseFingerprint":
+        # Error pages often echo the requested path or a request id; ignore both
+        body = body.replace(path.encode("utf-8", "replace"), b"")
+        body = _NUMBERS.sub(b"0", body)
+        location = response.headers.get("Location", "")
+        if location:
+            location = urlsplit(urljoin(response.url, location)).path.replace(path, "")
+        return cls(response.status_code, location, len(body), hashlib.blake2b(body, digest_size=16).hexdigest())
+
+    def matches(self, other: "ResponseFingerprint") -> bool:
+        if self.status != other.status or self.location != other.location:
+            return False
+        if self.digest == other.digest:
+            return True
+        longest = max(self.length, other.length, 1)
+        return abs(self.length - other.length) / longest <= LENGTH_TOLERANCE
+
+
+class ContentDiscovery:
+    def __init__(self, base_url: str, max_workers: int = MAX_WORKERS, per_host: int = PER_HOST,
+                 timeout: int = TIMEOUT):
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.limiter = HostLimiter(per_host)
+        self.baselines = {}  # path kind -> ResponseFingerprint of a random missing path, or None
+        self.seen = BloomFilter(capacity=1_000_000, error_rate=1e-6)  # Each path is probed once
+        self._baseline_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.probed = 0
+        self.soft_404 = 0
+        self.errors = 0
+
+    def _get(self, path: str):
+        """(response, first MAX_BODY_BYTES of the body) without following redirects.
+
+        Throttled responses (429/503) are retried after backing off, as LinkChecker.check does.
+        """
+        with self.limiter.slots:
+            for attempt in range(MAX_RETRIES + 1):
+                self.limiter.wait_turn()
+                with self.session.get(urljoin(self.base_url, path), timeout=self.timeout,
+                                      allow_redirects=False, stream=True) as response:
+                    body = response.raw.read(MAX_BODY_BYTES, decode_content=True) or b""
+                if response.status_code in THROTTLED and attempt < MAX_RETRIES:
+                    self.limiter.throttled(_retry_after(response))
+                    continue
+                if response.status_code not in THROTTLED:
+                    self.limiter.succeeded()
+                return response, body
+
+    def baseline(self, kind: str):
+        """Fingerprint of a random path of this kind; None if the site answers such paths with 404."""
+        with self._baseline_lock:
+            if kind in self.baselines:
+                return self.baselines[kind]
+            path = secrets.token_hex(12) + ("/" if kind == "/" else kind)
+            fingerprint = None
+            try:
+                response, body = self._get(path)
+                if response.status_code not in NOT_FOUND:
+                    fingerprint = ResponseFingerprint.of(response, body, path)
+            except requests.RequestException:
+                pass
+            self.baselines[kind] = fingerprint
+            return fingerprint
+
+    def probe(self, path: str) -> dict:
+        """Finding for path, or None if it is missing or a soft 404."""
+        response, body = self._get(path)
+        self._count("probed")
+        if response.status_code in THROTTLED:
+            self._count("errors")  # Still throttled after every retry: unknown, not missing
+            return None
+        if response.status_code not in INTERESTING:
+            return None
+        baseline = self.baseline(path_kind(path))
+        if baseline is not None and ResponseFingerprint.of(response, body, path).matches(baseline):
+            self._count("soft_404")
+            return None
+        finding = {
+            "URL": response.url,
+            "Status": response.status_code,
+            "Length": int(response.headers.get("Content-Length") or len(body)),
+            "Content-Type": response.headers.get("Content-Type", ""),
+        }
+        if response.headers.get("Location"):
+            finding["Location"] = response.headers["Location"]
+        return finding
+
+    def _safe_probe(self, path: str):
+        try:
+            return self.probe(path)
+        except requests.RequestException:
+            self._count("errors")
+            return None
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def discover(self, paths, should_stop=None):
+        """Yield findings as probes complete; paths may be a generator of any length."""
+        for kind in ("/", ""):
+            self.baseline(kind)  # The common kinds up front; others on first use
+        paths = iter(paths)
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                while len(in_flight) < self.max_workers * 4:
+                    path = next(paths, None)
+                    if path is None:
+                        break
+                    path = path.lstrip("/")
+                    if not self.seen.add(path):
+                        continue
+                    in_flight.add(executor.submit(self._safe_probe, path))
+                if not in_flight or (should_stop and should_stop()):
+                    for future in in_flight:
+                        future.cancel()
+                    return
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    finding = future.result()
+                    if finding is not None:
+                        yield finding
+
+    def statistics(self) -> dict:
+        baselines = {kind or "(no extension)": baseline.status if baseline else 404
+                     for kind, baseline in self.baselines.items()}
+        return {
+            "Probed": self.probed,
+            "Soft 404s Filtered": self.soft_404,
+            "Errors": self.errors,
+            "Missing Path Status": baselines,
+        }
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,268 @@
+# utils/crawler.py
+"""Shared site crawler for page-level plugins.
+
+Plugins that set analyzes_pages get every crawled page through analyze_page()
+instead of fetching the root page themselves. The site is crawled once per run:
+pages are fetched by a bounded worker pool, parsed once (the BeautifulSoup tree
+and visible text are built lazily and shared), and handed to every subscribed
+plugin. The crawl stays on the target's site, honours robots.txt and stops at the
+depth and page budgets. Pages whose body is a near-duplicate of an earlier page
+(SimHash, see utils/simhash.py) are neither analyzed nor followed, which prunes
+faceted and sorted variants of the same listing.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import closing
+from functools import cached_property
+from urllib.parse import urljoin, urldefrag, urlparse
+import requests
+from utils import http_cache
+from utils.link_checker import HostLimiter
+from utils.robots import get_robots_service
+from utils.simhash import SimHashIndex, MIN_TOKENS, simhash, tokenize
+from utils.url_frontier import URLFrontier
+from utils.target import resolve_target
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+USER_AGENT = http_cache.USER_AGENT
+MAX_PAGES = 30
+MAX_DEPTH = 2
+MAX_WORKERS = 8
+TIMEOUT = 10
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+MAX_LISTED_DUPLICATES = 50
+MAX_CRAWL_DELAY = 10.0  # Seconds; longer robots.txt delays would stall the crawl
+SKIPPED_EXTENSIONS = (
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".ico", ".css", ".js", ".pdf", ".zip", ".gz",
+    ".mp3", ".mp4", ".avi", ".mov", ".woff", ".woff2", ".ttf", ".xml", ".json", ".exe", ".dmg",
+)
+
+
+class Page:
+    """One fetched page; parsed views are built on first use and shared by all plugins."""
+
+    def __init__(self, url: str, response, depth: int, text: str = ""):
+        self.url = url
+        self.final_url = response.url
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.text = text
+        self.depth = depth
+        self.fingerprint = None
+        self.duplicate_of = None  # URL of an earlier near-identical page
+
+    @cached_property
+    def soup(self):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(self.text, 'html.parser')
+
+    @cached_property
+    def visible_text(self) -> str:
+        """Page text without script and style contents."""
+        return " ".join(
+            s for s in self.soup.find_all(string=True) if s.parent.name not in ("script", "style")
+        )
+
+    @cached_property
+    def links(self) -> list:
+        """Absolute http(s) links without fragments, in document order."""
+        links = []
+        for anchor in self.soup.find_all('a', href=True):
+            link = urldefrag(urljoin(self.final_url, anchor['href'].strip()))[0]
+            if link.startswith(("http://", "https://")):
+                links.append(link)
+        return list(dict.fromkeys(links))
+
+
+def is_html(response) -> bool:
+    return "html" in response.headers.get("Content-Type", "text/html").lower()
+
+
+class SiteCrawler:
+    def __init__(self, start_url: str, max_pages: int = MAX_PAGES, max_depth: int = MAX_DEPTH,
+                 max_workers: int = MAX_WORKERS, respect_robots: bool = True, skip_duplicates: bool = True,
+                 session=None, max_page_bytes: int = MAX_PAGE_BYTES):
+        self.start_url = resolve_target(start_url).url
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.respect_robots = respect_robots
+        self.skip_duplicates = skip_duplicates
+        self.max_page_bytes = max_page_bytes
+        self.fingerprints = SimHashIndex()
+        self.duplicates = {}  # url -> url of the page it duplicates
+        self.session = session or requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.site = resolve_target(start_url).domain
+        self.limiter = HostLimiter(max_workers)  # Spaces requests by the robots.txt crawl delay
+        self.pages_crawled = 0
+        self.errors = {}  # url -> reason
+
+    def in_scope(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        if not (host == self.site or host.endswith("." + self.site)):
+            return False
+        return not urlparse(url).path.lower().endswith(SKIPPED_EXTENSIONS)
+
+    def allowed(self, url: str) -> bool:
+        return not self.respect_robots or get_robots_service().can_fetch(url, USER_AGENT)
+
+    def _load_robots(self):
+        delay = get_robots_service().get(self.start_url).crawl_delay(USER_AGENT)
+        if delay:
+            self.limiter.delay = min(delay, MAX_CRAWL_DELAY)
+
+    def _fetch(self, url: str, depth: int) -> Page:
+        if depth == 0:
+            response = http_cache.fetch(url, timeout=TIMEOUT)  # Root page, shared with the other plugins
+            page = Page(url, response, depth, response.text if is_html(response) else "")
+        else:
+            self.limiter.wait_turn()
+            with self.session.get(url, timeout=TIMEOUT, stream=True) as response:
+                length = int(response.headers.get("Content-Length") or 0)
+                if not is_html(response) or length > self.max_page_bytes:
+                    return Page(url, response, depth)  # Not worth downloading; status and headers only
+                text = self._read_text(response)
+                if text is None:
+                    return Page(url, response, depth)  # Larger than announced, or announced nothing
+                page = Page(url, response, depth, text)
+        if self.skip_duplicates and page.text:
+            # Fingerprinted in the worker thread; only the index lookup is serialized
+            tokens = tokenize(page.text)
+            if len(tokens) >= MIN_TOKENS:
+                page.fingerprint = simhash(tokens)
+                page.duplicate_of = self.fingerprints.add_if_new(page.fingerprint, url)
+        return page
+
+    def _read_text(self, response):
+        """Body of a streamed page, or None when it is larger than max_page_bytes."""
+        body = response.raw.read(self.max_page_bytes + 1, decode_content=True)
+        if len(body) > self.max_page_bytes:
+            return None
+        try:
+            return body.decode(response.encoding or "utf-8", "replace")
+        except LookupError:  # Unknown charset in Content-Type
+            return body.decode("utf-8", "replace")
+
+    def _enqueue(self, frontier: URLFrontier, url: str, depth: int):
+        if url in frontier:
+            return
+        if self.in_scope(url) and self.allowed(url):
+            frontier.add(url, depth)
+        else:
+            frontier.mark_seen(url)  # Skip the scope and robots checks next time it is linked
+
+    def crawl(self, should_stop=None):
+        """Yield pages breadth-first as they are fetched."""
+        if self.respect_robots:
+            self._load_robots()
+        # Sized for the page budget; links beyond it are still de-duplicated, at a higher error rate
+        frontier = URLFrontier(capacity=max(10_000, self.max_pages * 100))
+        frontier.add(self.start_url, 0)
+        submitted = 0
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, closing(frontier):
+            while len(frontier) or in_flight:
+                while len(frontier) and len(in_flight) < self.max_workers and submitted < self.max_pages:
+                    url, depth = frontier.pop()
+                    in_flight[executor.submit(self._fetch, url, depth)] = (url, depth)
+                    submitted += 1
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    url, depth = in_flight.pop(future)
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        self.errors[url] = str(e)
+                        continue
+                    self.pages_crawled += 1
+                    if page.duplicate_of:
+                        self.duplicates[url] = page.duplicate_of
+                    if page.text and depth < self.max_depth and not page.duplicate_of:
+                        for link in page.links:
+                            self._enqueue(frontier, link, depth + 1)
+                    yield page
+                if should_stop and should_stop():
+                    for future in in_flight:
+                        future.cancel()
+                    return
+
+    def statistics(self) -> dict:
+        skipped = len(self.duplicates)
+        return {
+            "Pages Crawled": self.pages_crawled,
+            "Pages Analyzed": self.pages_crawled - skipped,
+            "Near-Duplicate Pages Skipped": skipped,
+            "Skip Ratio": round(skipped / self.pages_crawled, 3) if self.pages_crawled else 0.0,
+            "Near-Duplicates": dict(list(self.duplicates.items())[:MAX_LISTED_DUPLICATES]),
+            "Errors": len(self.errors),
+        }
+
+
+def crawl_and_analyze(target: str, plugins: list, progress=None, should_stop=None, **crawler_options) -> tuple:
+    """Crawl the target once and run every plugin's analyze_page on each page.
+
+    :return: ({plugin name: {page url: analyze_page result}}, crawl statistics). Every
+             crawled page has an entry except near-duplicates of an earlier page.
+    """
+    crawler = SiteCrawler(target, **crawler_options)
+    page_results = {plugin.name: {} for plugin in plugins}
+    for page in crawler.crawl(should_stop=should_stop):
+        if progress:
+            progress(crawler.pages_crawled, page.url)
+        if page.duplicate_of:
+            continue
+        for plugin in plugins:
+            try:
+                result = plugin.analyze_page(page)
+            except Exception as e:
+                result = {"Error": str(e)}
+            page_results[plugin.name][page.url] = result
+    return page_results, crawler.statistics()
+
+
+def merge_site_results(plugin, target: str, page_results: dict, statistics: dict) -> dict:
+    """The plugin's merged result with the crawl statistics added."""
+    result = plugin.merge_page_results(target, page_results)
+    if isinstance(result, dict) and "Error" not in result:
+        result["Crawl Statistics"] = statistics
+    return result
+
+
+def analyze_site(plugin, target: str) -> dict:
+    """Stand-alone run() for a page-level plugin: crawl for this plugin alone and merge."""
+    page_results, statistics = crawl_and_analyze(target, [plugin])
+    return merge_site_results(plugin, target, page_results[plugin.name], statistics)
+
+
+def merge_lists(page_results: dict, key: str) -> list:
+    """Sorted union of the list values stored under key across pages."""
+    merged = set()
+    for result in page_results.values():
+        value = result.get(key)
+        if isinstance(value, list):
+            merged.update(value)
+    return sorted(merged)
+
+
+def merge_list_dicts(page_results: dict, key: str) -> dict:
+    """Union of {name: [items]} values stored under key across pages; non-dict values are skipped."""
+    merged = {}
+    for result in page_results.values():
+        value = result.get(key)
+        if isinstance(value, dict):
+            for name, items in value.items():
+                merged.setdefault(name, set()).update(items)
+    return {name: sorted(items) for name, items in sorted(merged.items())}
+
+
+def unique_forms(page_results: dict, key: str, identity: tuple) -> list:
+    """Forms listed under key across pages, once per identity (e.g. action, method and inputs)."""
+    forms = {}
+    for result in page_results.values():
+        for form in result.get(key) or []:
+            forms.setdefault(tuple(str(form.get(field)) for field in identity), form)
+    return list(forms.values())
@@ -0,0 +1,305 @@
+# utils/fingerprints.py
+"""Wappalyzer-style technology fingerprinting.
+
+The fingerprint database (resources/fingerprints/technologies.json) maps a
+technology name to its categories and evidence patterns:
+
+    "WordPress": {
+        "cats": ["CMS"],
+        "headers": {"X-Pingback": "/xmlrpc\\.php$"},
+        "cookies": {"wordpress_test_cookie": ""},
+        "meta": {"generator": "^WordPress ?([\\d.]+)?\\;version:\\1"},
+        "scriptHosts": ["s.w.org"],
+        "scriptSrc": ["/wp-(?:content|includes)/"],
+        "html": ["<link[^>]+/wp-content/"],
+        "implies": ["PHP"]
+    }
+
+Patterns are regular expressions (an empty pattern only requires presence) with an
+optional "\\;version:\\N" suffix naming the group that holds the version. Cookie
+names ending in "*" match by prefix.
+
+The database is compiled once into indexes keyed by header name, cookie name, meta
+name and script host, so a response only evaluates the patterns for evidence it
+actually has. Script URL and HTML patterns, which cannot be keyed, are narrowed
+down by one scan of the text for the literals their matches require; only the
+candidates found are searched.
+"""
+import json
+import os
+import re
+import threading
+from urllib.parse import urlparse, urljoin
+
+FINGERPRINTS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "fingerprints", "technologies.json"
+)
+
+# Like Wappalyzer, HTML patterns only see the start of long documents and lines
+HTML_MAX_ROWS = 3000
+HTML_MAX_COLS = 2000
+
+SCRIPT_SRC_PATTERN = re.compile(r"<script\b[^>]*?\bsrc\s*=\s*[\"']?([^\"'\s>]+)", re.IGNORECASE)
+META_TAG_PATTERN = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+ATTRIBUTE_PATTERN = re.compile(r"([\w:-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+))")
+
+
+class Pattern:
+    def __init__(self, technology: str, source: str):
+        self.technology = technology
+        regex, _, options = source.partition("\\;")
+        self.version = None
+        for option in options.split("\\;") if options else []:
+            key, _, value = option.partition(":")
+            if key == "version":
+                self.version = value
+        self.regex = re.compile(regex, re.IGNORECASE) if regex else None
+
+    def match(self, value: str):
+        """Return (matched, version) for a value."""
+        if self.regex is None:
+            return True, None
+        m = self.regex.search(value)
+        if not m:
+            return False, None
+        return True, self._version(m)
+
+    def _version(self, m):
+        if not self.version:
+            return None
+        version = re.sub(r"\\(\d+)", lambda g: _group(m, int(g.group(1))), self.version).strip()
+        return version or None
+
+
+def _group(m, index: int) -> str:
+    try:
+        return m.group(index) or ""
+    except IndexError:
+        return ""
+
+
+def required_literal(regex: str) -> str:
+    """Longest lower-cased literal every match of regex must contain, or "" if none is certain.
+
+    Only top-level text counts: groups, classes and escapes other than escaped
+    punctuation end a run, an optional quantifier drops the character before it,
+    and a top-level alternation means nothing is required.
+    """
+    runs, run, depth, i = [], "", 0, 0
+    while i < len(regex):
+        char = regex[i]
+        i += 1
+        if char == "\\" and i < len(regex):
+            escaped = regex[i]
+            i += 1
+            if depth == 0 and not escaped.isalnum():
+                run += escaped
+                continue
+        elif char == "|" and depth == 0:
+            return ""
+        elif char in "?*{" and depth == 0:
+            run = run[:-1]  # The character before an optional quantifier may be absent
+            if char == "{":
+                i = regex.find("}", i) + 1 or len(regex)
+        elif char == "[":
+            i += regex[i:i + 1] == "^"
+            i += regex[i:i + 1] == "]"  # A leading "]" is part of the class
+            i = regex.find("]", i) + 1 or len(regex)
+        elif char in "()":
+            depth += 1 if char == "(" else -1
+        elif depth == 0 and char not in ".^$+":
+            run += char
+            continue
+        runs.append(run)
+        run = ""
+    runs.append(run)
+    return max(runs, key=len).lower()
+
+
+class UnkeyedPatterns:
+    """Patterns that cannot be indexed by evidence name (script URLs, HTML).
+
+    The required literals of all patterns are compiled into one alternation, so the
+    text is scanned once to find the candidate patterns; only their regexes are then
+    searched. Each candidate is searched on its own, so technologies whose patterns
+    match at the same place are all found and every regex keeps its own group numbering.
+    """
+
+    def __init__(self, patterns: list):
+        self.patterns = [p for p in patterns if p.regex is not None]
+        self._literal_index = {}  # literal -> [pattern index]
+        self._always = []  # Patterns without a required literal
+        for index, pattern in enumerate(self.patterns):
+            literal = required_literal(pattern.regex.pattern)
+            if literal:
+                self._literal_index.setdefault(literal, []).append(index)
+            else:
+                self._always.append(index)
+        literals = sorted(self._literal_index, key=len, reverse=True)
+        # A hit on a literal implies a hit on every literal it contains
+        self._implied = {
+            literal: [other for other in literals if other in literal] for literal in literals
+        }
+        self._automaton = re.compile("|".join(re.escape(literal) for literal in literals)) if literals else None
+
+    def _candidates(self, lowered: str) -> list:
+        """Indexes of the patterns whose required literal occurs in the lower-cased text."""
+        candidates = set(self._always)
+        if self._automaton is not None:
+            found = set()
+            search = self._automaton.search
+            match = search(lowered)
+            while match and len(found) < len(self._literal_index):
+                for literal in self._implied[match.group()]:
+                    if literal not in found:
+                        found.add(literal)
+                        candidates.update(self._literal_index[literal])
+                match = search(lowered, match.start() + 1)
+        return sorted(candidates)
+
+    def scan(self, text: str):
+        """Yield (pattern, version) for each pattern found in text."""
+        for index in self._candidates(text.lower()):
+            pattern = self.patterns[index]
+            matched, version = pattern.match(text)
+            if matched:
+                yield pattern, version
+
+
+class FingerprintMatcher:
+    def __init__(self, technologies: dict):
+        self.technologies = technologies
+        self._headers = {}  # header name -> [Pattern]
+        self._cookies = {}  # cookie name -> [Pattern]
+        self._cookie_prefixes = []  # (prefix, Pattern)
+        self._meta = {}  # meta name -> [Pattern]
+        self._script_hosts = {}  # host -> [technology]
+        script_src = []
+        html = []
+        for name, fingerprint in technologies.items():
+            for header, source in fingerprint.get("headers", {}).items():
+                self._headers.setdefault(header.lower(), []).append(Pattern(name, source))
+            for cookie, source in fingerprint.get("cookies", {}).items():
+                if cookie.endswith("*"):
+                    self._cookie_prefixes.append((cookie[:-1], Pattern(name, source)))
+                else:
+                    self._cookies.setdefault(cookie, []).append(Pattern(name, source))
+            for meta, source in fingerprint.get("meta", {}).items():
+                self._meta.setdefault(meta.lower(), []).append(Pattern(name, source))
+            for host in fingerprint.get("scriptHosts", []):
+                self._script_hosts.setdefault(host.lower(), []).append(name)
+            script_src.extend(Pattern(name, source) for source in fingerprint.get("scriptSrc", []))
+            html.extend(Pattern(name, source) for source in fingerprint.get("html", []))
+        self._script_src = UnkeyedPatterns(script_src)
+        self._html = UnkeyedPatterns(html)
+
+    @classmethod
+    def from_file(cls, path: str = FINGERPRINTS_PATH) -> "FingerprintMatcher":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)["technologies"])
+
+    def analyze(self, url: str, headers=None, cookies=None, html: str = "") -> dict:
+        """Detect technologies from a fetched page.
+
+        :return: {technology: {"Version": ..., "Categories": [...], "Evidence": [...]}}
+        """
+        detected = {}
+
+        def found(technology, evidence, version=None):
+            entry = detected.setdefault(technology, {"Version": None, "Evidence": []})
+            if version and not entry["Version"]:
+                entry["Version"] = version
+            if evidence not in entry["Evidence"]:
+                entry["Evidence"].append(evidence)
+
+        for header, value in (headers or {}).items():
+            for pattern in self._headers.get(header.lower(), ()):
+                matched, version = pattern.match(str(value))
+                if matched:
+                    found(pattern.technology, f"header:{header}", version)
+
+        for cookie, value in (cookies or {}).items():
+            candidates = list(self._cookies.get(cookie, ()))
+            candidates.extend(p for prefix, p in self._cookie_prefixes if cookie.startswith(prefix))
+            for pattern in candidates:
+                matched, version = pattern.match(str(value or ""))
+                if matched:
+                    found(pattern.technology, f"cookie:{cookie}", version)
+
+        if html:
+            for name, content in extract_meta(html):
+                for pattern in self._meta.get(name, ()):
+                    matched, version = pattern.match(content)
+                    if matched:
+                        found(pattern.technology, f"meta:{name}", version)
+
+            for script in extract_scripts(html, url):
+                for host in _host_suffixes(urlparse(script).hostname or ""):
+                    for technology in self._script_hosts.get(host, ()):
+                        found(technology, f"script host:{host}")
+                for pattern, version in self._script_src.scan(script):
+                    found(pattern.technology, "script src", version)
+
+            for pattern, version in self._html.scan(truncate_html(html)):
+                found(pattern.technology, "html", version)
+
+        self._add_implied(detected)
+        for technology, entry in detected.items():
+            entry["Categories"] = self.technologies.get(technology, {}).get("cats", [])
+        return detected
+
+    def _add_implied(self, detected: dict):
+        pending = list(detected)
+        while pending:
+            technology = pending.pop()
+            for implied in self.technologies.get(technology, {}).get("implies", []):
+                if implied not in detected:
+                    detected[implied] = {"Version": None, "Evidence": [f"implied by {technology}"]}
+                    pending.append(implied)
+
+
+def extract_meta(html: str):
+    """Yield (name, content) for meta tags with a name or property attribute."""
+    for tag in META_TAG_PATTERN.findall(html):
+        attributes = {k.lower(): a or b or c for k, a, b, c in ATTRIBUTE_PATTERN.findall(tag)}
+        name = attributes.get("name") or attributes.get("property")
+        if name and "content" in attributes:
+            yield name.lower(), attributes["content"]
+
+
+def extract_scripts(html: str, base_url: str = "") -> list:
+    return [urljoin(base_url, src) for src in SCRIPT_SRC_PATTERN.findall(html)]
+
+
+def truncate_html(html: str) -> str:
+    lines = html.split("\n", HTML_MAX_ROWS)[:HTML_MAX_ROWS]
+    return "\n".join(line[:HTML_MAX_COLS] for line in lines)
+
+
+def _host_suffixes(host: str) -> list:
+    """www.example.co.uk -> [www.example.co.uk, example.co.uk, co.uk]"""
+    parts = host.lower().split(".")
+    return [".".join(parts[i:]) for i in range(len(parts) - 1)]
+
+
+def group_by_category(detected: dict) -> dict:
+    """{category: ["Name version", ...]} in the shape the plugin reported before."""
+    grouped = {}
+    for technology, entry in sorted(detected.items()):
+        label = f"{technology} {entry['Version']}" if entry.get("Version") else technology
+        for category in entry.get("Categories") or ["Other"]:
+            grouped.setdefault(category, []).append(label)
+    return grouped
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_fingerprint_matcher() -> FingerprintMatcher:
+    """Shared matcher compiled from the fingerprint database on first use."""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = FingerprintMatcher.from_file()
+        return _matcher
@@ -0,0 +1,140 @@
+# utils/form_probe.py
+"""Concurrent form probing.
+
+FormProbe submits a corpus of payloads to every discovered form on a bounded
+worker pool, with a concurrency cap and adaptive delay per host (see
+utils/link_checker.py). Each response is checked by the caller's evaluate()
+callback, typically one pass of the shared signature engine. Once a form is
+conclusively flagged, its remaining payloads are skipped.
+"""
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from utils.http_cache import USER_AGENT
+from utils.link_checker import HostLimiter, THROTTLED
+
+MAX_WORKERS = 16
+PER_HOST = 4  # Form handlers are usually dynamic pages; keep the load on them low
+PER_FORM = 2  # Payloads of one form in flight; later ones wait to see if the form gets flagged
+TIMEOUT = 10
+
+
+class FormReport:
+    """Outcome of probing one form."""
+
+    def __init__(self, form: dict):
+        self.form = form
+        self.findings = []  # evaluate() results, in completion order
+        self.requests = 0
+        self.skipped = 0
+        self.errors = []
+        self.flagged = False  # Conclusive finding; remaining payloads are skipped
+        self.in_flight = 0  # Maintained by FormProbe.run
+        self._lock = threading.Lock()
+
+    def record(self, finding=None, conclusive: bool = False, error: str = None, skipped: bool = False):
+        with self._lock:
+            if skipped:
+                self.skipped += 1
+                return
+            self.requests += 1
+            if error is not None:
+                self.errors.append(error)
+            if finding is not None:
+                self.findings.append(finding)
+                self.flagged = self.flagged or conclusive
+
+
+class FormProbe:
+    def __init__(self, max_workers: int = MAX_WORKERS, per_host: int = PER_HOST, per_form: int = PER_FORM,
+                 timeout: int = TIMEOUT):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.per_form = per_form
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _limiter(self, url: str) -> HostLimiter:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = self._hosts[host] = HostLimiter(self.per_host)
+            return limiter
+
+    def submit(self, form: dict, data: dict = None, files: dict = None) -> requests.Response:
+        """Submit the form with its method; GET forms send data as the query string."""
+        limiter = self._limiter(form["Action"])
+        with limiter.slots:
+            limiter.wait_turn()
+            if form.get("Method", "GET").upper() == "POST":
+                response = self.session.post(form["Action"], data=data, files=files, timeout=self.timeout)
+            else:
+                response = self.session.get(form["Action"], params=data, timeout=self.timeout)
+        if response.status_code in THROTTLED:
+            limiter.throttled()
+        else:
+            limiter.succeeded()
+        return response
+
+    def run(self, forms: list, payloads, evaluate) -> list:
+        """Probe every form with every payload and return one FormReport per form.
+
+        payloads(form) yields (label, data, files) submissions for a form.
+        evaluate(form, label, response) returns None, a finding, or (finding, conclusive);
+        a conclusive finding flags the form and its remaining payloads are skipped.
+        Forms are probed concurrently, but at most per_form payloads of one form are in
+        flight at a time, so a flagged form stops early instead of having its corpus queued.
+        """
+        reports = [FormReport(form) for form in forms]
+        pending = deque((report, iter(payloads(report.form))) for report in reports)
+        in_flight = {}  # future -> report
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                blocked = 0
+                while pending and len(in_flight) < self.max_workers * 2 and blocked < len(pending):
+                    report, submissions = pending[0]
+                    pending.rotate(-1)  # Round robin: one payload per form in turn
+                    if report.flagged:
+                        for _ in submissions:
+                            report.record(skipped=True)
+                        pending.pop()
+                        continue
+                    if report.in_flight >= self.per_form:
+                        blocked += 1
+                        continue
+                    submission = next(submissions, None)
+                    if submission is None:
+                        pending.pop()
+                        continue
+                    blocked = 0
+                    report.in_flight += 1
+                    in_flight[executor.submit(self._probe, evaluate, report, *submission)] = report
+                if not in_flight:
+                    return reports
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.pop(future).in_flight -= 1
+                    future.result()
+
+    def _probe(self, evaluate, report: FormReport, label: str, data: dict, files: dict):
+        try:
+            outcome = evaluate(report.form, label, self.submit(report.form, data, files))
+        except Exception as e:
+            report.record(error=f"{label}: {str(e)}")
+            return
+        finding, conclusive = outcome if isinstance(outcome, tuple) else (outcome, False)
+        report.record(finding, conclusive)
+
+    def close(self):
+        self.session.close()
+
@@ -0,0 +1,283 @@
+# utils/geoip.py
+"""Offline IP geolocation from MaxMind DB (MMDB) files.
+
+Any City-style MMDB file works (MaxMind GeoLite2-City, DB-IP City Lite, ...). The
+file is memory-mapped and read with a small pure-Python decoder, or with the
+'maxminddb' package when it is installed. Lookups are cached in an LRU cache and
+can be batched. The ip-api.com HTTP API can be used as a fallback when no database
+is available, but it is off by default (HTTP_FALLBACK): it sends the looked-up
+addresses in clear text to a third party whose free tier is for non-commercial use
+only, so callers must opt in.
+"""
+import glob
+import ipaddress
+import logging
+import mmap
+import os
+import struct
+import threading
+from functools import lru_cache
+import requests
+from utils.target import resolve_addresses  # noqa: F401 (re-exported)
+
+try:
+    import maxminddb
+except ImportError:
+    maxminddb = None
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+GEOIP_DIR = os.path.join("data", "geoip")
+CACHE_SIZE = 65536
+HTTP_FALLBACK = False  # Opt-in; see the module docstring
+FALLBACK_URL = "http://ip-api.com/batch?fields=status,query,country,countryCode,regionName,city,lat,lon,timezone,isp,as"
+FALLBACK_BATCH_SIZE = 100  # ip-api.com batch limit
+FALLBACK_TIMEOUT = 10
+
+METADATA_START = b"\xab\xcd\xefMaxMind.com"
+
+
+class MMDBReader:
+    """Minimal reader for the MaxMind DB format over a memory-mapped file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        metadata_start = self._buffer.rfind(METADATA_START, max(0, len(self._buffer) - 128 * 1024))
+        if metadata_start < 0:
+            raise ValueError(f"{path} is not a MaxMind DB file.")
+        metadata_start += len(METADATA_START)
+        self._pointer_base = metadata_start
+        self.metadata = self._decode(metadata_start)[0]
+        self.node_count = self.metadata["node_count"]
+        self.record_size = self.metadata["record_size"]
+        self.ip_version = self.metadata["ip_version"]
+        self._node_bytes = self.record_size * 2 // 8
+        self._search_tree_size = self.node_count * self._node_bytes
+        self._pointer_base = self._search_tree_size + 16
+        self._ipv4_start = None
+
+    def _read_node(self, node: int, bit: int) -> int:
+        offset = node * self._node_bytes
+        b = self._buffer
+        if self.record_size == 24:
+            offset += bit * 3
+            return int.from_bytes(b[offset:offset + 3], "big")
+        if self.record_size == 28:
+            middle = b[offset + 3]
+            if bit:
+                return ((middle & 0x0F) << 24) | int.from_bytes(b[offset + 4:offset + 7], "big")
+            return ((middle & 0xF0) << 20) | int.from_bytes(b[offset:offset + 3], "big")
+        if self.record_size == 32:
+            offset += bit * 4
+            return int.from_bytes(b[offset:offset + 4], "big")
+        raise ValueError(f"Unsupported record size {self.record_size}.")
+
+    def _start_node(self, bit_count: int) -> int:
+        if self.ip_version == 6 and bit_count == 32:
+            if self._ipv4_start is None:
+                # IPv4 addresses live under ::/96 in IPv6 trees
+                node = 0
+                for _ in range(96):
+                    if node >= self.node_count:
+                        break
+                    node = self._read_node(node, 0)
+                self._ipv4_start = node
+            return self._ipv4_start
+        return 0
+
+    def get(self, ip: str):
+        address = ipaddress.ip_address(ip)
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if address.version == 6 and self.ip_version == 4:
+            raise ValueError(f"Cannot look up IPv6 address {ip} in an IPv4-only database.")
+        bit_count = 32 if address.version == 4 else 128
+        value = int(address)
+        node = self._start_node(bit_count)
+        for i in range(bit_count):
+            if node >= self.node_count:
+                break
+            node = self._read_node(node, (value >> (bit_count - 1 - i)) & 1)
+        if node <= self.node_count:
+            return None  # node_count itself means "no data"
+        return self._decode(self._search_tree_size + node - self.node_count)[0]
+
+    def _decode(self, offset: int):
+        b = self._buffer
+        control = b[offset]
+        offset += 1
+        data_type = control >> 5
+        if data_type == 1:  # Pointer
+            size = (control >> 3) & 0x3
+            value = control & 0x7
+            if size == 0:
+                pointer = (value << 8) | b[offset]
+            elif size == 1:
+                pointer = ((value << 16) | int.from_bytes(b[offset:offset + 2], "big")) + 2048
+            elif size == 2:
+                pointer = ((value << 24) | int.from_bytes(b[offset:offset + 3], "big")) + 526336
+            else:
+                pointer = int.from_bytes(b[offset:offset + 4], "big")
+            return self._decode(self._pointer_base + pointer)[0], offset + size + 1
+        if data_type == 0:  # Extended type
+            data_type = 7 + b[offset]
+            offset += 1
+        size = control & 0x1F
+        if size >= 29:
+            extra = size - 28
+            size = {1: 29, 2: 285, 3: 65821}[extra] + int.from_bytes(b[offset:offset + extra], "big")
+            offset += extra
+        if data_type == 2:
+            return b[offset:offset + size].decode('utf-8'), offset + size
+        if data_type == 7:
+            result = {}
+            for _ in range(size):
+                key, offset = self._decode(offset)
+                result[key], offset = self._decode(offset)
+            return result, offset
+        if data_type == 11:
+            result = []
+            for _ in range(size):
+                value, offset = self._decode(offset)
+                result.append(value)
+            return result, offset
+        if data_type in (5, 6, 9, 10):
+            return int.from_bytes(b[offset:offset + size], "big"), offset + size
+        if data_type == 8:
+            return int.from_bytes(b[offset:offset + size].rjust(4, b"\x00"), "big", signed=True), offset + size
+        if data_type == 3:
+            return struct.unpack(">d", b[offset:offset + 8])[0], offset + 8
+        if data_type == 15:
+            return struct.unpack(">f", b[offset:offset + 4])[0], offset + 4
+        if data_type == 4:
+            return bytes(b[offset:offset + size]), offset + size
+        if data_type == 14:
+            return bool(size), offset
+        raise ValueError(f"Unsupported MMDB data type {data_type} at offset {offset}.")
+
+    def close(self):
+        self._buffer.close()
+
+
+def open_database(path: str):
+    """MMDB reader for path, using the 'maxminddb' extension when available."""
+    if maxminddb is not None:
+        return maxminddb.open_database(path, maxminddb.MODE_MMAP)
+    return MMDBReader(path)
+
+
+def _name(record: dict, key: str):
+    names = (record.get(key) or {}).get("names") or {}
+    return names.get("en")
+
+
+def normalize_record(record: dict) -> dict:
+    """Flatten a City-style MMDB record into the keys the plugins report."""
+    location = record.get("location") or {}
+    subdivisions = record.get("subdivisions") or [{}]
+    return {
+        "Country": _name(record, "country"),
+        "Country Code": (record.get("country") or {}).get("iso_code"),
+        "Region": (subdivisions[0].get("names") or {}).get("en"),
+        "City": _name(record, "city"),
+        "Latitude": location.get("latitude"),
+        "Longitude": location.get("longitude"),
+        "Time Zone": location.get("time_zone"),
+    }
+
+
+class GeoIPService:
+    """Geolocation lookups against the newest MMDB file in data/geoip, with an optional HTTP fallback."""
+
+    def __init__(self, directory: str = GEOIP_DIR, http_fallback: bool = HTTP_FALLBACK, cache_size: int = CACHE_SIZE):
+        self.directory = directory
+        self.http_fallback = http_fallback
+        self.path = None
+        self._reader = None
+        self._opened = False
+        self._lock = threading.Lock()
+        self._cached_lookup = lru_cache(maxsize=cache_size)(self._lookup_local)
+
+    def _open(self):
+        with self._lock:
+            if self._opened:
+                return
+            self._opened = True
+            paths = sorted(glob.glob(os.path.join(self.directory, "*.mmdb")), key=os.path.getmtime, reverse=True)
+            for path in paths:
+                try:
+                    self._reader = open_database(path)
+                    self.path = path
+                    logger.info(f"Opened geolocation database {path}")
+                    break
+                except Exception as e:
+                    logger.warning(f"Failed to open geolocation database {path}: {str(e)}")
+
+    @property
+    def available(self) -> bool:
+        self._open()
+        return self._reader is not None
+
+    def _lookup_local(self, ip: str):
+        try:
+            record = self._reader.get(ip)
+        except ValueError:
+            return None
+        return normalize_record(record) if record else None
+
+    def lookup(self, ip: str) -> dict:
+        return self.lookup_many([ip]).get(ip) or {}
+
+    def lookup_many(self, ips) -> dict:
+        """{ip: location or None} for many IPs; unknown IPs go to the HTTP fallback in batches."""
+        self._open()
+        ips = list(dict.fromkeys(ips))
+        results = {}
+        missing = []
+        for ip in ips:
+            result = self._cached_lookup(ip) if self._reader is not None else None
+            results[ip] = dict(result) if result else None  # Callers may annotate the cached record
+            if result is None:
+                missing.append(ip)
+        if missing and self.http_fallback and self._reader is None:
+            results.update(self._lookup_http(missing))
+        return results
+
+    def _lookup_http(self, ips: list) -> dict:
+        results = {}
+        for start in range(0, len(ips), FALLBACK_BATCH_SIZE):
+            batch = ips[start:start + FALLBACK_BATCH_SIZE]
+            try:
+                response = requests.post(FALLBACK_URL, json=batch, timeout=FALLBACK_TIMEOUT)
+                response.raise_for_status()
+                for item in response.json():
+                    if item.get("status") != "success":
+                        continue
+                    results[item["query"]] = {
+                        "Country": item.get("country"),
+                        "Country Code": item.get("countryCode"),
+                        "Region": item.get("regionName"),
+                        "City": item.get("city"),
+                        "Latitude": item.get("lat"),
+                        "Longitude": item.get("lon"),
+                        "Time Zone": item.get("timezone"),
+                        "ISP": item.get("isp"),
+                    }
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f"Geolocation fallback failed: {str(e)}")
+                break
+        return results
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_geoip_service() -> GeoIPService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = GeoIPService()
+        return _service
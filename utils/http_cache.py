@@ -0,0 +1,43 @@
+# utils/http_cache.py
+"""Short-lived shared cache of fetched pages.
+
+Several plugins start by fetching the same root page. fetch() lets them share one
+response per URL for a short time; concurrent requests for the same URL wait for
+the first one instead of fetching it again.
+"""
+import threading
+import time
+import requests
+from utils.url_frontier import canonicalize
+
+USER_AGENT = "DeepWebsiteAnalyzer/1.0"
+DEFAULT_MAX_AGE = 120  # Seconds, roughly one analysis run
+
+_responses = {}  # canonical url -> (fetched_at, response)
+_url_locks = {}
+_lock = threading.Lock()
+
+
+def fetch(url: str, timeout: int = 10, max_age: int = DEFAULT_MAX_AGE) -> requests.Response:
+    """GET url, reusing a response fetched less than max_age seconds ago.
+
+    Responses are keyed by the canonical URL, so spellings like http://Example.com:80
+    and http://example.com/ share one entry. Raises requests.RequestException like
+    requests.get; failures are not cached.
+    """
+    key = canonicalize(url)
+    with _lock:
+        url_lock = _url_locks.setdefault(key, threading.Lock())
+    with url_lock:
+        cached = _responses.get(key)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+        _responses[key] = (time.monotonic(), response)
+        return response
+
+
+def clear():
+    with _lock:
+        _responses.clear()
+        _url_locks.clear()
@@ -0,0 +1,397 @@
+# utils/ip_ranges.py
+"""Offline IP range attribution (cloud/CDN provider and ASN).
+
+Published provider ranges and an IP-to-ASN table are downloaded by refresh() and
+compiled into sorted, non-overlapping interval files under data/ip_ranges. The
+files are memory-mapped and searched with bisect, so a lookup is a couple of
+array reads and nothing is parsed at load time.
+
+Index file layout (little endian):
+    header: MAGIC | v4 count (Q) | v6 count (Q) | attribute table offset (Q) | length (Q)
+    IPv4:   starts uint32[n] | ends uint32[n] | attribute ids uint32[n]
+    IPv6:   starts uint64[n] | ends uint64[n] | attribute ids uint32[n]  (upper 64 bits)
+    attribute table: JSON list of dicts
+
+IPv6 ranges are indexed by their upper 64 bits, which covers every published
+prefix of /64 or shorter.
+"""
+import bisect
+import csv
+import gzip
+import heapq
+import io
+import ipaddress
+import json
+import logging
+import mmap
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from array import array
+import requests
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+IP_RANGES_DIR = os.path.join("data", "ip_ranges")
+PROVIDERS_FILE = "providers.idx"
+ASN_FILE = "asn.idx"
+MAX_AGE = 7 * 86400  # Published ranges change weekly at most
+DOWNLOAD_TIMEOUT = 30
+
+MAGIC = b"DWIR1\x00\x00\x00"
+HEADER = struct.Struct("<8sQQQQ")
+
+ASN_SOURCE = "https://iptoasn.com/data/ip2asn-combined.tsv.gz"
+
+
+def _aws(data):
+    # Supersets ("AMAZON") first so the specific service wins on identical prefixes
+    prefixes = sorted(data.get("prefixes", []) + data.get("ipv6_prefixes", []), key=lambda p: p["service"] != "AMAZON")
+    for p in prefixes:
+        yield p.get("ip_prefix") or p.get("ipv6_prefix"), {"Service": p["service"], "Region": p["region"]}
+
+
+def _google(data):
+    for p in data.get("prefixes", []):
+        prefix = p.get("ipv4Prefix") or p.get("ipv6Prefix")
+        yield prefix, {k: v for k, v in (("Service", p.get("service")), ("Region", p.get("scope"))) if v}
+
+
+def _lines(text):
+    for line in text.splitlines():
+        if line.strip() and not line.startswith("#"):
+            yield line.strip(), {}
+
+
+def _fastly(data):
+    for prefix in data.get("addresses", []) + data.get("ipv6_addresses", []):
+        yield prefix, {}
+
+
+def _github(data):
+    for service in ("hooks", "web", "api", "git", "pages", "importer", "packages"):
+        for prefix in data.get(service, []):
+            yield prefix, {"Service": service}
+
+
+def _digitalocean(text):
+    for row in csv.reader(io.StringIO(text)):
+        if row and row[0]:
+            yield row[0], {"Region": ", ".join(part for part in row[1:4] if part)}
+
+
+def _oracle(data):
+    for region in data.get("regions", []):
+        for cidr in region.get("cidrs", []):
+            yield cidr["cidr"], {"Region": region["region"]}
+
+
+# (provider, url(s), "json" or "text", parser); later sources win on identical prefixes
+PROVIDER_SOURCES = [
+    ("Google", ["https://www.gstatic.com/ipranges/goog.json"], "json", _google),
+    ("Google Cloud", ["https://www.gstatic.com/ipranges/cloud.json"], "json", _google),
+    ("Amazon Web Services", ["https://ip-ranges.amazonaws.com/ip-ranges.json"], "json", _aws),
+    ("Cloudflare", ["https://www.cloudflare.com/ips-v4", "https://www.cloudflare.com/ips-v6"], "text", _lines),
+    ("Fastly", ["https://api.fastly.com/public-ip-list"], "json", _fastly),
+    ("GitHub", ["https://api.github.com/meta"], "json", _github),
+    ("DigitalOcean", ["https://digitalocean.com/geo/google.csv"], "text", _digitalocean),
+    ("Oracle Cloud", ["https://docs.oracle.com/en-us/iaas/tools/public_ip_ranges.json"], "json", _oracle),
+]
+
+
+def _key(address) -> tuple:
+    """(version, sortable integer) for an ipaddress object."""
+    if address.version == 4:
+        return 4, int(address)
+    if address.ipv4_mapped:
+        return 4, int(address.ipv4_mapped)
+    return 6, int(address) >> 64
+
+
+def parse_ip(ip: str):
+    """(version, key) for an IP string, or None if it is not an IP address."""
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip), "big")
+    except (OSError, TypeError):
+        pass
+    try:
+        return _key(ipaddress.ip_address(ip))
+    except ValueError:
+        return None
+
+
+def _interval(network) -> tuple:
+    version, start = _key(network.network_address)
+    _, end = _key(network.broadcast_address)
+    return version, start, end
+
+
+def flatten(intervals: list) -> list:
+    """Turn nested, duplicate or overlapping intervals [(start, end, attr)] into disjoint ones.
+
+    Where intervals overlap, the one that starts last wins (the innermost, for nested
+    CIDR blocks); among equal starts the shorter wins, and among duplicates the later
+    one. Parts of an interval that nothing later overlaps keep its attribute.
+    """
+    intervals = sorted(intervals, key=lambda r: (r[0], -r[1]))  # Stable: later duplicates end up on top
+    boundaries = sorted({r[0] for r in intervals} | {r[1] + 1 for r in intervals})
+    result = []
+    active = []  # Heap of (-priority, end, attr); expired entries are dropped when they surface
+    i = 0
+    for point, next_point in zip(boundaries, boundaries[1:]):
+        while i < len(intervals) and intervals[i][0] == point:
+            heapq.heappush(active, (-i, intervals[i][1], intervals[i][2]))
+            i += 1
+        while active and active[0][1] < point:
+            heapq.heappop(active)
+        if not active:
+            continue
+        attr = active[0][2]
+        if result and result[-1][1] == point - 1 and result[-1][2] == attr:
+            result[-1] = (result[-1][0], next_point - 1, attr)
+        else:
+            result.append((point, next_point - 1, attr))
+    return result
+
+
+def write_index(path: str, v4: list, v6: list, attributes: list):
+    """Write flattened [(start, end, attribute id)] intervals to an index file atomically."""
+    body = b""
+    for intervals, code in ((v4, 'I'), (v6, 'Q')):
+        body += b"\x00" * (-(HEADER.size + len(body)) % 8)  # Keep every section 8-byte aligned
+        starts, ends, ids = array(code), array(code), array('I')
+        for start, end, attr in intervals:
+            starts.append(start)
+            ends.append(end)
+            ids.append(attr)
+        for a in (starts, ends, ids):
+            if sys.byteorder != "little":
+                a.byteswap()
+            body += a.tobytes()
+    table = json.dumps(attributes).encode('utf-8')
+    table_offset = HEADER.size + len(body)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(v4), len(v6), table_offset, len(table)))
+        f.write(body)
+        f.write(table)
+    os.replace(temp_path, path)
+
+
+class IntervalIndex:
+    """Memory-mapped sorted interval index written by write_index()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, v4_count, v6_count, table_offset, table_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an IP range index.")
+        self.attributes = json.loads(self._mmap[table_offset:table_offset + table_length])
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+        self._sections = {}
+        for version, count, code, width in ((4, v4_count, 'I', 4), (6, v6_count, 'Q', 8)):
+            offset += -offset % 8
+            columns = []
+            for column_code, column_width in ((code, width), (code, width), ('I', 4)):
+                column = view[offset:offset + count * column_width]
+                columns.append(column.cast(column_code) if sys.byteorder == "little" else _swapped(column, column_code))
+                offset += count * column_width
+            self._sections[version] = columns
+
+    def __len__(self):
+        return sum(len(starts) for starts, _, _ in self._sections.values())
+
+    def lookup(self, ip: str):
+        """Return the attributes of the interval containing ip, or None."""
+        key = parse_ip(ip)
+        return self._search(key, 0)[0] if key else None
+
+    def _search(self, key: tuple, hint: int):
+        version, value = key
+        starts, ends, ids = self._sections[version]
+        i = bisect.bisect_right(starts, value, lo=min(hint, len(starts))) - 1
+        if i >= 0 and value <= ends[i]:
+            return self.attributes[ids[i]], i
+        return None, max(i, 0)
+
+    def lookup_many(self, ips) -> dict:
+        """Batch lookup; ips are sorted once so every search starts where the previous one ended."""
+        keyed = sorted((key, ip) for key, ip in ((parse_ip(ip), ip) for ip in ips) if key)
+        results = {}
+        hints = {4: 0, 6: 0}
+        for key, ip in keyed:
+            results[ip], hints[key[0]] = self._search(key, hints[key[0]])
+        return results
+
+    def close(self):
+        self._sections.clear()
+        self._mmap.close()
+
+
+def _swapped(column, code):
+    values = array(code, column.tobytes())
+    values.byteswap()
+    return values
+
+
+def _download(url: str, kind: str):
+    response = requests.get(url, timeout=DOWNLOAD_TIMEOUT, headers={"User-Agent": "DeepWebsiteAnalyzer/1.0"})
+    response.raise_for_status()
+    return response.json() if kind == "json" else response.text
+
+
+def build_provider_index(path: str, sources: list = None) -> int:
+    """Download published provider ranges and write the provider index. Returns the interval count."""
+    attributes = []
+    attribute_ids = {}
+    intervals = {4: [], 6: []}
+    for provider, urls, kind, parser in sources or PROVIDER_SOURCES:
+        try:
+            for url in urls:
+                for prefix, details in parser(_download(url, kind)):
+                    try:
+                        network = ipaddress.ip_network(prefix, strict=False)
+                    except ValueError:
+                        continue
+                    attribute = dict(details, Provider=provider)
+                    key = json.dumps(attribute, sort_keys=True)
+                    if key not in attribute_ids:
+                        attribute_ids[key] = len(attributes)
+                        attributes.append(attribute)
+                    version, start, end = _interval(network)
+                    intervals[version].append((start, end, attribute_ids[key]))
+        except (requests.RequestException, ValueError, KeyError) as e:
+            logger.warning(f"Skipping IP ranges of {provider}: {str(e)}")
+    v4, v6 = flatten(intervals[4]), flatten(intervals[6])
+    if not v4 and not v6:
+        raise ValueError("No provider ranges could be downloaded.")
+    write_index(path, v4, v6, attributes)
+    return len(v4) + len(v6)
+
+
+def build_asn_index(path: str, url: str = ASN_SOURCE) -> int:
+    """Download the IP-to-ASN table (start, end, ASN, country, AS name) and write the ASN index."""
+    response = requests.get(url, timeout=DOWNLOAD_TIMEOUT * 4, stream=True)
+    response.raise_for_status()
+    attributes = []
+    attribute_ids = {}
+    intervals = {4: [], 6: []}
+    with gzip.GzipFile(fileobj=response.raw) as compressed:
+        for line in io.TextIOWrapper(compressed, encoding='utf-8', errors='replace'):
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5 or fields[2] == "0":
+                continue  # Not routed
+            try:
+                version, start = _key(ipaddress.ip_address(fields[0]))
+                _, end = _key(ipaddress.ip_address(fields[1]))
+            except ValueError:
+                continue
+            asn = int(fields[2])
+            if asn not in attribute_ids:
+                attribute_ids[asn] = len(attributes)
+                attributes.append({"ASN": asn, "AS Name": fields[4], "Country": fields[3]})
+            intervals[version].append((start, end, attribute_ids[asn]))
+    write_index(path, flatten(intervals[4]), flatten(intervals[6]), attributes)
+    return len(intervals[4]) + len(intervals[6])
+
+
+class IPRangeDatabase:
+    """Provider and ASN attribution from the local indexes, refreshed when older than MAX_AGE."""
+
+    def __init__(self, directory: str = IP_RANGES_DIR):
+        self.directory = directory
+        self.providers = None
+        self.asn = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def is_stale(self, name: str, max_age: int = MAX_AGE) -> bool:
+        try:
+            return time.time() - os.path.getmtime(self._path(name)) > max_age
+        except OSError:
+            return True
+
+    def refresh(self, include_asn: bool = True, force: bool = False):
+        """Rebuild stale or missing indexes; failures keep the previous files."""
+        with self._lock:
+            builders = [(PROVIDERS_FILE, build_provider_index)]
+            if include_asn:
+                builders.append((ASN_FILE, build_asn_index))
+            for name, build in builders:
+                if not force and not self.is_stale(name):
+                    continue
+                try:
+                    count = build(self._path(name))
+                    logger.info(f"Rebuilt IP range index {name} with {count} ranges.")
+                except Exception as e:
+                    logger.warning(f"Failed to refresh IP range index {name}: {str(e)}")
+            self._open()
+
+    def _open(self):
+        for attribute, name in (("providers", PROVIDERS_FILE), ("asn", ASN_FILE)):
+            current = getattr(self, attribute)
+            if current is not None:
+                current.close()
+            index = None
+            if os.path.exists(self._path(name)):
+                try:
+                    index = IntervalIndex(self._path(name))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Failed to open IP range index {name}: {str(e)}")
+            setattr(self, attribute, index)
+
+    def ensure_loaded(self):
+        """Open the indexes on first use, building them first if they are missing or stale.
+
+        Only attempted once, so an offline machine does not retry the download on every lookup.
+        """
+        if self._loaded:
+            return
+        with self._lock:  # Reentrant: refresh() takes it too
+            if self._loaded:
+                return  # Another thread loaded the indexes while this one waited
+            if self.is_stale(PROVIDERS_FILE) or self.is_stale(ASN_FILE):
+                self.refresh()
+            else:
+                self._open()
+            self._loaded = True
+
+    def lookup(self, ip: str) -> dict:
+        """{"Provider", "Service", "Region", "ASN", "AS Name", "Country"} for the keys that are known."""
+        return self.lookup_many([ip]).get(ip, {})
+
+    def lookup_many(self, ips) -> dict:
+        self.ensure_loaded()
+        ips = list(dict.fromkeys(ips))
+        results = {ip: {} for ip in ips}
+        for index in (self.asn, self.providers):
+            if index is None:
+                continue
+            for ip, attributes in index.lookup_many(ips).items():
+                if attributes:
+                    results[ip].update(attributes)
+        return results
+
+
+_database = None
+_database_lock = threading.Lock()
+
+
+def get_ip_database() -> IPRangeDatabase:
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = IPRangeDatabase()
+        return _database
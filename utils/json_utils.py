@@ -3,15 +3,40 @@ import json
 from datetime import datetime
 from typing import Any
 
+# orjson is optional; it makes large exports several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def json_serial(obj: Any) -> Any:
     """JSON serializer for objects not serializable by default json code"""
     if isinstance(obj, datetime):
         return obj.isoformat()
     raise TypeError(f"Type {type(obj)} not serializable")
 
+# Reused for every value rendered in the terminal instead of building a new encoder per call
+_pretty_encoder = json.JSONEncoder(default=json_serial, indent=4)
+_compact_encoder = json.JSONEncoder(default=json_serial, separators=(',', ':'))
+
+
 def serialize_json(data: Any) -> str:
     """Serialize data to JSON, handling datetime objects."""
-    return json.dumps(data, default=json_serial, indent=4)
+    return _pretty_encoder.encode(data)
+
+def dumps_fast(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes on the fastest available path (orjson, else stdlib)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, default=json_serial, option=option)
+        except TypeError:
+            pass  # Fall back to the stdlib for values orjson rejects
+    if indent:
+        return json.dumps(data, default=json_serial, indent=2).encode('utf-8')
+    return _compact_encoder.encode(data).encode('utf-8')
 
 def generate_session_id() -> str:
     """Generate a unique session ID based on the current timestamp."""
@@ -0,0 +1,154 @@
+# utils/link_checker.py
+"""Concurrent link verification.
+
+Each URL is checked with HEAD and, when the server does not support HEAD, with a
+GET that asks for a single byte and is closed without reading the body. Requests
+share one keep-alive connection pool, run on a bounded worker pool and are limited
+per host. A host answering 429 or 503 is slowed down (honouring Retry-After) and
+the request is retried; the delay relaxes again as requests succeed.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+USER_AGENT = "DeepWebsiteAnalyzer/1.0"
+MAX_WORKERS = 32
+PER_HOST = 6
+TIMEOUT = 10
+MAX_RETRIES = 3
+MAX_DELAY = 30.0
+HEAD_UNSUPPORTED = {405, 501}
+THROTTLED = {429, 503}
+BROKEN = {404, 410}
+
+
+class HostLimiter:
+    """Concurrency cap and adaptive delay for one host."""
+
+    def __init__(self, concurrency: int):
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.delay = 0.0
+        self._next_request = 0.0
+        self._lock = threading.Lock()
+
+    def wait_turn(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request)
+            self._next_request = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+    def throttled(self, retry_after: float = None):
+        with self._lock:
+            self.delay = min(MAX_DELAY, max(retry_after or 0.0, self.delay * 2 or 0.5))
+            self._next_request = time.monotonic() + self.delay
+
+    def succeeded(self):
+        with self._lock:
+            if self.delay:
+                self.delay = self.delay / 2 if self.delay > 0.05 else 0.0
+
+
+def _retry_after(response) -> float:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None  # Missing or an HTTP date; fall back to exponential backoff
+
+
+class LinkChecker:
+    def __init__(self, max_workers: int = MAX_WORKERS, per_host: int = PER_HOST, timeout: int = TIMEOUT):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _limiter(self, url: str) -> HostLimiter:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = self._hosts[host] = HostLimiter(self.per_host)
+            return limiter
+
+    def _request(self, method: str, url: str):
+        if method == "HEAD":
+            return self.session.head(url, allow_redirects=True, timeout=self.timeout)
+        response = self.session.get(url, headers={"Range": "bytes=0-0"}, allow_redirects=True,
+                                    stream=True, timeout=self.timeout)
+        response.close()  # Status and headers are all we need
+        return response
+
+    def check(self, url: str) -> dict:
+        """{"URL", "Status", "Final URL", "Method", "Broken"} or with "Error" when unreachable."""
+        limiter = self._limiter(url)
+        method = "HEAD"
+        with limiter.slots:
+            for attempt in range(MAX_RETRIES + 1):
+                limiter.wait_turn()
+                try:
+                    response = self._request(method, url)
+                    if method == "HEAD" and response.status_code in HEAD_UNSUPPORTED:
+                        method = "GET"
+                        response = self._request(method, url)
+                except requests.RequestException as e:
+                    return {"URL": url, "Status": None, "Broken": True, "Error": str(e)}
+                if response.status_code in THROTTLED and attempt < MAX_RETRIES:
+                    limiter.throttled(_retry_after(response))
+                    continue
+                limiter.succeeded()
+                return {
+                    "URL": url,
+                    "Status": response.status_code,
+                    "Final URL": response.url,
+                    "Method": method,
+                    "Broken": response.status_code in BROKEN or response.status_code >= 500,
+                }
+
+    def check_many(self, urls, progress=None):
+        """Yield check() results as they complete; urls may be a generator.
+
+        progress(done, submitted) is called after each result. At most a few URLs per
+        worker are in flight, so arbitrarily long inputs use bounded memory.
+        """
+        urls = iter(urls)
+        in_flight = set()
+        done = submitted = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                while len(in_flight) < self.max_workers * 4:
+                    url = next(urls, None)
+                    if url is None:
+                        break
+                    in_flight.add(executor.submit(self._safe_check, url))
+                    submitted += 1
+                if not in_flight:
+                    return
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done += 1
+                    if progress:
+                        progress(done, submitted)
+                    yield future.result()
+
+    def _safe_check(self, url: str) -> dict:
+        try:
+            return self.check(url)
+        except Exception as e:
+            return {"URL": url, "Status": None, "Broken": True, "Error": str(e)}
+
+    def close(self):
+        self.session.close()
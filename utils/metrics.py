@@ -0,0 +1,88 @@
+# utils/metrics.py
+"""Latency histograms.
+
+LatencyHistogram records values (milliseconds) into logarithmic buckets, so
+memory stays constant however many samples are recorded, and percentiles are
+answered with a bounded relative error (2% by default) instead of by sorting
+every sample. Histograms recorded separately (per endpoint, per worker) can be
+merged.
+"""
+import math
+import threading
+
+PRECISION = 0.02  # Relative width of a bucket
+PERCENTILES = (50, 90, 99)
+SMALLEST = 1e-3  # Values below this (a microsecond) share one bucket
+_ZERO_BUCKET = -(1 << 31)
+
+
+class LatencyHistogram:
+    def __init__(self, precision: float = PRECISION):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self._buckets = {}  # bucket index -> count
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, value: float) -> int:
+        return math.floor(math.log(value) / self._log_base) if value >= SMALLEST else _ZERO_BUCKET
+
+    def _value(self, bucket: int) -> float:
+        """Midpoint of a bucket (0 for the bucket of values below SMALLEST)."""
+        if bucket == _ZERO_BUCKET:
+            return 0.0
+        return math.exp((bucket + 0.5) * self._log_base)
+
+    def record(self, value: float):
+        bucket = self._bucket(value)
+        with self._lock:
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        if other.precision != self.precision:
+            raise ValueError("Histograms with different precision cannot be merged.")
+        with other._lock:
+            buckets = dict(other._buckets)
+            count, total, low, high = other.count, other.total, other.min, other.max
+        with self._lock:
+            for bucket, bucket_count in buckets.items():
+                self._buckets[bucket] = self._buckets.get(bucket, 0) + bucket_count
+            self.count += count
+            self.total += total
+            if count:
+                self.min = low if self.min is None else min(self.min, low)
+                self.max = high if self.max is None else max(self.max, high)
+
+    def percentile(self, percent: float) -> float:
+        """Value below which percent of the samples fall, or None if there are none."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(percent / 100 * self.count))
+            seen = 0
+            for bucket in sorted(self._buckets):
+                seen += self._buckets[bucket]
+                if seen >= rank:
+                    return min(max(self._value(bucket), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else None
+
+    def summary(self, percentiles=PERCENTILES, digits: int = 2) -> dict:
+        """{"Count", "Min", "Mean", "p50", ..., "Max"}, rounded for display."""
+        def rounded(value):
+            return None if value is None else round(value, digits)
+        summary = {"Count": self.count, "Min": rounded(self.min), "Mean": rounded(self.mean)}
+        for percent in percentiles:
+            summary[f"p{percent:g}"] = rounded(self.percentile(percent))
+        summary["Max"] = rounded(self.max)
+        return summary
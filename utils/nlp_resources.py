@@ -0,0 +1,161 @@
+# utils/nlp_resources.py
+"""Shared, lazily loaded NLP resources.
+
+NLTK corpora are looked up locally and downloaded at most once per process, and
+only when missing. A failed download is recorded on disk, so offline starts do not
+retry it until RETRY_INTERVAL has passed. The sentiment analyzer, stopword set and tokenizer are built on
+first use and shared by every caller. When a resource is unavailable (for example
+offline on a fresh install) the helpers fall back to simple built-in versions.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+# NLTK resource name -> path checked with nltk.data.find
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",  # Needed by word_tokenize on NLTK >= 3.8.2
+    "stopwords": "corpora/stopwords",
+    "vader_lexicon": "sentiment/vader_lexicon.zip",
+}
+
+FALLBACK_STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+herself him himself his how i if in into is it its itself just me more most my myself no nor not now of off on
+once only or other our ours ourselves out over own same she should so some such than that the their theirs them
+themselves then there these they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+# name -> time of the last failed download, shared across runs
+UNAVAILABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "nltk_unavailable.json"
+)
+RETRY_INTERVAL = 24 * 3600
+
+_WORD_PATTERN = re.compile(r"\w+(?:'\w+)?|[^\w\s]", re.UNICODE)
+
+_lock = threading.RLock()
+_resource_status = {}  # name -> bool, checked once per process
+_analyzer = None
+_stop_words = {}
+_tokenizer = None
+
+
+def ensure_resource(name: str, download: bool = True) -> bool:
+    """Return whether an NLTK resource is available, downloading it once if it is missing.
+
+    Downloads that failed within RETRY_INTERVAL, in this or an earlier run, are not retried.
+    """
+    with _lock:
+        if name in _resource_status:
+            return _resource_status[name]
+        try:
+            import nltk
+        except ImportError:
+            _resource_status[name] = False
+            return False
+        available = _find(nltk, name)
+        unavailable = _read_unavailable()
+        if not available and download and time.time() - unavailable.get(name, 0) >= RETRY_INTERVAL:
+            try:
+                nltk.download(name, quiet=True, raise_on_error=True)
+                available = _find(nltk, name)
+            except Exception as e:
+                logger.warning(f"NLTK resource '{name}' is not available: {str(e)}")
+            if not available:
+                unavailable[name] = time.time()
+                _write_unavailable(unavailable)
+            elif unavailable.pop(name, None) is not None:
+                _write_unavailable(unavailable)
+        _resource_status[name] = available
+        return available
+
+
+def _read_unavailable() -> dict:
+    try:
+        with open(UNAVAILABLE_PATH, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        return stored if isinstance(stored, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_unavailable(unavailable: dict):
+    try:
+        os.makedirs(os.path.dirname(UNAVAILABLE_PATH), exist_ok=True)
+        with open(UNAVAILABLE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(unavailable, f)
+    except OSError as e:
+        logger.warning(f"Could not record unavailable NLTK resources: {str(e)}")
+
+
+def _find(nltk, name: str) -> bool:
+    try:
+        nltk.data.find(NLTK_RESOURCES.get(name, name))
+        return True
+    except LookupError:
+        return False
+
+
+def get_sentiment_analyzer():
+    """Shared VADER SentimentIntensityAnalyzer, or None when the lexicon is unavailable."""
+    global _analyzer
+    with _lock:
+        if _analyzer is None and ensure_resource("vader_lexicon"):
+            from nltk.sentiment import SentimentIntensityAnalyzer
+            _analyzer = SentimentIntensityAnalyzer()
+        return _analyzer
+
+
+def get_stop_words(language: str = "english") -> frozenset:
+    with _lock:
+        if language not in _stop_words:
+            words = None
+            if ensure_resource("stopwords"):
+                from nltk.corpus import stopwords
+                try:
+                    words = frozenset(stopwords.words(language))
+                except OSError:
+                    words = None
+            if words is None:
+                words = FALLBACK_STOP_WORDS if language == "english" else frozenset()
+            _stop_words[language] = words
+        return _stop_words[language]
+
+
+def get_tokenizer():
+    """Shared word tokenizer: NLTK's word_tokenize when its models are present, else a regex splitter."""
+    global _tokenizer
+    with _lock:
+        if _tokenizer is None:
+            _tokenizer = _WORD_PATTERN.findall
+            if ensure_resource("punkt"):
+                from nltk.tokenize import word_tokenize
+                for required in (None, "punkt_tab"):
+                    if required and not ensure_resource(required):
+                        break
+                    try:
+                        word_tokenize("warm up")
+                        _tokenizer = word_tokenize
+                        break
+                    except LookupError:
+                        continue
+        return _tokenizer
+
+
+def tokenize(text: str) -> list:
+    return get_tokenizer()(text)
+
+
+def warm_up():
+    """Verify corpora and build the shared instances ahead of the first analysis."""
+    get_sentiment_analyzer()
+    get_stop_words()
+    get_tokenizer()
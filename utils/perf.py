@@ -0,0 +1,234 @@
+# utils/perf.py
+"""Request-phase timing and load testing.
+
+PerformanceProbe issues plain GET requests over http.client and times each
+phase with the monotonic clock: DNS lookup, TCP connect, TLS handshake, wait
+(request sent to response headers), download (body) and total. Each worker
+keeps its connection alive between samples, so reused connections skip the
+first three phases and are reported separately from new ones. run() takes N
+samples at a given concurrency and summarizes every phase as a latency
+histogram (utils/metrics.py) with throughput. load_curve() repeats that over
+rising concurrency levels to show how latency and throughput scale.
+"""
+import http.client
+import itertools
+import socket
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+from utils.http_cache import USER_AGENT
+from utils.metrics import LatencyHistogram
+
+PHASES = ("DNS", "Connect", "TLS", "Wait", "TTFB", "Download", "Total")
+SAMPLES = 10
+CONCURRENCY = 1
+LOAD_LEVELS = (1, 2, 4)
+TIMEOUT = 10
+MAX_REDIRECTS = 5
+READ_CHUNK = 64 * 1024
+
+
+class Sample:
+    """Timings of one request, in milliseconds, for the phases it went through.
+
+    A reused connection has no DNS, Connect or TLS phase, and plain HTTP has no TLS.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.reused = False
+        self.status = None
+        self.size = 0
+        self.location = None
+
+
+class _Connection:
+    """One keep-alive connection to the target, opened with each phase timed."""
+
+    def __init__(self, url: str, timeout: int):
+        parts = urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.netloc = parts.netloc
+        self.timeout = timeout
+        self.conn = None
+        self._context = ssl.create_default_context() if self.https else None
+
+    def open(self, sample: Sample):
+        start = time.perf_counter()
+        family, kind, proto, _, address = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)[0]
+        resolved = time.perf_counter()
+        sock = socket.socket(family, kind, proto)
+        try:
+            sock.settimeout(self.timeout)
+            sock.connect(address)
+            connected = time.perf_counter()
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # As http.client does
+            if self.https:
+                sock = self._context.wrap_socket(sock, server_hostname=self.host)
+        except Exception:
+            sock.close()
+            raise
+        handshaken = time.perf_counter()
+        sample.timings["DNS"] = (resolved - start) * 1000
+        sample.timings["Connect"] = (connected - resolved) * 1000
+        if self.https:
+            sample.timings["TLS"] = (handshaken - connected) * 1000
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        self.conn = connection_class(self.host, self.port, timeout=self.timeout)
+        self.conn.sock = sock  # Already connected; http.client sends over it as is
+
+    def get(self, path: str) -> Sample:
+        reused = self.conn is not None
+        try:
+            return self._get(path)
+        except (OSError, http.client.HTTPException):
+            if not reused:
+                raise
+        return self._get(path)  # The server dropped the idle connection; once more on a new one
+
+    def _get(self, path: str) -> Sample:
+        sample = Sample()
+        start = time.perf_counter()
+        if self.conn is None:
+            self.open(sample)
+        else:
+            sample.reused = True
+        try:
+            self.conn.putrequest("GET", path, skip_host=True, skip_accept_encoding=True)
+            self.conn.putheader("Host", self.netloc)
+            self.conn.putheader("User-Agent", USER_AGENT)
+            self.conn.putheader("Accept-Encoding", "gzip, deflate")
+            self.conn.endheaders()
+            sent = time.perf_counter()
+            response = self.conn.getresponse()
+            first_byte = time.perf_counter()
+            while True:
+                chunk = response.read(READ_CHUNK)
+                if not chunk:
+                    break
+                sample.size += len(chunk)
+            done = time.perf_counter()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        sample.status = response.status
+        sample.location = response.getheader("Location")
+        sample.timings["Wait"] = (first_byte - sent) * 1000
+        sample.timings["TTFB"] = (first_byte - start) * 1000
+        sample.timings["Download"] = (done - first_byte) * 1000
+        sample.timings["Total"] = (done - start) * 1000
+        if response.will_close:
+            self.close()
+        return sample
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def _path(url: str) -> str:
+    parts = urlsplit(url)
+    return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+
+class PerformanceProbe:
+    def __init__(self, timeout: int = TIMEOUT, keep_alive: bool = True):
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+
+    def final_url(self, url: str) -> str:
+        """Follow redirects so that samples measure the page itself, not the redirect."""
+        for _ in range(MAX_REDIRECTS):
+            connection = _Connection(url, self.timeout)
+            try:
+                sample = connection.get(_path(url))
+            finally:
+                connection.close()
+            if not (300 <= sample.status < 400 and sample.location):
+                break
+            url = urljoin(url, sample.location)
+        return url
+
+    def run(self, url: str, samples: int = SAMPLES, concurrency: int = CONCURRENCY) -> dict:
+        """Take samples GET requests of url with concurrency workers and summarize them."""
+        phases = {phase: LatencyHistogram() for phase in PHASES}
+        totals = {True: LatencyHistogram(), False: LatencyHistogram()}  # Reused connection -> Total
+        statuses, errors = {}, []
+        counter, lock = itertools.count(), threading.Lock()
+        transferred = [0]
+        path = _path(url)
+
+        def worker():
+            connection = _Connection(url, self.timeout)
+            try:
+                while True:
+                    with lock:
+                        if next(counter) >= samples:
+                            return
+                    try:
+                        sample = connection.get(path)
+                    except (OSError, http.client.HTTPException) as e:
+                        with lock:
+                            errors.append(str(e))
+                        continue
+                    if not self.keep_alive:
+                        connection.close()
+                    for phase, value in sample.timings.items():
+                        phases[phase].record(value)
+                    totals[sample.reused].record(sample.timings["Total"])
+                    with lock:
+                        statuses[sample.status] = statuses.get(sample.status, 0) + 1
+                        transferred[0] += sample.size
+            finally:
+                connection.close()
+
+        workers = max(1, min(concurrency, samples))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(worker) for _ in range(workers)]:
+                future.result()
+        elapsed = time.perf_counter() - start
+        completed = sum(statuses.values())
+        return {
+            "URL": url,
+            "Samples": samples,
+            "Concurrency": concurrency,
+            "Completed": completed,
+            "Failed": len(errors),
+            "Errors": errors[:5],
+            "StatusCodes": statuses,
+            "Phases_ms": {phase: histogram.summary() for phase, histogram in phases.items() if histogram.count},
+            "ConnectionReuse": {
+                "New Connections": totals[False].count,
+                "Reused Connections": totals[True].count,
+                "New Total_ms": totals[False].summary(),
+                "Reused Total_ms": totals[True].summary(),
+            },
+            "Throughput": {
+                "Requests/s": round(completed / elapsed, 2) if elapsed else None,
+                "KB/s": round(transferred[0] / 1024 / elapsed, 2) if elapsed else None,
+                "Elapsed_s": round(elapsed, 3),
+            },
+        }
+
+    def load_curve(self, url: str, levels=LOAD_LEVELS, samples_per_level: int = SAMPLES) -> list:
+        """Latency and throughput at each concurrency level, lowest first."""
+        curve = []
+        for concurrency in levels:
+            result = self.run(url, samples_per_level, concurrency)
+            total = result["Phases_ms"].get("Total", {})
+            curve.append({
+                "Concurrency": concurrency,
+                "Completed": result["Completed"],
+                "Failed": result["Failed"],
+                "Requests/s": result["Throughput"]["Requests/s"],
+                "p50_ms": total.get("p50"),
+                "p90_ms": total.get("p90"),
+                "p99_ms": total.get("p99"),
+            })
+        return curve
@@ -0,0 +1,126 @@
+# utils/plugin_executor.py
+"""Process pool lane for CPU-bound plugins.
+
+Workers are spawned once and kept for the lifetime of the application. Each worker
+imports and instantiates the CPU-bound plugins when it starts and keeps those
+instances, so module import and warm-up costs are paid once per worker rather than
+once per run. Results cross the process boundary as JSON-compatible dicts.
+"""
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from utils.json_utils import dumps_fast
+
+MAX_WORKERS = 4
+
+_worker_plugins = {}  # (module_path, class_name) -> plugin instance, per worker process
+
+
+def plugin_location(plugin) -> tuple:
+    """(module_path, class_name) a worker process can import the plugin from."""
+    if hasattr(plugin, "module_path") and hasattr(plugin, "class_name"):
+        return plugin.module_path, plugin.class_name
+    return type(plugin).__module__, type(plugin).__qualname__
+
+
+def _worker_plugin(location: tuple):
+    plugin = _worker_plugins.get(location)
+    if plugin is None:
+        import importlib
+        module_path, class_name = location
+        plugin = getattr(importlib.import_module(module_path), class_name)()
+        plugin.warm_up()
+        _worker_plugins[location] = plugin
+    return plugin
+
+
+def _preload(locations: list):
+    for location in locations:
+        try:
+            _worker_plugin(tuple(location))
+        except Exception:
+            pass  # Reported by the run itself
+
+
+def _run_in_worker(location: tuple, target: str) -> dict:
+    result = _worker_plugin(tuple(location)).run(target)
+    # Normalize to plain JSON types so the result pickles and matches what sessions store
+    return json.loads(dumps_fast(result))
+
+
+class PluginProcessPool:
+    """Lazily started, persistent process pool for plugins that declare cpu_bound."""
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or max(1, min(MAX_WORKERS, multiprocessing.cpu_count()))
+        self._executor = None
+        self._preloaded = []  # Plugin locations each worker imports at start, kept for restarts
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self, plugins: list):
+        """Start the workers, preloading the given plugins in each of them.
+
+        Plugins passed after the workers started are remembered and preloaded when the
+        pool is restarted.
+        """
+        with self._lock:
+            for location in map(plugin_location, plugins):
+                if location not in self._preloaded:
+                    self._preloaded.append(location)
+            if self._executor is None:
+                # Spawned workers avoid forking the GUI's threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_preload,
+                    initargs=(list(self._preloaded),),
+                )
+        return self._executor
+
+    def submit(self, plugin, target: str) -> Future:
+        try:
+            return self.start([plugin]).submit(_run_in_worker, plugin_location(plugin), target)
+        except BrokenProcessPool:
+            # A worker died (e.g. crashed in a C extension); replace the pool once
+            self.shutdown()
+            return self.start([plugin]).submit(_run_in_worker, plugin_location(plugin), target)
+
+    def shutdown(self, terminate: bool = False):
+        """Stop the pool; queued runs are cancelled and, with terminate, running ones are killed.
+
+        The next submit() starts a fresh pool.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # ProcessPoolExecutor has no public way to stop busy workers before Python 3.14
+        processes = list((getattr(executor, "_processes", None) or {}).values()) if terminate else []
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_plugin_pool() -> PluginProcessPool:
+    """Shared pool used by every analysis run."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PluginProcessPool()
+        return _pool
+
+
+def shutdown_plugin_pool():
+    if _pool is not None:
+        _pool.shutdown()
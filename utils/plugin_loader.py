@@ -1,28 +1,261 @@
 # utils/plugin_loader.py
+import ast
 import os
+import json
 import importlib
+import threading
 from plugins.base_plugin import BasePlugin
 
-def load_plugins(plugin_folder: str, logger=None):
+# Next to the plugins package rather than in the working directory the app was started from
+MANIFEST_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "plugin_manifest.json"
+)
+MANIFEST_VERSION = 1
+
+
+class LazyPlugin(BasePlugin):
+    """Stand-in built from the plugin manifest that imports its module on first use.
+
+    Properties whose return value is a literal in the plugin source are served from
+    the manifest; anything else loads the real plugin and delegates to it.
+    """
+
+    def __init__(self, module_path: str, class_name: str, properties: dict, overrides: list, logger=None):
+        self.module_path = module_path
+        self.class_name = class_name
+        self.properties = properties
+        self.overrides = overrides  # Names the plugin class defines that are not literal properties
+        self.logger = logger
+        self._plugin = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._plugin is not None
+
+    def load(self) -> BasePlugin:
+        """Import the plugin module and instantiate the plugin (once)."""
+        if self._plugin is None:
+            with self._lock:
+                if self._plugin is None:
+                    module = importlib.import_module(self.module_path)
+                    self._plugin = getattr(module, self.class_name)()
+                    if self.logger:
+                        self.logger.info(f"Imported plugin module: {self.module_path}")
+        return self._plugin
+
+    def _attribute(self, attribute: str):
+        if attribute in self.properties:
+            return self.properties[attribute]
+        if attribute in self.overrides:
+            return getattr(self.load(), attribute)
+        return getattr(BasePlugin, attribute).fget(self)
+
+    @property
+    def name(self) -> str:
+        return self._attribute("name")
+
+    @property
+    def description(self) -> str:
+        return self._attribute("description")
+
+    @property
+    def data_format(self) -> str:
+        return self._attribute("data_format")
+
+    @property
+    def required_api_keys(self) -> list:
+        return self._attribute("required_api_keys")
+
+    @property
+    def cache_ttl(self) -> int:
+        return self._attribute("cache_ttl")
+
+    @property
+    def content_dependent(self) -> bool:
+        return self._attribute("content_dependent")
+
+    @property
+    def cpu_bound(self) -> bool:
+        return self._attribute("cpu_bound")
+
+    @property
+    def analyzes_pages(self) -> bool:
+        return self._attribute("analyzes_pages")
+
+    @property
+    def needs_warm_up(self) -> bool:
+        return "warm_up" in self.overrides
+
+    def warm_up(self):
+        # Importing the module is the main cost, so warming up always loads the plugin
+        self.load().warm_up()
+
+    def analyze_page(self, page) -> dict:
+        return self.load().analyze_page(page)
+
+    def merge_page_results(self, target: str, page_results: dict) -> dict:
+        return self.load().merge_page_results(target, page_results)
+
+    def run(self, target: str) -> dict:
+        return self.load().run(target)
+
+
+def needs_warm_up(plugin) -> bool:
+    """Whether the plugin defines its own warm_up; the others can stay unimported until they run."""
+    if isinstance(plugin, LazyPlugin):
+        return plugin.needs_warm_up
+    return type(plugin).warm_up is not BasePlugin.warm_up
+
+
+def scan_plugin_source(path: str) -> list:
+    """Extract plugin classes and their literal properties from source, without importing it.
+
+    :return: [{"class": ..., "properties": {...}, "overrides": [...]}, ...]
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    classes = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if not any(isinstance(base, ast.Name) and base.id == "BasePlugin" for base in node.bases):
+            continue
+        properties = {}
+        overrides = []
+        for item in node.body:
+            if not isinstance(item, ast.FunctionDef):
+                continue
+            value = _literal_property(item)
+            if value is _NOT_LITERAL:
+                overrides.append(item.name)
+            else:
+                properties[item.name] = value
+        classes.append({"class": node.name, "properties": properties, "overrides": overrides})
+    return classes
+
+
+_NOT_LITERAL = object()
+
+
+def _literal_property(func: ast.FunctionDef):
+    # Only "@property def x(self): return <literal>" qualifies
+    if not any(isinstance(d, ast.Name) and d.id == "property" for d in func.decorator_list):
+        return _NOT_LITERAL
+    body = [stmt for stmt in func.body
+            if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant))]
+    if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+        return _NOT_LITERAL
+    try:
+        return ast.literal_eval(body[0].value)
+    except ValueError:
+        return _NOT_LITERAL
+
+
+def read_manifest(manifest_path: str = MANIFEST_PATH) -> dict:
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "modules": {}}
+
+
+def write_manifest(manifest: dict, manifest_path: str = MANIFEST_PATH):
+    directory = os.path.dirname(manifest_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(temp_path, manifest_path)
+
+
+def build_manifest(plugin_folder: str, manifest_path: str = MANIFEST_PATH, logger=None) -> dict:
+    """Return the manifest for plugin_folder, rescanning only files whose mtime or size changed."""
+    manifest = read_manifest(manifest_path)
+    cached = manifest["modules"]
+    modules = {}
+    changed = False
+    for filename in os.listdir(plugin_folder):
+        if not filename.endswith(".py") or filename == "base_plugin.py":
+            continue
+        path = os.path.join(plugin_folder, filename)
+        stat = os.stat(path)
+        entry = cached.get(filename)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            modules[filename] = entry
+            continue
+        try:
+            classes = scan_plugin_source(path)
+        except (SyntaxError, UnicodeDecodeError) as e:
+            if logger:
+                logger.error(f"Failed to scan plugin '{filename}': {str(e)}")
+            classes = None  # Let the import report the error
+        modules[filename] = {
+            "module": f"plugins.{filename[:-3]}",
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "classes": classes,
+        }
+        changed = True
+    if changed or set(modules) != set(cached):
+        manifest["modules"] = modules
+        try:
+            write_manifest(manifest, manifest_path)
+        except OSError as e:
+            if logger:
+                logger.warning(f"Failed to write plugin manifest: {str(e)}")
+    return manifest
+
+
+def _import_plugins(module_path: str, logger=None) -> list:
+    plugins = []
+    module = importlib.import_module(module_path)
+    for attribute in dir(module):
+        attribute_obj = getattr(module, attribute)
+        if isinstance(attribute_obj, type) and issubclass(attribute_obj, BasePlugin) and attribute_obj != BasePlugin:
+            plugin_instance = attribute_obj()
+            plugins.append(plugin_instance)
+            if logger:
+                logger.info(f"Loaded plugin: {plugin_instance.name}")
+    return plugins
+
+
+def load_plugins(plugin_folder: str, logger=None, lazy: bool = True, manifest_path: str = MANIFEST_PATH):
+    """Load plugins from plugin_folder.
+
+    With lazy=True plugins are listed from the cached manifest and their modules are
+    only imported when first run. Modules whose plugin name or description is not a
+    literal in the source are imported eagerly.
+    """
     plugins = []
     if not os.path.exists(plugin_folder):
         if logger:
             logger.error(f"Plugin folder '{plugin_folder}' does not exist.")
         return plugins
 
+    manifest = build_manifest(plugin_folder, manifest_path, logger=logger) if lazy else None
     for filename in os.listdir(plugin_folder):
         if filename.endswith(".py") and filename != "base_plugin.py":
             module_name = filename[:-3]
             module_path = f"plugins.{module_name}"
+            entry = manifest["modules"].get(filename) if manifest else None
+            classes = entry["classes"] if entry else None
+            if classes and all("name" in c["properties"] and "description" in c["properties"] for c in classes):
+                for plugin_class in classes:
+                    plugin_instance = LazyPlugin(
+                        entry["module"], plugin_class["class"], plugin_class["properties"], plugin_class["overrides"],
+                        logger=logger
+                    )
+                    plugins.append(plugin_instance)
+                    if logger:
+                        logger.info(f"Listed plugin: {plugin_instance.name}")
+                continue
             try:
-                module = importlib.import_module(module_path)
-                for attribute in dir(module):
-                    attribute_obj = getattr(module, attribute)
-                    if isinstance(attribute_obj, type) and issubclass(attribute_obj, BasePlugin) and attribute_obj != BasePlugin:
-                        plugin_instance = attribute_obj()
-                        plugins.append(plugin_instance)
-                        if logger:
-                            logger.info(f"Loaded plugin: {plugin_instance.name}")
+                plugins.extend(_import_plugins(module_path, logger=logger))
             except Exception as e:
                 if logger:
                     logger.error(f"Failed to load plugin '{module_name}': {str(e)}")
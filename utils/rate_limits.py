@@ -0,0 +1,171 @@
+# utils/rate_limits.py
+"""Rate-limit probing.
+
+RateLimitProbe sends each endpoint a ramp of request stages, each at a higher
+concurrency than the last, and records every request's latency. Endpoints are
+probed concurrently. An endpoint is finished as soon as its limit is known:
+on the first 429 (or 503 with Retry-After), once advertised rate-limit headers
+(RateLimit-*, X-RateLimit-*, RateLimit-Policy) have been read, or when the
+request budget is spent without any sign of throttling.
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from requests.adapters import HTTPAdapter
+from utils.http_cache import USER_AGENT
+from utils.metrics import LatencyHistogram
+
+# (requests, concurrency) per stage; 35 requests at most per endpoint
+DEFAULT_STAGES = ((5, 1), (10, 5), (20, 10))
+MAX_ENDPOINTS = 5
+MAX_WORKERS = 20
+TIMEOUT = 10
+ADVERTISED_CONFIRMATIONS = 3  # Requests that must agree on advertised headers before stopping
+HEADER_PREFIXES = ("ratelimit-", "x-ratelimit-", "x-rate-limit-")
+
+_STRUCTURED_FIELD = re.compile(r"\b(limit|remaining|reset)\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def advertised_limits(headers) -> dict:
+    """Rate-limit headers of a response as {"Limit", "Remaining", "Reset", "Policy"}."""
+    limits = {}
+    for name, value in headers.items():
+        lowered = name.lower()
+        if lowered == "ratelimit":
+            # Structured form: "limit=100, remaining=50, reset=30"
+            for field, number in _STRUCTURED_FIELD.findall(value):
+                limits.setdefault(field.capitalize(), int(number))
+        elif lowered.endswith("policy") and lowered.startswith(HEADER_PREFIXES):
+            limits["Policy"] = value
+        elif lowered.startswith(HEADER_PREFIXES):
+            field = lowered.rsplit("-", 1)[-1].capitalize()
+            if field in ("Limit", "Remaining", "Reset"):
+                try:
+                    limits.setdefault(field, int(float(value.split(",")[0].split(";")[0])))
+                except ValueError:
+                    limits.setdefault(field, value)
+    return limits
+
+
+def retry_after(headers):
+    try:
+        return float(headers.get("Retry-After", ""))
+    except ValueError:
+        return headers.get("Retry-After")  # An HTTP date, reported as sent
+
+
+class EndpointProbe:
+    """State of one endpoint's probe."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.status_codes = []
+        self.latency = LatencyHistogram()
+        self.throttled_after = None  # Responses received before the first throttled one
+        self.onset_concurrency = None
+        self.retry_after = None
+        self.advertised = {}
+        self.advertised_seen = 0
+        self.errors = []
+        self.stopped_because = None
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.stopped_because is not None
+
+    def record(self, response, elapsed_ms: float, concurrency: int):
+        with self._lock:
+            self.status_codes.append(response.status_code)
+            self.latency.record(elapsed_ms)
+            limits = advertised_limits(response.headers)
+            if limits:
+                self.advertised = limits
+                self.advertised_seen += 1
+            throttled = response.status_code == 429 or (
+                response.status_code == 503 and "Retry-After" in response.headers
+            )
+            if throttled and self.throttled_after is None:
+                self.throttled_after = len(self.status_codes) - 1
+                self.onset_concurrency = concurrency
+                self.retry_after = retry_after(response.headers)
+                self.stopped_because = "Throttled"
+            elif limits.get("Remaining") == 0 and self.stopped_because is None:
+                self.stopped_because = "Limit exhausted"
+            elif self.advertised_seen >= ADVERTISED_CONFIRMATIONS and self.stopped_because is None:
+                self.stopped_because = "Limit advertised"
+
+    def result(self, elapsed: float) -> dict:
+        return {
+            "StatusCodes": self.status_codes,
+            "RateLimitDetected": self.throttled_after is not None or bool(self.advertised),
+            "ThrottledAfterRequests": self.throttled_after,
+            "OnsetConcurrency": self.onset_concurrency,
+            "RetryAfter": self.retry_after,
+            "AdvertisedLimits": self.advertised,
+            "StoppedBecause": self.stopped_because or "Request budget spent",
+            "Latency_ms": self.latency.summary(),
+            "Errors": self.errors[:5],
+            "Elapsed_s": round(elapsed, 2),
+        }
+
+
+class RateLimitProbe:
+    def __init__(self, stages=DEFAULT_STAGES, max_workers: int = MAX_WORKERS, timeout: int = TIMEOUT):
+        self.stages = stages
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.latency = LatencyHistogram()  # All endpoints together
+
+    def _request(self, probe: EndpointProbe, concurrency: int):
+        if probe.done:
+            return  # Limit found while this request was queued
+        start = time.perf_counter()
+        try:
+            with self.session.get(probe.url, timeout=self.timeout, stream=True) as response:
+                elapsed_ms = (time.perf_counter() - start) * 1000  # Time to response headers
+        except requests.RequestException as e:
+            probe.errors.append(str(e))
+            return
+        probe.record(response, elapsed_ms, concurrency)
+
+    def _probe_endpoint(self, url: str, executor: ThreadPoolExecutor) -> dict:
+        probe = EndpointProbe(url)
+        start = time.perf_counter()
+        for count, concurrency in self.stages:
+            sent = 0
+            while sent < count and not probe.done:
+                batch = min(concurrency, count - sent)
+                futures = [executor.submit(self._request, probe, concurrency) for _ in range(batch)]
+                for future in as_completed(futures):
+                    future.result()
+                sent += batch
+                if len(probe.errors) >= 3 and not probe.status_codes:
+                    probe.stopped_because = "Unreachable"
+            if probe.done:
+                break
+        self.latency.merge(probe.latency)
+        return probe.result(time.perf_counter() - start)
+
+    def run(self, urls: list) -> dict:
+        """{url: result} for every endpoint, probed concurrently."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as requests_pool, \
+                ThreadPoolExecutor(max_workers=max(1, len(urls))) as endpoints_pool:
+            futures = {endpoints_pool.submit(self._probe_endpoint, url, requests_pool): url for url in urls}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = {"Error": str(e)}
+        return {url: results[url] for url in urls}
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,207 @@
+# utils/robots.py
+"""Shared robots.txt service.
+
+The crawler and several plugins need a host's robots.txt. get() fetches it once
+per host (concurrent callers wait for the first fetch), keeps the parsed rules for
+an hour and answers can_fetch() by longest-match rule precedence as in RFC 9309,
+with "*" and "$" wildcards. As the RFC requires, a robots.txt answered with a 4xx
+status allows everything, while a server error (5xx) or an unreachable host
+disallows everything. Sitemaps and crawl delays are exposed as parsed.
+"""
+import logging
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from utils.http_cache import USER_AGENT
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+DEFAULT_TTL = 3600  # Seconds; RFC 9309 allows caching for up to a day
+TIMEOUT = 10
+MAX_BYTES = 512 * 1024  # Crawlers must parse at least 500 KiB; anything after is ignored
+MAX_PATH_CACHE = 4096
+
+
+def _agent_token(user_agent: str) -> str:
+    """Product token used for group matching: 'DeepWebsiteAnalyzer/1.0' -> 'deepwebsiteanalyzer'."""
+    return user_agent.split("/", 1)[0].strip().lower()
+
+
+class RobotsRuleGroup:
+    """Allow/Disallow rules of one user-agent group, ordered for first-match lookup."""
+
+    def __init__(self):
+        self.rules = []  # (allow, path pattern) in file order
+        self.crawl_delay = None
+        self._matchers = None
+        self._cache = {}
+
+    def add(self, allow: bool, pattern: str):
+        self.rules.append((allow, pattern))
+        self._matchers = None
+
+    def _compile(self):
+        matchers = []
+        for allow, pattern in self.rules:
+            if "*" in pattern or pattern.endswith("$"):
+                anchored = pattern.endswith("$")
+                body = pattern[:-1] if anchored else pattern
+                regex = "".join(".*" if c == "*" else re.escape(c) for c in body) + ("$" if anchored else "")
+                matchers.append((len(pattern), allow, re.compile(regex).match))
+            else:
+                matchers.append((len(pattern), allow, pattern))
+        # Longest pattern first; on equal length Allow wins
+        matchers.sort(key=lambda m: (-m[0], not m[1]))
+        self._matchers = matchers
+
+    def allowed(self, path: str) -> bool:
+        cached = self._cache.get(path)
+        if cached is not None:
+            return cached
+        if self._matchers is None:
+            self._compile()
+        result = True
+        for _, allow, matcher in self._matchers:
+            if matcher(path) if callable(matcher) else path.startswith(matcher):
+                result = allow
+                break
+        if len(self._cache) < MAX_PATH_CACHE:
+            self._cache[path] = result
+        return result
+
+
+class RobotsRules:
+    """Parsed robots.txt of one host."""
+
+    def __init__(self, url: str, text: str = "", status: int = None, error: str = None):
+        self.url = url
+        self.text = text
+        self.status = status
+        self.error = error
+        self.groups = {}  # lower-cased user-agent token -> RobotsRuleGroup
+        self.sitemaps = []
+        self.fetched_at = time.monotonic()
+        self._parse(text)
+
+    @property
+    def found(self) -> bool:
+        return self.status == 200
+
+    @property
+    def unavailable(self) -> bool:
+        """True after a server error or a failed request; every URL is then disallowed."""
+        return self.error is not None or (self.status or 0) >= 500
+
+    def _parse(self, text: str):
+        current = []  # Groups the following rules apply to
+        in_agents = False  # Consecutive User-agent lines share one group
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = (part.strip() for part in line.split(":", 1))
+            field = field.lower()
+            if field == "user-agent":
+                if not in_agents:
+                    current = []
+                in_agents = True
+                current.append(self.groups.setdefault(value.lower(), RobotsRuleGroup()))
+                continue
+            in_agents = False
+            if field == "sitemap":
+                if value and value not in self.sitemaps:
+                    self.sitemaps.append(value)
+            elif field in ("allow", "disallow"):
+                if value:  # An empty Disallow allows everything
+                    for group in current:
+                        group.add(field == "allow", value)
+            elif field == "crawl-delay":
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for group in current:
+                    group.crawl_delay = delay
+
+    def group(self, user_agent: str = USER_AGENT) -> RobotsRuleGroup:
+        """The group for user_agent, else the '*' group, else None."""
+        return self.groups.get(_agent_token(user_agent)) or self.groups.get("*")
+
+    def can_fetch(self, url: str, user_agent: str = USER_AGENT) -> bool:
+        if self.unavailable:
+            return False
+        group = self.group(user_agent)
+        if group is None:
+            return True
+        parts = urlsplit(url)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        return group.allowed(path)
+
+    def crawl_delay(self, user_agent: str = USER_AGENT):
+        group = self.group(user_agent)
+        return group.crawl_delay if group else None
+
+    def disallowed(self, user_agent: str = None) -> list:
+        """Disallowed paths for user_agent, or of every group when user_agent is None."""
+        groups = self.groups.values() if user_agent is None else [self.group(user_agent)]
+        paths = [pattern for group in groups if group for allow, pattern in group.rules if not allow]
+        return list(dict.fromkeys(paths))
+
+
+def robots_url(url: str) -> str:
+    parts = urlsplit(url if "://" in url else "http://" + url)
+    return f"{parts.scheme}://{parts.netloc}/robots.txt"
+
+
+class RobotsService:
+    def __init__(self, ttl: int = DEFAULT_TTL, session=None):
+        self.ttl = ttl
+        self.session = session or requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self._rules = {}  # robots.txt URL -> RobotsRules
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> RobotsRules:
+        """Rules for the host of url; a missing robots.txt allows everything, an unreachable one nothing."""
+        location = robots_url(url)
+        with self._lock:
+            host_lock = self._locks.setdefault(location, threading.Lock())
+        with host_lock:
+            rules = self._rules.get(location)
+            if rules is None or time.monotonic() - rules.fetched_at > self.ttl:
+                rules = self._rules[location] = self._fetch(location)
+            return rules
+
+    def _fetch(self, location: str) -> RobotsRules:
+        try:
+            with self.session.get(location, timeout=TIMEOUT, stream=True) as response:
+                if response.status_code != 200:
+                    return RobotsRules(location, status=response.status_code)
+                body = response.raw.read(MAX_BYTES, decode_content=True)
+                return RobotsRules(location, body.decode("utf-8", "replace"), 200)  # RFC 9309: UTF-8
+        except requests.RequestException as e:
+            logger.warning(f"Failed to fetch {location}: {str(e)}")
+            return RobotsRules(location, error=str(e))
+
+    def can_fetch(self, url: str, user_agent: str = USER_AGENT) -> bool:
+        return self.get(url).can_fetch(url, user_agent)
+
+    def clear(self):
+        with self._lock:
+            self._rules.clear()
+            self._locks.clear()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_robots_service() -> RobotsService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = RobotsService()
+        return _service
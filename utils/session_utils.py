@@ -0,0 +1,316 @@
+# utils/session_utils.py
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Iterator, Optional
+from utils.json_utils import json_serial
+from utils import compact_session
+from utils.compact_session import COMPACT_EXTENSION, CompactSessionWriter
+from utils.target import resolve_target
+
+# Keys stored alongside plugin results in a session that are not plugin results themselves
+SESSION_META_KEYS = ("Target", "Timestamp", "Validators", "RunTimes", "Changes")
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Streaming sessions are JSON Lines: a header record, one record per plugin result,
+# then a meta record and an index record mapping plugin names to byte offsets.
+# While a run is in progress the file carries the PARTIAL_SUFFIX.
+# Compact sessions (see utils/compact_session.py) use the same records in a binary container.
+STREAM_EXTENSION = ".jsonl"
+LEGACY_EXTENSION = ".json"
+PARTIAL_SUFFIX = ".part"
+
+
+def session_target_key(target: str) -> str:
+    """Normalize a target so sessions for 'example.com' and 'https://example.com/' match."""
+    return resolve_target(target).key
+
+
+def plugin_results(session_data: dict) -> dict:
+    """Return only the plugin results of a session, without the metadata keys."""
+    return {k: v for k, v in session_data.items() if k not in SESSION_META_KEYS}
+
+
+class SessionWriter:
+    """Append-only session writer that persists each plugin result as it arrives.
+
+    Records are flushed and fsynced one by one, so a crash loses at most the result
+    being written. finalize() appends the index and atomically renames the file.
+    """
+
+    def __init__(self, cache_dir: str, session_id: str, target: str, timestamp: str):
+        self.session_id = session_id
+        self.path = os.path.join(cache_dir, f"{session_id}{STREAM_EXTENSION}")
+        self.partial_path = self.path + PARTIAL_SUFFIX
+        self.offsets = {}
+        self._file = open(self.partial_path, 'wb')
+        self._append({"Type": "Header", "Target": target, "Timestamp": timestamp})
+
+    def _append(self, record: dict) -> int:
+        offset = self._file.tell()
+        line = json.dumps(record, default=json_serial, separators=(',', ':')) + "\n"
+        self._file.write(line.encode('utf-8'))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return offset
+
+    def write_result(self, plugin_name: str, result: Any, run_time: Optional[str] = None):
+        """Persist a single plugin result."""
+        record = {"Type": "Result", "Plugin": plugin_name, "Result": result}
+        if run_time:
+            record["RunTime"] = run_time
+        self.offsets[plugin_name] = self._append(record)
+
+    def finalize(self, meta: Optional[dict] = None) -> str:
+        """Write the meta and index records and move the session into place."""
+        meta_offset = self._append(dict(meta or {}, Type="Meta"))
+        self._append({"Type": "Index", "Offsets": self.offsets, "Meta": meta_offset})
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+        return self.path
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+
+def open_session_writer(cache_dir: str, session_id: str, target: str, timestamp: str, compact: bool = False):
+    """Create a streaming session writer in the JSON Lines or compact binary format."""
+    if compact:
+        return CompactSessionWriter(cache_dir, session_id, target, timestamp, partial_suffix=PARTIAL_SUFFIX)
+    return SessionWriter(cache_dir, session_id, target, timestamp)
+
+
+def _is_compact(session_path: str) -> bool:
+    return session_path.endswith((COMPACT_EXTENSION, COMPACT_EXTENSION + PARTIAL_SUFFIX))
+
+
+def _is_streamed(session_path: str) -> bool:
+    return _is_compact(session_path) or session_path.endswith((STREAM_EXTENSION, STREAM_EXTENSION + PARTIAL_SUFFIX))
+
+
+def _iter_records(session_path: str) -> Iterator[dict]:
+    if _is_compact(session_path):
+        yield from compact_session.iter_records(session_path)
+        return
+    # A truncated trailing line (crash mid-write) is skipped
+    with open(session_path, 'rb') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _read_index(session_path: str) -> Optional[dict]:
+    """Read the trailing index record without parsing the rest of the file."""
+    with open(session_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        chunk = b""
+        position = end
+        # Read backwards until the start of the last line is found
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step) + chunk
+            if chunk.rstrip(b"\n").rfind(b"\n") != -1:
+                break
+        last_line = chunk.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+    try:
+        record = json.loads(last_line)
+    except ValueError:
+        return None
+    return record if record.get("Type") == "Index" else None
+
+
+def _read_record_at(session_path: str, offset: int) -> dict:
+    with open(session_path, 'rb') as f:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+
+def read_session_header(session_path: str) -> dict:
+    """Return the Target and Timestamp of a session, reading as little as possible."""
+    if not _is_streamed(session_path):
+        session_data = load_session(session_path)
+        return {"Target": session_data.get("Target", "N/A"), "Timestamp": session_data.get("Timestamp", "N/A")}
+    header = next(_iter_records(session_path), None)
+    if header is None:
+        raise ValueError("Session has no header record.")
+    return {"Target": header.get("Target", "N/A"), "Timestamp": header.get("Timestamp", "N/A")}
+
+
+def read_plugin_result(session_path: str, plugin_name: str) -> Optional[Any]:
+    """Load a single plugin's result, using the index to avoid parsing the whole session."""
+    if not _is_streamed(session_path):
+        return load_session(session_path).get(plugin_name)
+    compact = _is_compact(session_path)
+    index = compact_session.read_index(session_path) if compact else _read_index(session_path)
+    if index is not None:
+        offset = index.get("Offsets", {}).get(plugin_name)
+        if offset is None:
+            return None
+        read_record_at = compact_session.read_record_at if compact else _read_record_at
+        return read_record_at(session_path, offset).get("Result")
+    for record in _iter_records(session_path):
+        if record.get("Type") == "Result" and record.get("Plugin") == plugin_name:
+            return record.get("Result")
+    return None
+
+
+def load_session(session_path: str) -> dict:
+    """Load a cached session file (streaming, compact or legacy JSON) into a single dict."""
+    if not _is_streamed(session_path):
+        with open(session_path, 'r') as f:
+            return json.load(f)
+    session_data = {}
+    run_times = {}
+    for record in _iter_records(session_path):
+        record_type = record.pop("Type", None)
+        if record_type == "Header":
+            session_data.update(record)
+        elif record_type == "Result":
+            session_data[record["Plugin"]] = record.get("Result")
+            if record.get("RunTime"):
+                run_times[record["Plugin"]] = record["RunTime"]
+        elif record_type == "Meta":
+            session_data.update(record)
+        elif record_type == "Index":
+            break
+    if run_times:
+        session_data["RunTimes"] = dict(run_times, **session_data.get("RunTimes", {}))
+    return session_data
+
+
+def recover_session(partial_path: str) -> str:
+    """Finalize a session left behind by an interrupted run and return its final path."""
+    final_path = partial_path[:-len(PARTIAL_SUFFIX)]
+    if _is_compact(partial_path):
+        return compact_session.recover(partial_path, final_path)
+    offsets = {}
+    valid_end = 0
+    with open(partial_path, 'rb') as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            valid_end = f.tell()
+            if record.get("Type") == "Result":
+                offsets[record["Plugin"]] = offset
+    with open(partial_path, 'r+b') as f:
+        # Drop any truncated tail, then append the index like finalize() would
+        f.truncate(valid_end)
+        f.seek(valid_end)
+        f.write(json.dumps({"Type": "Index", "Offsets": offsets}).encode('utf-8') + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial_path, final_path)
+    return final_path
+
+
+def session_id_from_file(session_file: str) -> Optional[str]:
+    """Map a cache file name to its session ID, or None for non-session files."""
+    for extension in (STREAM_EXTENSION, COMPACT_EXTENSION, LEGACY_EXTENSION):
+        if session_file.endswith(extension):
+            return session_file[:-len(extension)]
+    return None
+
+
+def session_file_path(cache_dir: str, session_id: str) -> Optional[str]:
+    """Return the path of a finalized session, preferring the streaming formats."""
+    for extension in (STREAM_EXTENSION, COMPACT_EXTENSION, LEGACY_EXTENSION):
+        path = os.path.join(cache_dir, f"{session_id}{extension}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def list_sessions(cache_dir: str) -> list:
+    """List finalized sessions as (session_id, path) tuples, newest first."""
+    if not os.path.isdir(cache_dir):
+        return []
+    sessions = []
+    for session_file in os.listdir(cache_dir):
+        session_id = session_id_from_file(session_file)
+        if session_id is not None:
+            sessions.append((session_id, os.path.join(cache_dir, session_file)))
+    # Session IDs are timestamps, so reverse name order is newest first
+    return sorted(sessions, reverse=True)
+
+
+def find_latest_session(cache_dir: str, target: str) -> Optional[dict]:
+    """Return the most recent cached session for the given target, or None."""
+    key = session_target_key(target)
+    for session_id, session_path in list_sessions(cache_dir):
+        try:
+            if session_target_key(read_session_header(session_path).get("Target", "")) != key:
+                continue
+            return load_session(session_path)
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def is_result_fresh(run_time: Optional[str], ttl: int, now: Optional[datetime] = None) -> bool:
+    """Check whether a result produced at run_time is still within its TTL (seconds)."""
+    if not run_time or ttl <= 0:
+        return False
+    try:
+        produced = datetime.strptime(run_time, TIMESTAMP_FORMAT)
+    except ValueError:
+        return False
+    now = now or datetime.now()
+    return now - produced < timedelta(seconds=ttl)
+
+
+def validators_match(old: Optional[dict], new: Optional[dict]) -> bool:
+    """Compare root page validators (ETag, Last-Modified, Content-Hash).
+
+    Only validators present in both sessions are compared; with nothing to compare
+    the content is treated as changed.
+    """
+    if not old or not new:
+        return False
+    shared = [k for k in new if k in old]
+    if not shared:
+        return False
+    return all(old[k] == new[k] for k in shared)
+
+
+def diff_results(old: Any, new: Any, prefix: str = "") -> dict:
+    """Structured diff of two plugin results as dotted key paths.
+
+    :return: {"Added": [...], "Removed": [...], "Changed": [...]}
+    """
+    diff = {"Added": [], "Removed": [], "Changed": []}
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in new:
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if key not in old:
+                diff["Added"].append(path)
+            else:
+                sub = diff_results(old[key], new[key], path)
+                for kind in diff:
+                    diff[kind].extend(sub[kind])
+        for key in old:
+            if key not in new:
+                diff["Removed"].append(f"{prefix}.{key}" if prefix else str(key))
+    elif _normalize(old) != _normalize(new):
+        diff["Changed"].append(prefix or "(value)")
+    return diff
+
+
+def _normalize(value: Any) -> Any:
+    # Round-trip through JSON so cached values (strings for datetimes, lists for tuples) compare equal
+    try:
+        return json.loads(json.dumps(value, default=str, sort_keys=True))
+    except (TypeError, ValueError):
+        return str(value)
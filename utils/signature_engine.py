@@ -0,0 +1,176 @@
+# utils/signature_engine.py
+"""Single-pass header and body signature matching.
+
+Signatures live in JSON files under resources/signatures. Each file holds one
+group (for example "waf") and a list of signatures:
+
+    {"name": "Cloudflare", "category": "Firewalls", "pattern": "cloudflare",
+     "headers": ["Server"], "body": false, "status": [403], "regex": false, "anchor": "..."}
+
+- headers: header names whose values are matched; "*" matches any header and a
+  trailing "*" matches a name prefix. Omit to skip headers.
+- body: match the response body.
+- status: only report body matches for these status codes.
+- regex/anchor: regular-expression signatures must name a literal anchor that
+  every match contains; the regex is only evaluated around anchor hits.
+
+All literals (plain patterns and anchors) are compiled into one lower-cased
+alternation per engine, so headers and body are each scanned once regardless of
+how many signatures or plugins are involved.
+"""
+import bisect
+import json
+import os
+import re
+import threading
+
+SIGNATURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "signatures"
+)
+ANCHOR_WINDOW = 1024  # Characters around an anchor hit in which a body regex must match
+
+
+class SignatureMatches:
+    """Signatures found by one scan, queried by group and category."""
+
+    def __init__(self, signatures: list, matched: set):
+        self._signatures = signatures
+        self.matched = matched  # Signature indexes
+
+    def names(self, group: str, category: str = None) -> list:
+        names = []
+        for index in sorted(self.matched):
+            signature = self._signatures[index]
+            if signature["group"] != group or (category is not None and signature.get("category") != category):
+                continue
+            if signature["name"] not in names:
+                names.append(signature["name"])
+        return names
+
+    def __bool__(self):
+        return bool(self.matched)
+
+
+class SignatureEngine:
+    def __init__(self, signatures: list):
+        self.signatures = signatures
+        self._literal_index = {}  # literal -> [(signature index, is_anchor)]
+        self._regexes = {}
+        for index, signature in enumerate(signatures):
+            if signature.get("regex"):
+                if not signature.get("anchor"):
+                    raise ValueError(f"Regex signature '{signature['name']}' needs a literal anchor.")
+                self._regexes[index] = re.compile(signature["pattern"], re.IGNORECASE)
+                literal = signature["anchor"].lower()
+            else:
+                literal = signature["pattern"].lower()
+            self._literal_index.setdefault(literal, []).append(index)
+        literals = sorted(self._literal_index, key=len, reverse=True)
+        # A hit on a literal implies a hit on every literal it contains
+        self._implied = {
+            literal: [other for other in literals if other in literal] for literal in literals
+        }
+        self._automaton = re.compile("|".join(re.escape(literal) for literal in literals)) if literals else None
+
+    @classmethod
+    def from_directory(cls, directory: str = SIGNATURES_DIR) -> "SignatureEngine":
+        signatures = []
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for signature in data["signatures"]:
+                signatures.append(dict(signature, group=data["group"]))
+        return cls(signatures)
+
+    def _hits(self, text: str):
+        """Yield (start, literal) for every literal occurrence, overlapping ones included."""
+        if self._automaton is None:
+            return
+        search = self._automaton.search
+        match = search(text)
+        while match:
+            for literal in self._implied[match.group()]:
+                yield match.start(), literal
+            match = search(text, match.start() + 1)
+
+    def scan(self, headers=None, body: str = "", status: int = None) -> SignatureMatches:
+        """Match every signature against the headers and body in one pass over each."""
+        matched = set()
+        if headers:
+            self._scan_headers(headers, matched)
+        if body:
+            self._scan_body(body, status, matched)
+        return SignatureMatches(self.signatures, matched)
+
+    def _scan_headers(self, headers, matched: set):
+        lines = [(str(name), str(value).replace("\n", " ")) for name, value in headers.items()]
+        blob_parts = []
+        value_starts = []
+        position = 0
+        for name, value in lines:
+            line = f"{name}: {value}\n"
+            value_starts.append(position + len(name) + 2)
+            blob_parts.append(line)
+            position += len(line)
+        blob = "".join(blob_parts).lower()
+        for start, literal in self._hits(blob):
+            line_number = bisect.bisect_right(value_starts, start) - 1
+            if line_number < 0:
+                continue
+            name, value = lines[line_number]
+            if start + len(literal) > value_starts[line_number] + len(value):
+                continue  # Literal spans into the next line
+            for index in self._literal_index[literal]:
+                if index in matched:
+                    continue
+                signature = self.signatures[index]
+                if not _header_selected(signature.get("headers"), name):
+                    continue
+                if index in self._regexes and not self._regexes[index].search(value):
+                    continue
+                matched.add(index)
+
+    def _scan_body(self, body: str, status: int, matched: set):
+        lowered = body.lower()
+        for start, literal in self._hits(lowered):
+            for index in self._literal_index[literal]:
+                if index in matched:
+                    continue
+                signature = self.signatures[index]
+                if not signature.get("body"):
+                    continue
+                if signature.get("status") and status not in signature["status"]:
+                    continue
+                if index in self._regexes:
+                    window = body[max(0, start - ANCHOR_WINDOW):start + len(literal) + ANCHOR_WINDOW]
+                    if not self._regexes[index].search(window):
+                        continue
+                matched.add(index)
+
+
+def _header_selected(selectors, name: str) -> bool:
+    if not selectors:
+        return False
+    name = name.lower()
+    for selector in selectors:
+        selector = selector.lower()
+        if selector == "*" or selector == name:
+            return True
+        if selector.endswith("*") and name.startswith(selector[:-1]):
+            return True
+    return False
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_signature_engine() -> SignatureEngine:
+    """Shared engine built from resources/signatures on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = SignatureEngine.from_directory()
+        return _engine
@@ -0,0 +1,99 @@
+# utils/simhash.py
+"""Near-duplicate detection with SimHash.
+
+Each page body is reduced to a 64-bit fingerprint of its word shingles, so pages
+that differ only in a few words (pagination, sort order, facets, timestamps) get
+fingerprints a few bits apart. SimHashIndex finds a stored fingerprint within a
+Hamming distance in a few dictionary lookups: with the fingerprint split into
+max_distance + 1 blocks, any fingerprint that close shares at least one block exactly.
+"""
+import hashlib
+import re
+import threading
+from collections import Counter
+
+BITS = 64
+SHINGLE_SIZE = 3
+MAX_DISTANCE = 3  # Bits; about 95% shared shingles
+MIN_TOKENS = 20  # Pages with less text are too short to call near-duplicates
+
+_SCRIPTS = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAGS = re.compile(r"<[^>]*>")
+_WORDS = re.compile(r"\w+")
+
+
+def tokenize(html: str) -> list:
+    """Lower-cased words of an HTML page without markup, scripts and styles."""
+    return _WORDS.findall(_TAGS.sub(" ", _SCRIPTS.sub(" ", html)).lower())
+
+
+def simhash(tokens: list, shingle_size: int = SHINGLE_SIZE) -> int:
+    """64-bit SimHash of the token shingles, weighted by how often each occurs."""
+    if len(tokens) < shingle_size:
+        shingles = Counter([" ".join(tokens)])
+    else:
+        shingles = Counter(" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1))
+    # Sum weights per byte value first: 8 updates per shingle instead of 64 bit tests
+    tables = [[0] * 256 for _ in range(BITS // 8)]
+    total = 0
+    for shingle, weight in shingles.items():
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=BITS // 8).digest()
+        for table, byte in zip(tables, digest):
+            table[byte] += weight
+        total += weight
+    fingerprint = 0
+    for position, table in enumerate(tables):
+        for bit in range(8):
+            mask = 1 << bit
+            if 2 * sum(weight for byte, weight in enumerate(table) if byte & mask) > total:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+
+def distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """Fingerprints of seen pages, searchable for near-duplicates."""
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        blocks = max_distance + 1
+        self._blocks = [(BITS * i // blocks, BITS * (i + 1) // blocks) for i in range(blocks)]
+        self._tables = [{} for _ in self._blocks]  # block value -> [(fingerprint, key)]
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _keys(self, fingerprint: int):
+        for table, (start, end) in zip(self._tables, self._blocks):
+            yield table, (fingerprint >> start) & ((1 << (end - start)) - 1)
+
+    def _find(self, fingerprint: int):
+        for table, block in self._keys(fingerprint):
+            for candidate, key in table.get(block, ()):
+                if distance(candidate, fingerprint) <= self.max_distance:
+                    return key
+        return None
+
+    def _add(self, fingerprint: int, key):
+        for table, block in self._keys(fingerprint):
+            table.setdefault(block, []).append((fingerprint, key))
+        self.count += 1
+
+    def find(self, fingerprint: int):
+        """Key of a stored fingerprint within max_distance bits, or None."""
+        with self._lock:
+            return self._find(fingerprint)
+
+    def add(self, fingerprint: int, key):
+        with self._lock:
+            self._add(fingerprint, key)
+
+    def add_if_new(self, fingerprint: int, key):
+        """Store the fingerprint unless a near-duplicate exists; return that duplicate's key or None."""
+        with self._lock:
+            duplicate = self._find(fingerprint)
+            if duplicate is None:
+                self._add(fingerprint, key)
+            return duplicate
@@ -0,0 +1,150 @@
+# utils/sitemaps.py
+"""Streaming sitemap reader.
+
+Sitemaps are parsed incrementally while they download: each <url> element is
+yielded and discarded as soon as it is complete, gzip-compressed sitemaps
+(.xml.gz) are decompressed chunk by chunk, and sitemap indexes are followed
+recursively. URLs are de-duplicated by canonical form in a fixed-size Bloom
+filter, so memory does not grow with the number of URLs. Plain-text sitemaps (one
+URL per line) are read too.
+"""
+import logging
+import zlib
+import xml.etree.ElementTree as ET
+from collections import deque
+import requests
+from utils.bloom import BloomFilter
+from utils.url_frontier import url_key
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+USER_AGENT = "DeepWebsiteAnalyzer/1.0"
+TIMEOUT = 15
+CHUNK_SIZE = 64 * 1024
+MAX_DEPTH = 5  # Sitemap index nesting
+MAX_SITEMAPS = 1000
+GZIP_MAGIC = b"\x1f\x8b"
+BOM = b"\xef\xbb\xbf"
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapReader:
+    """Iterate the URLs of one or more sitemaps.
+
+    After (or during) iteration, sitemaps lists every sitemap that was read with its
+    URL count and errors maps sitemap URLs to the reason they could not be read.
+    """
+
+    def __init__(self, session=None, timeout: int = TIMEOUT, max_depth: int = MAX_DEPTH,
+                 max_sitemaps: int = MAX_SITEMAPS, seen: BloomFilter = None):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.max_sitemaps = max_sitemaps
+        self.seen = seen if seen is not None else BloomFilter(capacity=2_000_000)
+        self.sitemaps = {}  # sitemap url -> number of entries
+        self.errors = {}
+        self.duplicates = 0
+
+    def urls(self, sitemap_urls):
+        """Yield {"loc", "lastmod", "sitemap"} for every unique page URL, breadth-first over indexes."""
+        pending = deque((url, 0) for url in sitemap_urls)
+        while pending:
+            sitemap, depth = pending.popleft()
+            if sitemap in self.sitemaps or sitemap in self.errors:
+                continue
+            if len(self.sitemaps) >= self.max_sitemaps:
+                self.errors[sitemap] = "Sitemap limit reached."
+                continue
+            self.sitemaps[sitemap] = 0
+            try:
+                for kind, loc, lastmod in self._entries(sitemap):
+                    self.sitemaps[sitemap] += 1
+                    if kind == "sitemap":
+                        if depth < self.max_depth:
+                            pending.append((loc, depth + 1))
+                        else:
+                            self.errors[loc] = "Sitemap index nested too deeply."
+                    elif self.seen.add(url_key(loc)):
+                        yield {"loc": loc, "lastmod": lastmod, "sitemap": sitemap}
+                    else:
+                        self.duplicates += 1
+            except (requests.RequestException, ET.ParseError, zlib.error) as e:
+                self.errors[sitemap] = str(e)
+                logger.warning(f"Failed to read sitemap {sitemap}: {str(e)}")
+
+    def _chunks(self, sitemap: str):
+        """Decoded body chunks, gunzipping .gz sitemaps that were not served with Content-Encoding."""
+        with self.session.get(sitemap, headers={"User-Agent": USER_AGENT}, stream=True,
+                              timeout=self.timeout) as response:
+            if response.status_code != 200:
+                raise requests.RequestException(f"Status code: {response.status_code}")
+            decompressor = None
+            for chunk in response.iter_content(CHUNK_SIZE):
+                if decompressor is None:
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk.startswith(GZIP_MAGIC) else False
+                yield decompressor.decompress(chunk) if decompressor else chunk
+            if decompressor:
+                yield decompressor.flush()
+
+    def _entries(self, sitemap: str):
+        """Yield ("url" | "sitemap", loc, lastmod) as the document streams in."""
+        parser = None
+        text = None  # Unconsumed tail of a plain-text sitemap
+        state = {"depth": 0, "root": None, "entry": {}}
+        for chunk in self._chunks(sitemap):
+            if parser is None and text is None:
+                if chunk.startswith(BOM):
+                    chunk = chunk[len(BOM):]  # Would hide the "<" that marks an XML sitemap
+                if not chunk.strip():
+                    continue
+                if chunk.lstrip().startswith(b"<"):
+                    parser = ET.XMLPullParser(events=("start", "end"))
+                else:
+                    text = b""
+            if parser is not None:
+                parser.feed(chunk)
+                yield from self._xml_events(parser, state)
+            else:
+                *lines, text = (text + chunk).split(b"\n")
+                yield from self._text_lines(lines)
+        if parser is not None:
+            parser.close()
+            yield from self._xml_events(parser, state)
+        elif text:
+            yield from self._text_lines([text])
+
+    @staticmethod
+    def _xml_events(parser, state: dict):
+        for event, element in parser.read_events():
+            if event == "start":
+                state["depth"] += 1
+                if state["root"] is None:
+                    state["root"] = element
+                continue
+            name = _local(element.tag)
+            if state["depth"] == 3 and name in ("loc", "lastmod"):
+                # Only direct children of <url>/<sitemap>; image:loc and friends sit deeper
+                state["entry"][name] = (element.text or "").strip()
+            elif state["depth"] == 2 and name in ("url", "sitemap"):
+                entry = state["entry"]
+                if entry.get("loc"):
+                    yield name, entry["loc"], entry.get("lastmod")
+                state["entry"] = {}
+                state["root"].clear()  # Drop finished entries so memory stays flat
+            state["depth"] -= 1
+
+    @staticmethod
+    def _text_lines(lines):
+        for line in lines:
+            loc = line.strip().decode('utf-8', errors='replace')
+            if loc.startswith(("http://", "https://")):
+                yield "url", loc, None
+
+
+def iter_sitemap_urls(sitemap_urls, **kwargs):
+    """Shortcut for SitemapReader(**kwargs).urls(sitemap_urls)."""
+    return SitemapReader(**kwargs).urls(sitemap_urls)
@@ -0,0 +1,131 @@
+# utils/target.py
+"""Analysis target resolution.
+
+Users type a URL, a domain or an IP address. resolve_target() parses it once into
+a Target with the views plugins need (URL, base URL, host, registrable domain,
+addresses), so every plugin and cache sees the same normalization. Target is a str
+holding the original input, which keeps plugins that only need text working.
+"""
+import ipaddress
+import socket
+from functools import cached_property, lru_cache
+from urllib.parse import urlsplit, urlunsplit
+from utils.url_frontier import DEFAULT_PORTS, canonicalize
+
+try:
+    import tldextract
+except ImportError:
+    tldextract = None
+
+# Second-level public suffixes, used when tldextract is not installed
+MULTI_LEVEL_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk", "me.uk", "net.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "co.nz", "org.nz", "net.nz", "co.za", "org.za", "co.jp", "ne.jp", "or.jp", "ac.jp",
+    "com.br", "net.br", "org.br", "com.cn", "net.cn", "org.cn", "com.tw", "com.hk",
+    "co.in", "net.in", "org.in", "co.kr", "or.kr", "com.mx", "com.ar", "com.tr",
+    "co.il", "com.sg", "com.my", "co.id", "com.ng", "com.pk", "com.ua", "com.pl",
+}
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+@lru_cache(maxsize=4096)
+def registrable_domain(target: str) -> str:
+    """https://www.shop.example.co.uk:8080/x -> example.co.uk"""
+    host = urlsplit(target if "//" in target else "//" + target).hostname or target
+    host = host.strip(".").lower()
+    if _is_ip(host):
+        return host
+    if tldextract is not None:
+        extracted = tldextract.extract(host)
+        if extracted.domain and extracted.suffix:
+            return f"{extracted.domain}.{extracted.suffix}"
+        return host
+    parts = host.split(".")
+    if len(parts) > 2 and ".".join(parts[-2:]) in MULTI_LEVEL_SUFFIXES:
+        return ".".join(parts[-3:])
+    return ".".join(parts[-2:])
+
+
+def resolve_addresses(hostname: str) -> list:
+    """All IPv4 and IPv6 addresses of a hostname, IPv4 first."""
+    addresses = []
+    for _, _, _, _, sockaddr in socket.getaddrinfo(hostname, None, proto=socket.IPPROTO_TCP):
+        if sockaddr[0] not in addresses:
+            addresses.append(sockaddr[0])
+    return sorted(addresses, key=lambda ip: ":" in ip)
+
+
+class Target(str):
+    """Parsed analysis target; the string value is the input as typed (stripped).
+
+    url is the input as a URL to request (scheme added, query kept as typed);
+    canonical_url is its identity for de-duplication. port is None for the scheme's
+    default port; netloc and base_url include it otherwise.
+    """
+
+    def __new__(cls, raw: str):
+        self = super().__new__(cls, raw.strip())
+        text = str(self)
+        parts = urlsplit(text if "://" in text else "http://" + text)
+        self.scheme = parts.scheme.lower() or "http"
+        self.host = (parts.hostname or "").rstrip(".")
+        try:
+            self.port = parts.port
+        except ValueError:
+            self.port = None
+        if self.port == DEFAULT_PORTS.get(self.scheme):
+            self.port = None
+        self.path = parts.path or "/"
+        self.url = urlunsplit((self.scheme, parts.netloc, self.path, parts.query, ""))
+        self.canonical_url = canonicalize(self.url)
+        netloc = f"[{self.host}]" if ":" in self.host else self.host
+        if self.port:
+            netloc = f"{netloc}:{self.port}"
+        self.netloc = netloc
+        self.base_url = f"{self.scheme}://{netloc}"
+        self.is_ip = _is_ip(self.host)
+        self.domain = registrable_domain(self.host) if self.host else ""
+        return self
+
+    def __reduce__(self):
+        # Parsed attributes are rebuilt from the input (e.g. in worker processes)
+        return resolve_target, (str(self),)
+
+    @property
+    def key(self) -> str:
+        """Identity for caches and sessions: 'example.com' and 'https://example.com/' are equal."""
+        return (self.netloc + self.path).rstrip("/").lower()
+
+    @cached_property
+    def ips(self) -> list:
+        """Addresses of the host, resolved on first use; empty if it does not resolve."""
+        if self.is_ip:
+            return [self.host]
+        try:
+            return resolve_addresses(self.host)
+        except (OSError, UnicodeError):
+            return []
+
+    def refresh(self):
+        """Forget the resolved addresses, so the next run sees DNS changes."""
+        self.__dict__.pop("ips", None)
+
+
+@lru_cache(maxsize=256)
+def _resolve(raw: str) -> Target:
+    return Target(raw)
+
+
+def resolve_target(target) -> Target:
+    """Target for a user-supplied string; parsing is memoized and Targets pass through."""
+    if isinstance(target, Target):
+        return target
+    return _resolve(str(target).strip())
@@ -0,0 +1,146 @@
+# utils/text_analytics.py
+"""Site-wide text analytics over a corpus of page texts.
+
+Documents are processed in batches: each batch is tokenized, language-detected and
+sentiment-scored in one call, optionally in worker processes. Term statistics are
+merged into a shared vocabulary backed by flat arrays indexed by term id, so
+TF-IDF over the whole site is a single pass over the counts.
+"""
+import math
+import multiprocessing
+import re
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from utils import nlp_resources
+
+TERM_PATTERN = re.compile(r"[^\W\d_]{2,}", re.UNICODE)
+LANGUAGE_SAMPLE_CHARS = 2000  # langdetect is accurate well before this and slows down linearly
+DEFAULT_BATCH_SIZE = 16
+PROCESS_POOL_THRESHOLD = 40  # Smaller corpora are faster in-process than paying for worker start-up
+
+
+def terms(text: str, stop_words: frozenset) -> list:
+    return [term for term in TERM_PATTERN.findall(text.lower()) if term not in stop_words]
+
+
+def detect_language(text: str) -> str:
+    try:
+        from langdetect import detect, DetectorFactory
+        DetectorFactory.seed = 0
+        return detect(text[:LANGUAGE_SAMPLE_CHARS])
+    except Exception:
+        return "unknown"
+
+
+def analyze_batch(texts: list) -> list:
+    """Tokenize, detect language and score sentiment for a batch of documents.
+
+    :return: [{"Counts": Counter, "Length": int, "Language": str, "Compound": float or None}, ...]
+    """
+    stop_words = nlp_resources.get_stop_words('english')
+    analyzer = nlp_resources.get_sentiment_analyzer()
+    analyzed = []
+    for text in texts:
+        document_terms = terms(text, stop_words)
+        analyzed.append({
+            "Counts": Counter(document_terms),
+            "Length": len(document_terms),
+            "Language": detect_language(text) if text.strip() else "unknown",
+            "Compound": analyzer.polarity_scores(text)["compound"] if analyzer else None,
+        })
+    return analyzed
+
+
+class TermStatistics:
+    """Vocabulary with array-backed per-term document frequency and normalized term frequency."""
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.terms = []
+        self.document_frequency = array('l')
+        self.term_frequency = array('d')  # Sum over documents of count / document length
+        self.documents = 0
+
+    def add(self, counts: Counter, length: int):
+        self.documents += 1
+        if not length:
+            return
+        vocabulary = self.vocabulary
+        for term, count in counts.items():
+            term_id = vocabulary.get(term)
+            if term_id is None:
+                term_id = vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+                self.document_frequency.append(0)
+                self.term_frequency.append(0.0)
+            self.document_frequency[term_id] += 1
+            self.term_frequency[term_id] += count / length
+
+    def top_keywords(self, limit: int = 25) -> list:
+        """Terms ranked by TF-IDF summed over all documents (smoothed idf)."""
+        documents = self.documents
+        scores = [
+            tf * (math.log((1 + documents) / (1 + df)) + 1)
+            for tf, df in zip(self.term_frequency, self.document_frequency)
+        ]
+        ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:limit]
+        return [
+            {"Term": self.terms[i], "Score": round(scores[i], 4), "Documents": self.document_frequency[i]}
+            for i in ranked
+        ]
+
+
+def _batches(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def analyze_corpus(documents: dict, workers: int = 0, batch_size: int = DEFAULT_BATCH_SIZE,
+                   keyword_limit: int = 25) -> dict:
+    """Analyze {url: text} documents as one corpus.
+
+    :param workers: Worker processes to use; 0 picks automatically based on corpus size.
+    """
+    urls = list(documents)
+    texts = [documents[url] for url in urls]
+    if workers == 0:
+        workers = min(4, multiprocessing.cpu_count()) if len(texts) >= PROCESS_POOL_THRESHOLD else 1
+        if multiprocessing.parent_process() is not None:
+            workers = 1  # Already inside a worker process, e.g. the CPU-bound plugin pool
+    batches = list(_batches(texts, batch_size))
+    if workers > 1 and len(batches) > 1:
+        # Spawned workers avoid forking the GUI's threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            analyzed_batches = list(executor.map(analyze_batch, batches))
+    else:
+        analyzed_batches = [analyze_batch(batch) for batch in batches]
+
+    statistics = TermStatistics()
+    languages = Counter()
+    compounds = []
+    pages = {}
+    for url, analyzed in zip(urls, (doc for batch in analyzed_batches for doc in batch)):
+        statistics.add(analyzed["Counts"], analyzed["Length"])
+        languages[analyzed["Language"]] += 1
+        if analyzed["Compound"] is not None:
+            compounds.append(analyzed["Compound"])
+        pages[url] = {"Language": analyzed["Language"], "Sentiment": analyzed["Compound"], "Words": analyzed["Length"]}
+
+    sentiment = {"Error": "VADER lexicon is not available."}
+    if compounds:
+        sentiment = {
+            "Average Compound": round(sum(compounds) / len(compounds), 4),
+            "Positive": sum(1 for c in compounds if c >= 0.05),
+            "Neutral": sum(1 for c in compounds if -0.05 < c < 0.05),
+            "Negative": sum(1 for c in compounds if c <= -0.05),
+        }
+    return {
+        "Pages Analyzed": len(urls),
+        "Vocabulary Size": len(statistics.terms),
+        "Languages": dict(languages.most_common()),
+        "Sentiment": sentiment,
+        "Keywords": statistics.top_keywords(keyword_limit),
+        "Pages": pages,
+    }
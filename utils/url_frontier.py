@@ -0,0 +1,186 @@
+# utils/url_frontier.py
+"""URL frontier for large crawls in a fixed amount of memory.
+
+URLs are canonicalized before de-duplication, so trivially different spellings of
+a page (host case, default port, fragment, order of distinct parameters, tracking
+parameters, percent-encoding) are crawled once. The queue holds the URLs as they
+were linked; the canonical form is only used as their identity. Seen URLs are remembered as hashes in a Bloom
+filter rather than as strings, and the FIFO queue keeps only its head and tail in
+memory, spilling the middle to a temporary file.
+"""
+import hashlib
+import json
+import posixpath
+import re
+import tempfile
+import threading
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote
+from utils.bloom import BloomFilter
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+TRACKING_PARAMETERS = re.compile(r"^(utm_\w+|fbclid|gclid|dclid|msclkid|mc_cid|mc_eid|_ga|yclid)$", re.IGNORECASE)
+PATH_SAFE = "/:@!$&'()*+,;=-._~%"
+UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+SAFE_PATH = re.compile(r"^[A-Za-z0-9/:@!$&'()*+,;=\-._~%]*$")
+MEMORY_ITEMS = 10_000  # Queue entries kept in memory before spilling
+SPILL_CHUNK = 5_000
+
+
+def canonicalize(url: str) -> str:
+    """Canonical form of an http(s) URL used as its identity."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if not host.isascii():
+        host = host.encode("idna").decode("ascii")
+    netloc = f"[{host}]" if ":" in host else host
+    try:
+        port = parts.port
+    except ValueError:
+        port = None  # Malformed port; identify the URL by host alone
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    path = parts.path or "/"
+    if "%" in path:
+        path = ESCAPE.sub(_normalize_escape, path)
+    if "/." in path or "//" in path:
+        normalized = posixpath.normpath(path).replace("//", "/")
+        path = normalized + "/" if path.endswith("/") and normalized != "/" else normalized
+    if not SAFE_PATH.match(path):
+        path = quote(path, safe=PATH_SAFE)
+    query = parts.query
+    if query:
+        # Stable sort by name: the order of a repeated parameter's values can matter to the app
+        query = urlencode(sorted(
+            ((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if not TRACKING_PARAMETERS.match(k)),
+            key=lambda parameter: parameter[0],
+        ))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def _normalize_escape(match) -> str:
+    """Decode an escaped unreserved character; upper-case any other escape."""
+    char = chr(int(match.group(1), 16))
+    return char if char in UNRESERVED else "%" + match.group(1).upper()
+
+
+def url_key(url: str) -> bytes:
+    """16-byte hash of the canonical URL."""
+    return hashlib.blake2b(canonicalize(url).encode("utf-8"), digest_size=16).digest()
+
+
+class SpillingQueue:
+    """FIFO queue that keeps at most about memory_items entries in RAM.
+
+    New entries go to the in-memory tail; once the tail is full it is appended to a
+    temporary file, and the head is refilled from that file in chunks. Entries must be
+    JSON-serializable.
+    """
+
+    def __init__(self, memory_items: int = MEMORY_ITEMS, spill_dir: str = None, chunk: int = SPILL_CHUNK):
+        self.memory_items = memory_items
+        self.chunk = min(chunk, max(1, memory_items // 2))
+        self.spill_dir = spill_dir
+        self._head = deque()
+        self._tail = deque()
+        self._file = None
+        self._read_offset = 0
+        self._write_offset = 0
+        self._spilled = 0
+        self.spilled_total = 0
+
+    def __len__(self) -> int:
+        return len(self._head) + self._spilled + len(self._tail)
+
+    def push(self, item):
+        if not self._spilled and not self._tail and len(self._head) < self.memory_items:
+            self._head.append(item)
+            return
+        self._tail.append(item)
+        if len(self._tail) >= self.chunk:
+            self._spill()
+
+    def pop(self):
+        """Oldest entry; raises IndexError when empty."""
+        if not self._head:
+            if self._spilled:
+                self._load()
+            elif self._tail:
+                self._head, self._tail = self._tail, deque()
+        return self._head.popleft()
+
+    def _spill(self):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self.spill_dir)
+        self._file.seek(self._write_offset)
+        self._file.write(b"".join(json.dumps(item).encode("utf-8") + b"\n" for item in self._tail))
+        self._write_offset = self._file.tell()
+        self._spilled += len(self._tail)
+        self.spilled_total += len(self._tail)
+        self._tail.clear()
+
+    def _load(self):
+        self._file.seek(self._read_offset)
+        for _ in range(min(self.chunk, self._spilled)):
+            self._head.append(json.loads(self._file.readline()))
+            self._spilled -= 1
+        self._read_offset = self._file.tell()
+        if not self._spilled:
+            # Everything on disk has been read back; start the file over
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_offset = self._write_offset = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class URLFrontier:
+    """Crawl queue of (url, depth) that admits each canonical URL once."""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-4,
+                 memory_items: int = MEMORY_ITEMS, spill_dir: str = None):
+        self.seen = BloomFilter(capacity=capacity, error_rate=error_rate)
+        self.queue = SpillingQueue(memory_items=memory_items, spill_dir=spill_dir)
+        self._lock = threading.Lock()
+
+    def add(self, url: str, depth: int = 0) -> bool:
+        """Queue url unless an equivalent URL was added before; return whether it was queued."""
+        url = url.strip()
+        key = canonicalize(url)
+        with self._lock:
+            if not self.seen.add(key):
+                return False
+            self.queue.push((url, depth))
+            return True
+
+    def mark_seen(self, url: str) -> bool:
+        """Remember url without queueing it (e.g. out of scope); return whether it was new."""
+        with self._lock:
+            return self.seen.add(canonicalize(url))
+
+    def __contains__(self, url: str) -> bool:
+        return canonicalize(url) in self.seen
+
+    def pop(self):
+        """Next (url, depth) with url as it was added, or None when the frontier is empty."""
+        with self._lock:
+            try:
+                url, depth = self.queue.pop()
+            except IndexError:
+                return None
+            return url, depth
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.seen.memory_bytes
+
+    def close(self):
+        self.queue.close()
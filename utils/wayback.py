@@ -0,0 +1,204 @@
+# utils/wayback.py
+"""Incremental Wayback Machine CDX index per domain.
+
+The CDX API is read page by page with resumption keys and streamed line by line,
+so memory stays bounded however many captures a site has. Captures whose content
+digest equals the previous capture of the same URL are dropped as they arrive.
+Everything is stored in a SQLite file per domain under data/wayback; the resume
+key is saved after every page so an interrupted ingestion continues where it
+stopped, and later runs only ask for captures newer than the last stored one.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import requests
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+CDX_URL = "https://web.archive.org/cdx/search/cdx"
+WAYBACK_DIR = os.path.join("data", "wayback")
+FIELDS = ("urlkey", "timestamp", "original", "mimetype", "statuscode", "digest", "length")
+PAGE_SIZE = 5000
+MAX_PAGES = 20  # Per update() call; the next call resumes
+TIMEOUT = 30
+INSERT_BATCH = 1000
+
+_SAFE_NAME = re.compile(r"[^a-z0-9.-]")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    urlkey TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    original TEXT,
+    mimetype TEXT,
+    statuscode TEXT,
+    digest TEXT,
+    length INTEGER,
+    PRIMARY KEY (urlkey, timestamp)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS captures_timestamp ON captures (timestamp);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def iter_cdx_page(session, params: dict, timeout: int = TIMEOUT):
+    """Yield capture dicts of one CDX page, then ("resume", key) if there are more pages."""
+    with session.get(CDX_URL, params=params, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        after_blank = False
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                after_blank = True
+                continue
+            if after_blank:
+                yield "resume", line.strip()
+                return
+            values = line.split(" ")
+            if len(values) == len(FIELDS):
+                yield dict(zip(FIELDS, values))
+
+
+class WaybackIndex:
+    def __init__(self, domain: str, directory: str = WAYBACK_DIR):
+        self.domain = domain.lower()
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, _SAFE_NAME.sub("_", self.domain) + ".sqlite")
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.RLock()
+
+    def _state(self, key: str):
+        row = self._db.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value):
+        if value is None:
+            self._db.execute("DELETE FROM state WHERE key = ?", (key,))
+        else:
+            self._db.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _last_digest(self, urlkey: str):
+        row = self._db.execute(
+            "SELECT digest FROM captures WHERE urlkey = ? ORDER BY timestamp DESC LIMIT 1", (urlkey,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def update(self, max_pages: int = MAX_PAGES, session=None) -> dict:
+        """Fetch captures not stored yet.
+
+        :return: {"Added": n, "Skipped Duplicates": n, "Complete": bool}
+        """
+        with self._lock:
+            return self._update(max_pages, session or requests.Session())
+
+    def _update(self, max_pages: int, session) -> dict:
+        resume_key = self._state("resume_key")
+        since = self._state("since")
+        if resume_key is None:
+            # New pass: everything after the newest stored capture
+            since = self._db.execute("SELECT MAX(timestamp) FROM captures").fetchone()[0]
+            self._set_state("since", since)
+        added = skipped = 0
+        previous = (None, None)  # (urlkey, digest) of the last capture seen
+        pages = 0
+        while pages < max_pages:
+            params = {
+                "url": self.domain, "matchType": "domain", "fl": ",".join(FIELDS),
+                "limit": PAGE_SIZE, "showResumeKey": "true",
+            }
+            if since:
+                params["from"] = since
+            if resume_key:
+                params["resumeKey"] = resume_key
+            resume_key = None
+            batch = []
+            for item in iter_cdx_page(session, params):
+                if isinstance(item, tuple):
+                    resume_key = item[1]
+                    break
+                urlkey, digest = item["urlkey"], item["digest"]
+                if urlkey != previous[0]:
+                    previous = (urlkey, self._last_digest(urlkey))
+                if digest == previous[1]:
+                    skipped += 1
+                    continue
+                previous = (urlkey, digest)
+                batch.append(tuple(item.get(f) for f in FIELDS))
+                if len(batch) >= INSERT_BATCH:
+                    added += self._insert(batch)
+                    batch = []
+            added += self._insert(batch)
+            self._set_state("resume_key", resume_key)
+            self._db.commit()  # Saved per page, so an interrupted update resumes here
+            pages += 1
+            if resume_key is None:
+                break
+        self._set_state("since", None if resume_key is None else since)
+        self._db.commit()
+        return {"Added": added, "Skipped Duplicates": skipped, "Complete": resume_key is None}
+
+    def _insert(self, rows: list) -> int:
+        if not rows:
+            return 0
+        before = self._db.total_changes
+        self._db.executemany("INSERT OR IGNORE INTO captures VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return self._db.total_changes - before
+
+    def summary(self, latest: int = 10) -> dict:
+        with self._lock:
+            return self._summary(latest)
+
+    def _summary(self, latest: int) -> dict:
+        total, urls, first, last = self._db.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT urlkey), MIN(timestamp), MAX(timestamp) FROM captures"
+        ).fetchone()
+        per_year = dict(self._db.execute(
+            "SELECT substr(timestamp, 1, 4) AS year, COUNT(*) FROM captures GROUP BY year ORDER BY year"
+        ).fetchall())
+        snapshots = [
+            {
+                "timestamp": timestamp,
+                "available": True,
+                "status": status,
+                "url": f"https://web.archive.org/web/{timestamp}/{original}",
+            }
+            for timestamp, original, status in self._db.execute(
+                "SELECT timestamp, original, statuscode FROM captures ORDER BY timestamp DESC LIMIT ?", (latest,)
+            )
+        ]
+        return {
+            "Total Captures": total,
+            "Unique URLs": urls,
+            "First Capture": first,
+            "Last Capture": last,
+            "Captures Per Year": per_year,
+            "Latest Snapshots": snapshots,
+        }
+
+    def iter_captures(self, since: str = None):
+        """Stream stored captures in timestamp order."""
+        query = "SELECT * FROM captures"
+        args = ()
+        if since:
+            query += " WHERE timestamp > ?"
+            args = (since,)
+        for row in self._db.execute(query + " ORDER BY timestamp", args):
+            yield dict(zip(FIELDS, row))
+
+    def close(self):
+        self._db.close()
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_wayback_index(domain: str) -> WaybackIndex:
+    """Shared index per domain, opened on first use."""
+    with _indexes_lock:
+        index = _indexes.get(domain.lower())
+        if index is None:
+            index = _indexes[domain.lower()] = WaybackIndex(domain)
+        return index
@@ -0,0 +1,147 @@
+# utils/whois_service.py
+"""Shared WHOIS lookups.
+
+Several plugins need the WHOIS record of the target's domain. lookup() normalizes
+a host or URL to its registrable domain, keeps parsed records on disk for a week
+(data/whois), lets concurrent callers for the same domain share one query, and
+spaces queries to the same registry so bulk scans are not blocked.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.json_utils import dumps_fast
+from utils.target import registrable_domain
+
+try:
+    import whois
+except ImportError:
+    whois = None
+
+logger = logging.getLogger("WebAnalyticsApp")
+
+WHOIS_DIR = os.path.join("data", "whois")
+CACHE_TTL = 7 * 24 * 3600  # Registrar data changes rarely
+FAILURE_TTL = 600  # Do not hammer a registry that just failed for a domain
+DEFAULT_INTERVAL = 2.0  # Seconds between queries to the same registry
+REGISTRY_INTERVALS = {
+    "com": 1.0, "net": 1.0,  # Verisign tolerates a higher rate
+    "de": 5.0, "eu": 5.0, "es": 5.0,  # Registries known for strict limits
+}
+MAX_WORKERS = 4
+
+_SAFE_NAME = re.compile(r"[^a-z0-9.-]")
+
+
+def _registry(domain: str) -> str:
+    return domain.rsplit(".", 1)[-1]
+
+
+def _to_record(entry) -> dict:
+    """Plain JSON-compatible dict from a python-whois entry (dates become ISO strings)."""
+    return json.loads(dumps_fast(dict(entry)))
+
+
+class WhoisService:
+    def __init__(self, directory: str = WHOIS_DIR, ttl: int = CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._memory = {}  # domain -> (fetched_at, record)
+        self._failures = {}  # domain -> (failed_at, message)
+        self._domain_locks = {}
+        self._next_query = {}  # registry -> earliest time of the next query
+        self._lock = threading.Lock()
+
+    def _path(self, domain: str) -> str:
+        return os.path.join(self.directory, _SAFE_NAME.sub("_", domain) + ".json")
+
+    def _load(self, domain: str):
+        cached = self._memory.get(domain)
+        if cached is None:
+            try:
+                with open(self._path(domain), 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                cached = (stored["fetched_at"], stored["record"])
+                self._memory[domain] = cached
+            except (OSError, ValueError, KeyError):
+                return None
+        if time.time() - cached[0] < self.ttl:
+            return cached[1]
+        return None
+
+    def _store(self, domain: str, record: dict):
+        fetched_at = time.time()
+        self._memory[domain] = (fetched_at, record)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = self._path(domain) + ".tmp"
+            with open(temporary, 'wb') as f:
+                f.write(dumps_fast({"domain": domain, "fetched_at": fetched_at, "record": record}))
+            os.replace(temporary, self._path(domain))
+        except OSError as e:
+            logger.warning(f"Failed to cache WHOIS record for {domain}: {str(e)}")
+
+    def _throttle(self, registry: str):
+        """Wait until the registry's WHOIS server may be queried again."""
+        interval = REGISTRY_INTERVALS.get(registry, DEFAULT_INTERVAL)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_query.get(registry, 0.0))
+            self._next_query[registry] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def lookup(self, target: str) -> dict:
+        """Parsed WHOIS record of the target's registrable domain.
+
+        Raises ImportError without python-whois and the underlying exception when the
+        query fails; failures are remembered for a few minutes.
+        """
+        if whois is None:
+            raise ImportError("whois package not installed.")
+        domain = registrable_domain(target)
+        with self._lock:
+            domain_lock = self._domain_locks.setdefault(domain, threading.Lock())
+        with domain_lock:
+            record = self._load(domain)
+            if record is not None:
+                return record
+            failure = self._failures.get(domain)
+            if failure and time.monotonic() - failure[0] < FAILURE_TTL:
+                raise LookupError(failure[1])
+            self._throttle(_registry(domain))
+            try:
+                record = _to_record(whois.whois(domain))
+            except Exception as e:
+                self._failures[domain] = (time.monotonic(), str(e))
+                raise
+            self._store(domain, record)
+            return record
+
+    def lookup_many(self, targets, workers: int = MAX_WORKERS) -> dict:
+        """{domain: record or {"Error": ...}}; domains of different registries are queried in parallel."""
+        domains = list(dict.fromkeys(registrable_domain(t) for t in targets))
+
+        def safe_lookup(domain):
+            try:
+                return self.lookup(domain)
+            except Exception as e:
+                return {"Error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return dict(zip(domains, executor.map(safe_lookup, domains)))
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_whois_service() -> WhoisService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = WhoisService()
+        return _service